@@ -0,0 +1,167 @@
+"""
+Deterministic generator of synthetic Kotlin projects for the benchmarks.
+
+    python -m benchmarks.corpus OUT [--files N] [--classes-per-file N] ... [--zip]
+
+The shape is configurable: number of files and packages, classes per file,
+methods per class, nesting depth of the method bodies and the fan-out of the
+inheritance tree (class k extends class (k - 1) // fanout). The same arguments
+and seed always give byte-identical sources.
+"""
+import argparse
+import os
+import random
+import zipfile
+from io import BytesIO
+
+DEFAULT_SHAPE = {
+    "files": 50,
+    "classes_per_file": 3,
+    "methods_per_class": 6,
+    "nesting_depth": 3,
+    "fanout": 3,
+    "packages": 5,
+    "seed": 0,
+}
+
+# Blok bersarang yang bisa di-parse kopyt; masing-masing dibuka dengan '{' di akhir baris
+_BLOCKS = (
+    "if (value > {n}) {{",
+    "for (item in items) {{",
+    "while (count < {n}) {{",
+    "if (ready && value != {n}) {{",
+    "for (i in 0..{n}) {{",
+)
+# Pernyataan biasa, termasuk kata kunci di dalam string dan komentar
+_STATEMENTS = (
+    "val local{n} = value * {n}",
+    "var total{n} = count + value",
+    'println("if (for) while {n}")',
+    "// if for while when {n}",
+    "count += {n}",
+    "items.forEach {{ it.hashCode() }}",
+    "when (value) {{\n{pad}    {n} -> count++\n{pad}    else -> count--\n{pad}}}",
+    "try {{\n{pad}    compute({n})\n{pad}}} catch (e: Exception) {{\n{pad}    count = 0\n{pad}}}",
+)
+
+
+def class_name(index):
+    return f"Generated{index}"
+
+
+def package_of(index, shape):
+    return f"com.example.bench.p{index % shape['packages']}"
+
+
+def _method(lines, rng, name, shape):
+    lines.append(f"    fun {name}(value: Int): Int {{")
+    depth = 0
+    for n in range(rng.randint(3, 10)):
+        pad = "        " + "    " * depth
+        if depth < shape["nesting_depth"] and rng.random() < 0.4:
+            lines.append(pad + rng.choice(_BLOCKS).format(n=n))
+            depth += 1
+        elif depth and rng.random() < 0.25:
+            depth -= 1
+            lines.append("        " + "    " * depth + "}")
+        else:
+            lines.append(pad + rng.choice(_STATEMENTS).format(n=n, pad=pad))
+    while depth:
+        depth -= 1
+        lines.append("        " + "    " * depth + "}")
+    lines.append("        return count + value")
+    lines.append("    }")
+
+
+def _class(lines, rng, index, shape):
+    name = class_name(index)
+    if index == 0 or shape["fanout"] <= 0:
+        header = f"open class {name}"
+    else:
+        header = f"open class {name} : {class_name((index - 1) // shape['fanout'])}()"
+    lines.append(f"{header} {{")
+    lines.append("    var count = 0")
+    lines.append("    val items = mutableListOf<Int>()")
+    lines.append('    var ready: Boolean = "if".isEmpty()')
+    for m in range(shape["methods_per_class"]):
+        if m % 5 == 4:
+            # Accessor pendek, agar metrik *NAMM punya sesuatu untuk dikecualikan
+            lines.append(f"    fun getCount{index}x{m}(): Int {{\n        return count\n    }}")
+        else:
+            _method(lines, rng, f"compute{index}x{m}", shape)
+    lines.append("    fun compute(n: Int): Int = n")
+    lines.append("}")
+    lines.append("")
+
+
+def generate_sources(**shape):
+    """List of (relative path, bytes) Kotlin sources for the given shape (see DEFAULT_SHAPE)"""
+    shape = {**DEFAULT_SHAPE, **shape}
+    rng = random.Random(shape["seed"])
+    sources = []
+    index = 0
+    for file_index in range(shape["files"]):
+        package = package_of(file_index, shape)
+        first = index
+        indices = list(range(first, first + shape["classes_per_file"]))
+        index += shape["classes_per_file"]
+
+        lines = [f"package {package}", ""]
+        # Superclass dari paket lain diimpor secara eksplisit
+        imports = set()
+        for class_index in indices:
+            if class_index and shape["fanout"] > 0:
+                parent = (class_index - 1) // shape["fanout"]
+                parent_package = package_of(parent // max(shape["classes_per_file"], 1), shape)
+                if parent_package != package:
+                    imports.add(f"import {parent_package}.{class_name(parent)}")
+        lines.extend(sorted(imports))
+        lines.append("")
+        for class_index in indices:
+            _class(lines, rng, class_index, shape)
+
+        path = "/".join(["src", *package.split("."), f"File{file_index}.kt"])
+        sources.append((path, "\n".join(lines).encode("utf-8")))
+    return sources
+
+
+def write_directory(sources, root):
+    for path, data in sources:
+        file_path = os.path.join(root, *path.split("/"))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(data)
+    return root
+
+
+def to_zip_bytes(sources):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+        for path, data in sources:
+            zip_ref.writestr(path, data)
+    return buffer.getvalue()
+
+
+def add_shape_arguments(parser):
+    for key, value in DEFAULT_SHAPE.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=int, default=value, dest=key)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.corpus", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="directory to write the project to (or the .zip file with --zip)")
+    parser.add_argument("--zip", action="store_true", help="write a ZIP archive instead of a directory")
+    add_shape_arguments(parser)
+    args = vars(parser.parse_args(argv))
+    output, as_zip = args.pop("output"), args.pop("zip")
+    sources = generate_sources(**args)
+    if as_zip:
+        with open(output, "wb") as f:
+            f.write(to_zip_bytes(sources))
+    else:
+        write_directory(sources, output)
+    print(f"{len(sources)} files written to {output}")
+
+
+if __name__ == "__main__":
+    main()
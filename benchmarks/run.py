@@ -0,0 +1,231 @@
+"""
+Benchmark harness for the analyzers and metric functions.
+
+    python -m benchmarks.run [--files N ...] [--repeat N] [--save BASELINE.json] [--compare BASELINE.json]
+
+A synthetic project (benchmarks.corpus) is generated with the requested shape,
+then every benchmark is timed --repeat times (min and median are reported) and
+run once more under tracemalloc for its peak memory. --save writes the results
+as a JSON baseline; --compare flags every benchmark that is slower or uses
+more memory than the baseline by more than the threshold, and exits with 1.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+from kopyt import node
+
+from program import controller as ct
+from program import lexer, reports
+from program.incremental import MetricsSnapshot
+from program.inheritance import InheritanceIndex
+from program.sources import decode_source
+
+from .corpus import DEFAULT_SHAPE, add_shape_arguments, generate_sources, to_zip_bytes, write_directory
+
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.2  # 20% lebih lambat / lebih boros memori dianggap regresi
+INCREMENTAL_FILES = 5
+
+
+class Corpus:
+    """Inputs shared by all benchmarks, prepared once per run from the generated sources"""
+
+    def __init__(self, sources, directory):
+        self.sources = sources
+        self.directory = directory
+        self.zip_bytes = to_zip_bytes(sources)
+        self.texts = [decode_source(data) for _, data in sources]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.store = ct.ParsedModuleStore()
+            for name, data in sources:
+                self.store.add_bytes(name, data)
+        self.classes = [
+            decl
+            for module in self.store.parsed()
+            for decl in module.kotlin_file.declarations
+            if isinstance(decl, node.ClassDeclaration)
+        ]
+        self.method_bodies = [
+            str(member.body)
+            for decl in self.classes
+            if decl.body is not None
+            for member in decl.body.members
+            if isinstance(member, node.FunctionDeclaration) and member.body is not None
+        ]
+        self.function_bodies = [
+            body
+            for text in self.texts
+            for span in reports.index_class_spans(text, lexer.code_tokens(lexer.tokenize(text)))
+            for _, body in span["functions"]
+        ]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.snapshot = MetricsSnapshot.from_sources(sources)
+        self.summaries = list(self.snapshot.summaries.values())
+        # Satu commit biasa: beberapa file berubah
+        self.changed_sources = [(name, data + b"\n// changed\n") for name, data in sources[:INCREMENTAL_FILES]]
+
+
+def _each(function, items):
+    for item in items:
+        function(item)
+
+
+def _parse_all(corpus):
+    store = ct.ParsedModuleStore()
+    for (name, _), text in zip(corpus.sources, corpus.texts):
+        store.add_source(name, text)
+    return store
+
+
+def benchmarks(corpus, workers=1):
+    """{name: zero-argument callable}; names are stable so baselines stay comparable"""
+    items = {
+        # Analyzer lengkap, seperti yang dipanggil UI dan CLI
+        "controller.extract_and_parse": lambda: ct.extract_and_parse(io.BytesIO(corpus.zip_bytes)),
+        "reports.analyze_kotlin_files_per_function": lambda: reports.analyze_kotlin_files_per_function(
+            io.BytesIO(corpus.zip_bytes), "bench"
+        ),
+        "reports.calculate_complexity_report": lambda: reports.calculate_complexity_report(corpus.directory),
+        "reports.analyze_kotlin_files": lambda: reports.analyze_kotlin_files(corpus.directory),
+        f"incremental.update[{INCREMENTAL_FILES} files]": lambda: corpus.snapshot.update(corpus.changed_sources),
+        # Tahap-tahap di dalamnya
+        "lexer.tokenize": lambda: _each(lexer.tokenize, corpus.texts),
+        "controller.parse": lambda: _parse_all(corpus),
+        "controller.summarize_module": lambda: _each(ct.summarize_module, corpus.store.modules),
+        "inheritance.InheritanceIndex": lambda: InheritanceIndex.from_modules(corpus.store.modules),
+        "controller.dataframe[rows]": lambda: pd.DataFrame(ct.summaries_to_rows(corpus.summaries)),
+        "controller.dataframe[tables]": lambda: ct.summaries_to_tables(corpus.summaries).dataframe(),
+        # Metrik proyek
+        "controller.count_noi": lambda: ct.count_noi(corpus.store),
+        "controller.count_nom": lambda: ct.count_nom(corpus.store),
+        "controller.count_nomnamm": lambda: ct.count_nomnamm(corpus.store),
+        "controller.count_noc_type": lambda: ct.count_noc_type(corpus.store),
+        "controller.count_nocs_package": lambda: ct.count_nocs_package(corpus.store),
+        # Metrik kelas dan metode
+        "controller.calculate_wmc_for_class": lambda: _each(ct.calculate_wmc_for_class, corpus.classes),
+        "controller.calculate_wmcnamm_type": lambda: _each(ct.calculate_wmcnamm_type, corpus.classes),
+        "controller.calculate_amw_type": lambda: _each(ct.calculate_amw_type, corpus.classes),
+        "controller.calculate_lcom5": lambda: _each(ct.calculate_lcom5, corpus.classes),
+        "controller.count_cc_manual": lambda: _each(ct.count_cc_manual, corpus.method_bodies),
+        "controller.manual_max_nesting": lambda: _each(ct.manual_max_nesting, corpus.method_bodies),
+        "reports.calculate_nolv": lambda: _each(reports.calculate_nolv, corpus.function_bodies),
+        "reports.calculate_cyclomatic_complexity": lambda: _each(
+            reports.calculate_cyclomatic_complexity, corpus.function_bodies
+        ),
+        "reports.analyze_kotlin_file_functions": lambda: _each(reports.analyze_kotlin_file_functions, corpus.texts),
+    }
+    if workers > 1:
+        items[f"controller.extract_and_parse[workers={workers}]"] = lambda: ct.extract_and_parse(
+            io.BytesIO(corpus.zip_bytes), workers=workers
+        )
+    return items
+
+
+def measure(function, repeat=DEFAULT_REPEAT):
+    """min/median wall time over repeat runs, and the tracemalloc peak of one extra run"""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"min_s": min(timings), "median_s": statistics.median(timings), "peak_bytes": peak}
+
+
+def run(shape, repeat=DEFAULT_REPEAT, only=None, workers=1, log=print):
+    sources = generate_sources(**shape)
+    with tempfile.TemporaryDirectory(prefix="kotlin-bench-") as directory:
+        write_directory(sources, directory)
+        corpus = Corpus(sources, directory)
+        log(
+            f"Corpus: {len(sources)} files, {len(corpus.classes)} classes, "
+            f"{len(corpus.method_bodies)} methods, {sum(map(len, corpus.texts))} characters"
+        )
+        results = {}
+        for name, function in benchmarks(corpus, workers).items():
+            if only and not any(part in name for part in only):
+                continue
+            results[name] = measure(function, repeat)
+            log(f"{name:<50} {results[name]['min_s'] * 1000:10.1f} ms {results[name]['peak_bytes'] / 1024:10.0f} KiB")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "shape": shape,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD, memory_threshold=DEFAULT_THRESHOLD):
+    """List of (name, metric, baseline value, current value, ratio) for every regression"""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        for metric, limit in (("min_s", threshold), ("peak_bytes", memory_threshold)):
+            if previous[metric] and result[metric] > previous[metric] * (1 + limit):
+                regressions.append((name, metric, previous[metric], result[metric], result[metric] / previous[metric]))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.strip().splitlines()[0])
+    add_shape_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per benchmark")
+    parser.add_argument("--workers", type=int, default=1, help="also time extract_and_parse with this many processes")
+    parser.add_argument("--only", action="append", help="run only benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a benchmark is flagged (0.2 = 20%%)")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed peak memory growth before a benchmark is flagged")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    shape = {key: getattr(args, key) for key in DEFAULT_SHAPE}
+    current = run(shape, args.repeat, args.only, args.workers)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("shape") != shape:
+            print("Warning: baseline was recorded with a different corpus shape", file=sys.stderr)
+        regressions = compare(current, baseline, args.threshold, args.memory_threshold)
+        for name, metric, before, after, ratio in regressions:
+            print(f"REGRESSION {name} {metric}: {before:.6g} -> {after:.6g} ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
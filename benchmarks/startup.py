@@ -0,0 +1,121 @@
+"""
+Cold-start benchmark: time to a usable module in a fresh interpreter.
+
+    python -m benchmarks.startup [--repeat N] [--budget-scale X] [--save RESULTS.json]
+
+Every target runs --repeat times in a new Python process (interpreter start
+included, the median is reported) and is checked against a fixed time budget.
+Each target also lists the heavy modules it must not load at import; library
+and worker imports that pull in pandas or Streamlit, or an app import that runs
+an analysis, fail the run even when they are fast enough. Exits with 1 when any
+target is over budget or loads a forbidden module.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_REPEAT = 5
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIBRARY_FORBIDDEN = ("pandas", "numpy", "streamlit", "pyarrow", "patoolib")
+
+# {name: (code run in a fresh interpreter, budget in seconds, modules that must not be loaded)}
+STARTUP_TARGETS = {
+    "import program": ("import program", 0.15, LIBRARY_FORBIDDEN + ("kopyt",)),
+    "import program.reports": ("import program.reports", 0.2, LIBRARY_FORBIDDEN + ("kopyt",)),
+    "import program.controller": ("import program.controller", 0.45, LIBRARY_FORBIDDEN),
+    # Yang dikerjakan proses worker sebelum file pertama selesai
+    "worker first file": (
+        "from program.parallel import summarize_source\n"
+        "summarize_source(('A.kt', b'class A { fun f() { if (true) {} } }'))",
+        0.5,
+        LIBRARY_FORBIDDEN,
+    ),
+    "program.cli --help": (
+        "import contextlib, io\n"
+        "from program import cli\n"
+        "with contextlib.redirect_stdout(io.StringIO()), contextlib.suppress(SystemExit):\n"
+        "    cli.main(['--help'])",
+        0.5,
+        LIBRARY_FORBIDDEN,
+    ),
+    "program.incremental --help": (
+        "import contextlib, io\n"
+        "from program import incremental\n"
+        "with contextlib.redirect_stdout(io.StringIO()), contextlib.suppress(SystemExit):\n"
+        "    incremental.main(['--help'])",
+        0.5,
+        LIBRARY_FORBIDDEN,
+    ),
+    # Aplikasi Streamlit: hanya Streamlit yang boleh dimuat sebelum halaman dibuka
+    "import main": ("import main", 1.2, ("pandas", "kopyt", "PIL", "streamlit_option_menu", "patoolib", "pyarrow")),
+}
+
+_PROBE = """
+import json, sys
+{code}
+print(json.dumps([name for name in {forbidden!r} if name in sys.modules]))
+"""
+
+
+def run_target(code, forbidden, repeat=DEFAULT_REPEAT):
+    """Median wall time of repeat fresh interpreters running code, and the forbidden modules they loaded"""
+    timings = []
+    loaded = []
+    probe = _PROBE.format(code=code, forbidden=tuple(forbidden))
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True)
+        timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed")
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return {"median_s": statistics.median(timings), "min_s": min(timings), "forbidden_loaded": loaded}
+
+
+def run(repeat=DEFAULT_REPEAT, budget_scale=1.0, only=None, log=print):
+    """{name: result with budget_s and ok}; also logs one line per target"""
+    results = {}
+    for name, (code, budget, forbidden) in STARTUP_TARGETS.items():
+        if only and not any(part in name for part in only):
+            continue
+        try:
+            result = run_target(code, forbidden, repeat)
+        except RuntimeError as e:
+            results[name] = {"error": str(e), "ok": False}
+            log(f"{name:<32} error: {e}")
+            continue
+        result["budget_s"] = budget * budget_scale
+        result["ok"] = result["median_s"] <= result["budget_s"] and not result["forbidden_loaded"]
+        results[name] = result
+        note = "" if not result["forbidden_loaded"] else f"  loads {', '.join(result['forbidden_loaded'])}"
+        log(f"{name:<32} {result['median_s'] * 1000:8.0f} ms  (budget {result['budget_s'] * 1000:.0f} ms)"
+            f"  {'ok' if result['ok'] else 'FAIL'}{note}")
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="fresh interpreters per target")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="multiply every budget, e.g. 2 on a slow CI machine")
+    parser.add_argument("--only", action="append", help="run only targets whose name contains this (repeatable)")
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run(args.repeat, args.budget_scale, args.only)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0 if all(result["ok"] for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
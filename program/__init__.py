@@ -1 +1,15 @@
-from .index import *
\ No newline at end of file
+# Nama yang dulu diekspor lewat "from .index import *". index mengimpor Streamlit, jadi
+# modul itu baru dimuat saat salah satu nama ini dipakai; CLI dan modul library
+# (controller, reports, ...) dapat diimpor tanpa Streamlit. Mengimpor paket ini
+# tidak memuat apa pun.
+_INDEX_EXPORTS = ("main", "st", "os")
+
+
+def __getattr__(name):
+    if name == "ct":
+        from . import controller
+        return controller
+    if name in _INDEX_EXPORTS:
+        from . import index
+        return getattr(index, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
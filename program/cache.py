@@ -0,0 +1,234 @@
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "kotlin-metrics", "metrics.sqlite")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+TOUCH_FLUSH_EVERY = 1024  # Waktu akses yang ditunda sebelum ditulis sekaligus
+
+
+def content_hash(data):
+    """SHA-256 of the raw bytes of a source file"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def metrics_version(*objects):
+    """
+    Hash of the source code of the modules or functions that compute the metrics.
+    Any change to those sources gives a new version, so stale entries are never reused.
+    """
+    digest = hashlib.sha256()
+    for obj in objects:
+        try:
+            digest.update(inspect.getsource(obj).encode("utf-8"))
+        except (OSError, TypeError):
+            digest.update(repr(obj).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class MetricsCache:
+    """
+    Persistent per-file metrics cache keyed by content hash plus metrics version.
+
+    Entries are pickled into a SQLite database. When the total size exceeds
+    max_bytes the least recently used entries are evicted. A hit only reads:
+    its new last_access is kept in memory and written in one transaction with
+    the next put, every TOUCH_FLUSH_EVERY hits, or on flush()/close(). The total
+    size is kept as a running sum, counted once per connection and re-counted
+    only before evicting. hits and misses count every lookup made through this
+    instance. One instance may be shared between threads (e.g. Streamlit
+    sessions), so the statistics of one analysis come from a session().
+    """
+
+    def __init__(self, namespace, version, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.namespace = namespace
+        self.version = version
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._connection = None
+        self._lock = threading.RLock()
+        self._touched = {}  # {key: last_access} yang belum ditulis
+        self._total = 0  # Ukuran total entry, dijaga tanpa SUM di setiap put
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if self.path != ":memory:" and directory:
+                os.makedirs(directory, exist_ok=True)
+            # Akses dari beberapa thread diserialisasi oleh self._lock
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+            self._total = self._sum_sizes()
+        return self._connection
+
+    def _sum_sizes(self):
+        return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _key(self, digest):
+        return f"{self.namespace}:{self.version}:{digest}"
+
+    def get(self, digest):
+        """Return the cached value for a content hash, or None on a miss"""
+        with self._lock:
+            return self._get(digest)
+
+    def _get(self, digest):
+        if digest is None:
+            self.misses += 1
+            return None
+        connection = self._connect()
+        key = self._key(digest)
+        row = connection.execute("SELECT value, size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            value = pickle.loads(row[0])
+        except Exception:
+            # Entry rusak atau dari versi Python lain, anggap miss
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            connection.commit()
+            self._touched.pop(key, None)
+            self._total -= row[1]
+            self.misses += 1
+            return None
+        # Hit tidak menulis ke disk; waktu aksesnya ditulis bersama yang lain
+        self._touched[key] = time.time()
+        if len(self._touched) >= TOUCH_FLUSH_EVERY:
+            self._flush_touched()
+            connection.commit()
+        self.hits += 1
+        return value
+
+    def _flush_touched(self):
+        if self._touched:
+            self._connection.executemany("UPDATE entries SET last_access = ? WHERE key = ?",
+                                         [(when, key) for key, when in self._touched.items()])
+            self._touched.clear()
+
+    def flush(self):
+        """Write the pending last_access times of hits"""
+        with self._lock:
+            if self._connection is not None and self._touched:
+                self._flush_touched()
+                self._connection.commit()
+
+    def session(self):
+        """A CacheSession that counts the lookups of one analysis on its own"""
+        return CacheSession(self)
+
+    def put(self, digest, value):
+        """Store value for a content hash; returns how many entries were evicted"""
+        if digest is None:
+            return 0
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            connection = self._connect()
+            key = self._key(digest)
+            old = connection.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            self._touched.pop(key, None)
+            self._total += len(data) - (old[0] if old else 0)
+            # Waktu akses yang tertunda ikut di transaksi yang sama
+            self._flush_touched()
+            evicted = self._evict() if self._total > self.max_bytes else 0
+            connection.commit()
+            return evicted
+
+    def _evict(self):
+        connection = self._connection
+        # Proses lain bisa menulis ke file yang sama, jadi total dihitung ulang sebelum menghapus
+        self._flush_touched()
+        self._total = self._sum_sizes()
+        evicted = 0
+        if self._total <= self.max_bytes:
+            return evicted
+        for key, size in connection.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            if self._total <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._total -= size
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def size(self):
+        with self._lock:
+            self._connect()
+            return self._total
+
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM entries")
+            connection.commit()
+            self._touched.clear()
+            self._total = 0
+
+    def stats(self):
+        """Lookup statistics of this instance over its lifetime"""
+        return _stats(self, self.hits, self.misses, self.evictions)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self.flush()
+                self._connection.close()
+                self._connection = None
+
+
+class CacheSession:
+    """
+    The lookups of one analysis through a MetricsCache, counted on their own.
+    Has the get/put of the cache, so it can be passed wherever a cache is
+    accepted; other sessions using the same cache do not change its stats().
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, digest):
+        value = self.cache.get(digest)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, digest, value):
+        evicted = self.cache.put(digest, value)
+        self.evictions += evicted
+        return evicted
+
+    def stats(self):
+        return _stats(self.cache, self.hits, self.misses, self.evictions)
+
+
+def _stats(cache, hits, misses, evictions):
+    # Dipanggil di akhir setiap analisis: waktu akses hit ditulis sekali per run
+    cache.flush()
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else 0,
+        "evictions": evictions,
+        "size_bytes": cache.size(),
+    }
@@ -0,0 +1,294 @@
+"""
+Headless batch extraction over many Kotlin projects, without Streamlit.
+
+    python -m program.cli PROJECT [PROJECT ...] --output OUT [--jobs N]
+
+Each PROJECT is a directory or an archive (ZIP, RAR). Projects run in
+parallel, one process each. Every project gets its own folder under OUT with
+class_metrics.csv (controller.extract_and_parse), functions.csv (per-function
+report), report.json (summary and complexity report); OUT also gets the
+combined class_metrics.csv, functions.csv and projects.csv. --format parquet
+or --format feather (repeatable) writes the two metric tables in those
+columnar formats instead of, or next to, CSV. --parse-timeout and
+--parse-memory parse every file in an isolated worker under those budgets; a
+file over budget gets text-based metrics and a Skipped reason. --exclude,
+--include, --max-file-size and --skip-generated drop files before they are
+read (see filters.SourceFilter); what each rule skipped is written as
+filters.json. Byte-identical files are analyzed once; duplicates.json lists
+them. With --profile the
+per-stage timing breakdown of every project is written as profile.json, per
+project and combined.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import controller as ct
+from . import profiling
+from .cache import DEFAULT_CACHE_PATH
+from .export import EXPORT_FORMATS, concatenate_csv, export_file_name, write_csv_rows, write_table
+from .filters import DEFAULT_EXCLUDES, SourceFilter
+from .guard import ParseGuard
+from .parallel import default_workers
+from .reports import (
+    PER_FUNCTION_COLUMNS,
+    analyze_kotlin_sources,
+    calculate_complexity_report_sources,
+    iter_sources_per_function,
+    per_function_metrics_cache,
+)
+from .sources import duplicate_report, iter_archive_sources, iter_directory_sources, source_files
+
+
+def project_name(path):
+    """Project name from a directory or archive path: the base name without the archive extension"""
+    name = os.path.basename(os.path.normpath(path))
+    for extension in (".tar.gz", ".tar.bz2", ".zip", ".rar", ".tar", ".tgz"):
+        if name.lower().endswith(extension):
+            return name[: -len(extension)]
+    return name
+
+
+def read_project_sources(path, source_filter=None):
+    """All Kotlin (name, bytes) sources of a project, read once; names are relative to the project"""
+    if os.path.isdir(path):
+        return [(os.path.relpath(name, path), data)
+                for name, data in iter_directory_sources(path, source_filter=source_filter)]
+    return list(iter_archive_sources(path, source_filter=source_filter))
+
+
+def write_tables(directory, tables, formats):
+    """Write {file stem: DataFrame} in every export format"""
+    for stem, df in tables.items():
+        for export_format in formats:
+            write_table(df, os.path.join(directory, export_file_name(stem, export_format)), export_format)
+
+
+def analyze_project(path, name, output_dir, cache_path=None, profiler=None, formats=("csv",), guard=None,
+                    source_filter=None):
+    """Run every report on one project, write its outputs and return its frames and counters"""
+    start = time.perf_counter()
+    with profiling.use(profiler):
+        with profiling.stage("read project"):
+            sources = read_project_sources(path, source_filter)
+        # Laporan teks di halaman Streamlit hanya membaca file .kt
+        kotlin_sources = [source for source in sources if source[0].endswith(".kt")]
+
+        cache = ct.metrics_cache(cache_path) if cache_path else None
+        with profiling.stage("extract_and_parse"):
+            class_metrics = ct.extract_and_parse_sources(sources, cache=cache, guard=guard)
+        summary = analyze_kotlin_sources(kotlin_sources)
+        complexity = calculate_complexity_report_sources(kotlin_sources)
+
+        project_dir = os.path.join(output_dir, name)
+        os.makedirs(project_dir, exist_ok=True)
+        function_cache = per_function_metrics_cache(cache_path) if cache_path else None
+        function_rows = iter_sources_per_function(kotlin_sources, name, function_cache)
+        functions = None
+        if formats == ("csv",):
+            # Baris per function langsung ditulis ke CSV, tanpa list atau DataFrame penuh
+            with profiling.stage("per-function report (streamed to CSV)"):
+                write_csv_rows(function_rows, os.path.join(project_dir, "functions.csv"), PER_FUNCTION_COLUMNS)
+        else:
+            import pandas as pd
+            functions = pd.DataFrame(list(function_rows), columns=list(PER_FUNCTION_COLUMNS))
+        # Menulis waktu akses yang tertunda dari kedua cache
+        for opened in (cache, function_cache):
+            if opened is not None:
+                opened.close()
+
+        with profiling.stage("write outputs"):
+            tables = {"class_metrics": class_metrics}
+            if functions is not None:
+                tables["functions"] = functions
+            write_tables(project_dir, tables, formats)
+            with open(os.path.join(project_dir, "report.json"), "w", encoding="utf-8") as f:
+                json.dump({"summary": summary, "complexity": complexity}, f, indent=2)
+            if source_filter is not None:
+                with open(os.path.join(project_dir, "filters.json"), "w", encoding="utf-8") as f:
+                    json.dump(source_filter.report(), f, indent=2)
+            duplicates = duplicate_report(source_files(sources))
+            with open(os.path.join(project_dir, "duplicates.json"), "w", encoding="utf-8") as f:
+                json.dump(duplicates, f, indent=2)
+
+    profile = None
+    if profiler is not None:
+        profile = profiler.report()
+        with open(os.path.join(project_dir, "profile.json"), "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+
+    class_metrics.insert(0, "Project", name)
+    return {
+        "Project": name,
+        "Path": path,
+        "files": class_metrics.attrs["file_count"],
+        "methods": class_metrics.attrs["method_count"],
+        "skipped files": class_metrics.attrs["skipped_count"],
+        "duplicate files": duplicates["duplicate files"],
+        "duplicate share": duplicates["duplicate share"],
+        **({"filtered files": source_filter.skipped_files(), "filtered bytes": source_filter.skipped_bytes()}
+           if source_filter is not None else {}),
+        "seconds": time.perf_counter() - start,
+        **{key: value for key, value in summary.items() if key != "Packages"},
+        **complexity,
+        "class_metrics": class_metrics,
+        "functions": functions,  # None bila functions.csv sudah ditulis secara streaming
+        "functions_csv": os.path.join(project_dir, "functions.csv"),
+        "profile": profile,
+    }
+
+
+def _run_project(job):
+    path, name, output_dir, cache_path, profile_options, formats, guard, filter_options = job
+    profiler = profiling.Profiler(**profile_options) if profile_options is not None else None
+    # Filter baru per proyek, supaya statistiknya tidak tercampur
+    source_filter = SourceFilter(*filter_options) if filter_options is not None else None
+    try:
+        return analyze_project(path, name, output_dir, cache_path, profiler, formats, guard, source_filter)
+    except Exception as e:
+        # Satu proyek yang gagal (arsip rusak, dsb.) tidak menghentikan batch
+        return {"Project": name, "Path": path, "Error": str(e)}
+
+
+def unique_names(paths):
+    names = []
+    seen = {}
+    for path in paths:
+        name = project_name(path)
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name}-{seen[name]}")
+    return names
+
+
+def run_batch(paths, output_dir, jobs=None, cache_path=None, profile_options=None, log=print, formats=("csv",),
+              guard=None, filter_options=None):
+    """
+    Analyze projects in parallel, write per-project and combined outputs, return the project rows.
+    profile_options are the Profiler arguments ({"cprofile": ..., "memory": ...}); None disables profiling.
+    formats are the EXPORT_FORMATS the metric tables are written in; guard is an optional ParseGuard.
+    filter_options are the SourceFilter arguments (include, exclude, max_size, skip_generated).
+    """
+    import pandas as pd
+
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = max(1, min(jobs or default_workers(), len(paths)))
+    tasks = [(path, name, output_dir, cache_path, profile_options, formats, guard, filter_options)
+             for path, name in zip(paths, unique_names(paths))]
+
+    start = time.perf_counter()
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = []
+            for number, result in enumerate(executor.map(_run_project, tasks), start=1):
+                log_project(log, number, len(tasks), result)
+                results.append(result)
+    else:
+        results = []
+        for number, task in enumerate(tasks, start=1):
+            result = _run_project(task)
+            log_project(log, number, len(tasks), result)
+            results.append(result)
+    elapsed = time.perf_counter() - start
+
+    finished = [result for result in results if "Error" not in result]
+    if finished:
+        tables = {"class_metrics": pd.concat([result["class_metrics"] for result in finished], ignore_index=True)}
+        if formats == ("csv",):
+            concatenate_csv([result["functions_csv"] for result in finished], os.path.join(output_dir, "functions.csv"))
+        else:
+            tables["functions"] = pd.concat([result["functions"] for result in finished], ignore_index=True)
+        write_tables(output_dir, tables, formats)
+    projects = [
+        {key: value for key, value in result.items()
+         if key not in ("class_metrics", "functions", "functions_csv", "profile")}
+        for result in results
+    ]
+    pd.DataFrame(projects).to_csv(os.path.join(output_dir, "projects.csv"), index=False)
+    if profile_options is not None:
+        with open(os.path.join(output_dir, "profile.json"), "w", encoding="utf-8") as f:
+            json.dump({"total_s": elapsed, "projects": {result["Project"]: result["profile"] for result in finished}},
+                      f, indent=2)
+
+    files = sum(result["files"] for result in finished)
+    methods = sum(result["methods"] for result in finished)
+    log(
+        f"{len(finished)}/{len(results)} projects, {files} files, {methods} methods in {elapsed:.2f}s: "
+        f"{files / elapsed if elapsed else 0:.1f} files/s, {methods / elapsed if elapsed else 0:.1f} methods/s"
+    )
+    return projects
+
+
+def log_project(log, number, total, result):
+    if "Error" in result:
+        log(f"[{number}/{total}] {result['Project']}: error: {result['Error']}")
+    else:
+        log(
+            f"[{number}/{total}] {result['Project']}: {result['files']} files, "
+            f"{result['methods']} methods in {result['seconds']:.2f}s"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m program.cli",
+        description="Extract Kotlin metrics from project directories or archives without the Streamlit UI.",
+    )
+    parser.add_argument("projects", nargs="+", help="project directories or archives (ZIP, RAR)")
+    parser.add_argument("-o", "--output", default="metrics-output", help="output directory (default: metrics-output)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="projects analyzed in parallel (default: number of CPUs)")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_PATH, default=None, metavar="PATH",
+                        help=f"reuse cached metrics for unchanged files (default path: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--format", action="append", choices=list(EXPORT_FORMATS), dest="formats",
+                        help="format of the metric tables, repeatable (default: csv); parquet and feather need pyarrow")
+    parser.add_argument("--parse-timeout", type=float, default=None, metavar="SECONDS",
+                        help="parse each file in an isolated worker and skip it after this many seconds")
+    parser.add_argument("--parse-memory", type=int, default=None, metavar="MIB",
+                        help="parse each file in an isolated worker limited to this much memory")
+    parser.add_argument("--no-text-fallback", action="store_true",
+                        help="leave skipped files without metrics instead of using text-based metrics")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="skip files and directories matching this path glob (repeatable)")
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB",
+                        help="analyze only files matching one of these path globs (repeatable)")
+    parser.add_argument("--max-file-size", type=int, default=None, metavar="KIB", help="skip larger Kotlin files")
+    parser.add_argument("--skip-generated", action="store_true",
+                        help="skip Gradle build output (build/generated, build/tmp, build/intermediates), kapt/ksp, "
+                             "vendored directories and files with a generated-code header; these default "
+                             "excludes are only active with this flag")
+    parser.add_argument("--profile", action="store_true", help="write a per-stage timing breakdown (profile.json)")
+    parser.add_argument("--cprofile", action="store_true", help="include the top cProfile functions (implies --profile)")
+    parser.add_argument("--tracemalloc", action="store_true", help="include peak traced memory (implies --profile)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    missing = [path for path in args.projects if not os.path.exists(path)]
+    if missing:
+        print(f"Not found: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    profile_options = None
+    if args.profile or args.cprofile or args.tracemalloc:
+        profile_options = {"cprofile": args.cprofile, "memory": args.tracemalloc}
+    guard = None
+    if args.parse_timeout or args.parse_memory:
+        guard = ParseGuard(args.parse_timeout, args.parse_memory * 1024 * 1024 if args.parse_memory else None,
+                           not args.no_text_fallback)
+    filter_options = None
+    if args.exclude or args.include or args.max_file_size or args.skip_generated:
+        # DEFAULT_EXCLUDES hanya aktif dengan --skip-generated
+        exclude = (DEFAULT_EXCLUDES if args.skip_generated else ()) + tuple(args.exclude)
+        filter_options = (tuple(args.include), exclude, args.max_file_size * 1024 if args.max_file_size else None,
+                          args.skip_generated)
+    projects = run_batch(args.projects, args.output, args.jobs, args.cache, profile_options,
+                         formats=tuple(dict.fromkeys(args.formats or ["csv"])), guard=guard,
+                         filter_options=filter_options)
+    return 1 if any("Error" in project for project in projects) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
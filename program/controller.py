@@ -1,212 +1,334 @@
+import copy
 import os
-import tempfile
-import patoolib
-import pandas as pd
+import sys
 from kopyt import Parser, node
 from kopyt.node import ClassDeclaration  # Perhatikan perubahan di sini
+from . import inheritance, lexer, profiling, visitor
+from .cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES, MetricsCache, content_hash, metrics_version
+from .inheritance import InheritanceIndex, collect_class_declarations, collect_imports
+from .lexer import IDENTIFIER, code_tokens, is_keyword, tokenize, tokens_by_line
+from .sources import KOTLIN_EXTENSIONS, decode_source, iter_archive_sources, iter_directory_paths
+from .tables import MetricTables
+from .visitor import ClassRecord, MetricCalculator, MetricVisitor
 
-def manual_max_nesting(body_str):
+# Baris yang diawali kata kunci ini menambah kedalaman nesting / nilai CC
+NESTING_KEYWORDS = ("if", "try", "for", "catch", "else", "when")
+CC_KEYWORDS = ("if", "for", "while", "when", "catch", "case")
+
+def manual_max_nesting(body_str, tokens=None):
+    # Kata kunci di dalam string, komentar atau nama (mis. "iffy", "forEach") tidak dihitung
+    tokens = tokenize(body_str) if tokens is None else tokens
     indent_levels = []
     max_depth = 0
-    for line in body_str.split("\n"):
-        stripped = line.strip()
-        if stripped.startswith(("if", "try", "for", "catch", "else", "when")):
-            indent_levels.append(stripped)
+    for line_tokens in tokens_by_line(tokens).values():
+        first = line_tokens[0]
+        if is_keyword(first, NESTING_KEYWORDS):
+            indent_levels.append(first.value)
             max_depth = max(max_depth, len(indent_levels))
-        elif stripped == "}":
+        elif len(line_tokens) == 1 and first.value == "}":
             if indent_levels:
                 indent_levels.pop()
     return max_depth
 
-def count_cc_manual(method_code):
+def count_cc_manual(method_code, tokens=None):
     cc = 1
-    control_keywords = ["if", "for", "while", "when", "catch", "case"]
-    lines = method_code.split("\n")
-    for line in lines:
-        stripped = line.strip()
-        for keyword in control_keywords:
-            if stripped.startswith(keyword):
-                cc += 1
+    tokens = tokenize(method_code) if tokens is None else tokens
+    for line_tokens in tokens_by_line(tokens).values():
+        if is_keyword(line_tokens[0], CC_KEYWORDS):
+            cc += 1
     return cc
 
 def count_woc(cc_values):
     total_CC = sum(cc_values)
     return [cc / total_CC if total_CC else 0 for cc in cc_values]
 
-def count_noi(directory):
-    noi_count = 0
-    kotlin_files = [os.path.join(root, f) for root, _, files in os.walk(directory) for f in files if f.endswith(".kt") or f.endswith(".kts")]
-    for file_path in kotlin_files:
+def find_kotlin_files(directory, source_filter=None):
+    paths = iter_directory_paths(directory, KOTLIN_EXTENSIONS, source_filter)
+    if source_filter is None:
+        return list(paths)
+    return [path for path in paths if source_filter.check_file(path)]
+
+class ParsedModule:
+    """A Kotlin source file parsed once: its path, package name and KotlinFile node"""
+    __slots__ = ("path", "package", "kotlin_file", "error")
+
+    def __init__(self, path, package=None, kotlin_file=None, error=None):
+        self.path = path
+        self.package = package  # None jika file tidak punya deklarasi package
+        self.kotlin_file = kotlin_file
+        self.error = error  # Exception dari proses baca/parse, None jika berhasil
+
+class ParsedModuleStore:
+    """
+    Per-upload store of parsed Kotlin modules.
+    Each file is read and parsed exactly once; the project-level counters and
+    extracted_method all read the KotlinFile nodes from here instead of parsing again.
+    """
+    def __init__(self):
+        self.modules = []
+        self._by_path = {}
+        self.parse_count = 0  # Jumlah pemanggilan Parser, harus sama dengan jumlah file
+        self._inheritance_index = None
+
+    @classmethod
+    def from_directory(cls, directory, source_filter=None):
+        store = cls()
+        for file_path in find_kotlin_files(directory, source_filter):
+            store.add_file(file_path)
+        return store
+
+    def add_file(self, file_path):
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 code = f.read()
-            parser = Parser(code)
-            result = parser.parse()
-            for declaration in result.declarations:
-                if isinstance(declaration, node.InterfaceDeclaration):
-                    noi_count += 1
         except Exception as e:
             print(f"Error parsing {file_path}: {e}")
-    return noi_count
+            return self._add(ParsedModule(file_path, error=e))
+        return self.add_source(file_path, code)
 
-def count_nom(directory):
-    nom_count = 0
-    kotlin_files = [os.path.join(root, f) for root, _, files in os.walk(directory) for f in files if f.endswith(".kt") or f.endswith(".kts")]
-    for file_path in kotlin_files:
+    def add_bytes(self, path, data):
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                code = f.read()
-            parser = Parser(code)
-            result = parser.parse()
-            for declaration in result.declarations:
-                if hasattr(declaration, "body") and declaration.body:
-                    for member in declaration.body.members:
-                        if isinstance(member, node.FunctionDeclaration):
-                            nom_count += 1
+            code = decode_source(data)
         except Exception as e:
-            print(f"Error parsing {file_path}: {e}")
-    return nom_count
+            print(f"Error parsing {path}: {e}")
+            return self._add(ParsedModule(path, error=e))
+        return self.add_source(path, code)
 
-def count_nomnamm(directory):
-    nomnamm_count = 0
-    kotlin_files = [os.path.join(root, f) for root, _, files in os.walk(directory) for f in files if f.endswith(".kt") or f.endswith(".kts")]
-    for file_path in kotlin_files:
+    def add_source(self, path, code):
+        self.parse_count += 1
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                code = f.read()
-            parser = Parser(code)
-            result = parser.parse()
-            for declaration in result.declarations:
-                if hasattr(declaration, "body") and declaration.body:
-                    for member in declaration.body.members:
-                        if isinstance(member, node.FunctionDeclaration):
-                            if not (member.name.startswith("get") or member.name.startswith("set")):
-                                nomnamm_count += 1
+            with profiling.stage("parse"):
+                kotlin_file = Parser(code).parse()
         except Exception as e:
-            print(f"Error parsing {file_path}: {e}")
+            print(f"Error parsing {path}: {e}")
+            return self._add(ParsedModule(path, error=e))
+        package = kotlin_file.package.name if kotlin_file.package else None
+        return self._add(ParsedModule(path, package, kotlin_file))
+
+    def _add(self, module):
+        self._inheritance_index = None
+        self.modules.append(module)
+        self._by_path[module.path] = module
+        return module
+
+    def get(self, path):
+        return self._by_path.get(path)
+
+    def parsed(self):
+        return [module for module in self.modules if module.error is None]
+
+    def inheritance_index(self):
+        """Project-wide InheritanceIndex, built once and reused for every NOC_type lookup"""
+        if self._inheritance_index is None:
+            self._inheritance_index = InheritanceIndex.from_modules(self.modules)
+        return self._inheritance_index
+
+    @property
+    def file_count(self):
+        return len(self.modules)
+
+    def __iter__(self):
+        return iter(self.modules)
+
+    def __len__(self):
+        return len(self.modules)
+
+def as_module_store(source):
+    """Accept either a directory or an existing ParsedModuleStore"""
+    if isinstance(source, ParsedModuleStore):
+        return source
+    return ParsedModuleStore.from_directory(source)
+
+def count_noi(source):
+    noi_count = 0
+    for module in as_module_store(source).parsed():
+        for declaration in module.kotlin_file.declarations:
+            if isinstance(declaration, node.InterfaceDeclaration):
+                noi_count += 1
+    return noi_count
+
+def count_nom(source):
+    nom_count = 0
+    for module in as_module_store(source).parsed():
+        for declaration in module.kotlin_file.declarations:
+            if hasattr(declaration, "body") and declaration.body:
+                for member in declaration.body.members:
+                    if isinstance(member, node.FunctionDeclaration):
+                        nom_count += 1
+    return nom_count
+
+def count_nomnamm(source):
+    nomnamm_count = 0
+    for module in as_module_store(source).parsed():
+        for declaration in module.kotlin_file.declarations:
+            if hasattr(declaration, "body") and declaration.body:
+                for member in declaration.body.members:
+                    if isinstance(member, node.FunctionDeclaration):
+                        if not (member.name.startswith("get") or member.name.startswith("set")):
+                            nomnamm_count += 1
     return nomnamm_count
 
-def count_noc_type(directory, include_external_classes=True):
-    import os
-    from kopyt import Parser
-    from kopyt.node import ClassDeclaration, InterfaceDeclaration
+def count_noc_type(source, include_external_classes=True):
+    """
+    Calculate NOC_type (Number of Children) for every class in the project.
+    Returns a dictionary mapping simple class names to their number of direct subclasses
+    """
+    with profiling.stage("count_noc_type"):
+        index = as_module_store(source).inheritance_index()
+        return index.noc_mapping(include_external_classes)
+
+def count_nocs_package(source):
+    """
+    Calculate NOCS_package (Number of Classes in a Package)
+    This metric counts the number of classes in each package
     
-    classes = {}  # {class_name: [superclasses]}
-    all_classes = set()
-    external_classes = set()  # For tracking external superclasses
+    Returns a dictionary mapping package names to their class counts
+    """
+    # Dictionary untuk menyimpan jumlah kelas per package
+    package_class_counts = {}
+    
+    # File yang gagal di-parse sudah dicatat oleh store dan dilewati di sini
+    for module in as_module_store(source).parsed():
+        # Dapatkan nama paket
+        package_name = module.package if module.package else "default"
+        
+        # Hitung jumlah kelas dalam file ini
+        class_count = sum(1 for decl in module.kotlin_file.declarations if isinstance(decl, node.ClassDeclaration))
+        
+        # Update jumlah kelas untuk paket ini
+        if package_name in package_class_counts:
+            package_class_counts[package_name] += class_count
+        else:
+            package_class_counts[package_name] = class_count
+    
+    return package_class_counts
 
-    kotlin_files = [
-        os.path.join(root, f) 
-        for root, _, files in os.walk(directory) 
-        for f in files if f.endswith(".kt") or f.endswith(".kts")
-    ]
+def method_tokens(method):
+    """Token stream of a MethodRecord body, produced once and shared by the text-based metrics"""
+    return method.memo("tokens", tokenize)
 
-    for file_path in kotlin_files:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                code = f.read()
-            
-            parser = Parser(code)
-            kotlin_file = parser.parse()
-            
-            for decl in kotlin_file.declarations:
-                if isinstance(decl, ClassDeclaration) or isinstance(decl, InterfaceDeclaration):
-                    class_name = decl.name
-                    all_classes.add(class_name)
-                    
-                    super_types = []
-                    
-                    # Process supertypes to find inheritance relationships
-                    if hasattr(decl, 'supertypes') and decl.supertypes:
-                        for supertype in decl.supertypes:
-                            super_name = None
-                            
-                            # Extract the name from the supertype structure
-                            # For constructor invocations (class inheritance with parentheses)
-                            if hasattr(supertype, 'delegate') and hasattr(supertype.delegate, 'invoker'):
-                                if hasattr(supertype.delegate.invoker, 'sequence') and supertype.delegate.invoker.sequence:
-                                    super_name = supertype.delegate.invoker.sequence[0].name
-                            
-                            # For direct type references (interface implementation)
-                            elif hasattr(supertype, 'delegate') and hasattr(supertype.delegate, 'sequence'):
-                                if supertype.delegate.sequence:
-                                    super_name = supertype.delegate.sequence[0].name
-                            
-                            if super_name:
-                                super_types.append(super_name)
-                                print(f"Found inheritance relationship: {class_name} extends/implements {super_name}")
-                                
-                                # Track external superclasses (not declared in your code)
-                                if super_name not in all_classes:
-                                    external_classes.add(super_name)
-                    
-                    classes[class_name] = super_types
-                    
-        except Exception as e:
-            print(f"Error parsing {file_path}: {str(e)}")
+def method_cc(method):
+    """Cyclomatic complexity of a MethodRecord, computed once and shared by every calculator"""
+    return method.memo("cc", lambda text: count_cc_manual(text, method_tokens(method)))
 
-    # Add external classes to tracking if requested
-    if include_external_classes:
-        for ext_class in external_classes:
-            all_classes.add(ext_class)
+class LOCCalculator(MetricCalculator):
+    name = "LOC"
+    level = "method"
 
-    # Initialize NOC count
-    class_hierarchy = {cls: 0 for cls in all_classes}
+    def measure(self, method):
+        return 0 if method.is_empty else method.text.count("\n") + 1
 
-    # Count subclass relationships
-    for class_name, super_types in classes.items():
-        for super_type in super_types:
-            simple_super_type = super_type.split('.')[-1]  # Handle qualified names
-            
-            if simple_super_type in class_hierarchy:
-                class_hierarchy[simple_super_type] += 1
-                print(f"Inheritance counted: {simple_super_type} now has {class_hierarchy[simple_super_type]} children")
-            else:
-                print(f"Warning: Superclass '{simple_super_type}' not found in tracked classes")
+class MaxNestingCalculator(MetricCalculator):
+    name = "Max Nesting"
+    level = "method"
 
-    return class_hierarchy
+    def measure(self, method):
+        return 0 if method.is_empty else method.memo("max_nesting", lambda text: manual_max_nesting(text, method_tokens(method)))
 
-# Function to calculate WMC for a single class
-def calculate_wmc_for_class(class_declaration):
+class CCCalculator(MetricCalculator):
+    name = "CC"
+    level = "method"
+
+    def measure(self, method):
+        return 0 if method.is_empty else method_cc(method)
+
+class WMCCalculator(MetricCalculator):
     """Calculate WMC (Weighted Methods per Class) for a single class declaration"""
-    if class_declaration.body is None:
-        return 0
-        
-    wmc_value = 0
-    for member in class_declaration.body.members:
-        if isinstance(member, node.FunctionDeclaration):
-            # Calculate complexity for this function
-            cc_value = count_cc_manual(str(member.body)) if member.body else 0
-            wmc_value += cc_value
-            
-    return wmc_value
+    name = "WMC_type"
 
-def calculate_wmcnamm_type(class_declaration):
+    def measure(self, cls):
+        return sum(0 if method.is_empty else method_cc(method) for method in cls.methods)
+
+# Token yang diabaikan LCOM5: konstruksi umum bahasa pemrograman
+LCOM5_COMMON_KEYWORDS = frozenset({
+    'if', 'else', 'for', 'while', 'return', 'var', 'val', 'fun', 
+    'this', 'null', 'true', 'false', 'it', 'when', 'is', 'as',
+    '{', '}', '(', ')', '[', ']', ';', ',', '.', '=', '+', '-', 
+    '*', '/', '&&', '||', '!', '<', '>', '<=', '>=', '==', '!=',
+    'private', 'public', 'protected', 'internal', 'override'
+})
+
+def meaningful_tokens(body):
+    """Whitespace tokens of a method body, without common keywords and short tokens"""
+    return {token for token in body.split() if token not in LCOM5_COMMON_KEYWORDS and len(token) > 2}
+
+class LCOM5Calculator(MetricCalculator):
     """
-    Calculate WMCNAMM_type (Weighted Methods per Class for Non-Accessor/Mutator Methods)
-    This metric calculates the sum of cyclomatic complexity of non-accessor/non-mutator methods in a class
+    Calculate LCOM5 (Lack of Cohesion in Methods) 
+    Uses a simplified approach based on method body similarity: a pair of methods
+    is cohesive when their bodies share at least one meaningful token
     """
-    if class_declaration.body is None:
+    name = "LCOM5"
+
+    def measure(self, cls):
+        # Collect all methods with bodies
+        methods = [method for method in cls.methods if method.has_body]
+        
+        # Need at least 2 methods for LCOM5 calculation
+        if len(methods) < 2:
+            return 0
+        
+        # Tokenisasi setiap body sekali
+        return lcom5_from_token_sets([set() if method.is_empty else method.memo("lcom5_tokens", meaningful_tokens)
+                                      for method in methods])
+
+def lcom5_from_token_sets(token_sets):
+    """LCOM5 of methods given the meaningful token set of each body; 0 for fewer than two methods"""
+    if len(token_sets) < 2:
         return 0
     
-    total_cc = 0
+    # Inverted index token -> bitset metode
+    postings = {}
+    for i, tokens in enumerate(token_sets):
+        bit = 1 << i
+        for token in tokens:
+            postings[token] = postings.get(token, 0) | bit
+    
+    # Pasangan (i, j) dengan j > i kohesif jika j muncul di posting salah satu token milik i
+    cohesive_pairs = 0
+    for i, tokens in enumerate(token_sets):
+        neighbours = 0
+        for token in tokens:
+            neighbours |= postings[token]
+        cohesive_pairs += (neighbours >> (i + 1)).bit_count()
+    
+    total_pairs = len(token_sets) * (len(token_sets) - 1) // 2
     
-    # Identifikasi semua properti/atribut kelas untuk menentukan accessor/mutator methods
-    class_properties = set()
-    for member in class_declaration.body.members:
-        if isinstance(member, node.PropertyDeclaration) or isinstance(member, node.VariableDeclaration):
-            if hasattr(member, 'name'):
-                class_properties.add(member.name)
+    # LCOM5 = 1 - (cohesive pairs / total pairs)
+    # Higher values indicate lower cohesion
+    lcom5 = 1 - (cohesive_pairs / total_pairs)
     
-    # Iterasi melalui semua metode kelas
-    for member in class_declaration.body.members:
-        if isinstance(member, node.FunctionDeclaration):
+    # Ensure result is between 0 and 1
+    return max(0.0, min(1.0, lcom5))
+
+class WMCNAMMCalculator(MetricCalculator):
+    """
+    Calculate WMCNAMM_type (Weighted Methods per Class for Non-Accessor/Mutator Methods)
+    This metric calculates the sum of cyclomatic complexity of non-accessor/non-mutator methods in a class
+    """
+    name = "WMCNAMM_type"
+
+    def measure(self, cls):
+        if not cls.has_body:
+            return 0
+        
+        total_cc = 0
+        
+        # Identifikasi semua properti/atribut kelas untuk menentukan accessor/mutator methods
+        class_properties = set()
+        for member in cls.members:
+            if isinstance(member, node.PropertyDeclaration) or isinstance(member, node.VariableDeclaration):
+                if hasattr(member, 'name'):
+                    class_properties.add(member.name)
+        
+        # Iterasi melalui semua metode kelas
+        for method in cls.methods:
             # Skip jika metode tidak memiliki body
-            if member.body is None:
+            if not method.has_body:
                 continue
             
-            function_name = member.name
-            function_body = str(member.body)
+            function_name = method.name
+            function_body = method.text
             
             # Cek apakah metode adalah accessor/mutator
             is_accessor_mutator = False
@@ -244,244 +366,569 @@ def calculate_wmcnamm_type(class_declaration):
             # Jika bukan accessor/mutator, hitung kompleksitasnya
             if not is_accessor_mutator:
                 # Hitung kompleksitas siklomat metode
-                cc_value = count_cc_manual(function_body)
-                total_cc += cc_value
-    
-    return total_cc
+                total_cc += method_cc(method)
+        
+        return total_cc
 
-def calculate_amw_type(class_declaration):
+class AMWCalculator(MetricCalculator):
     """
     Calculate AMW_type (Average Method Weight)
     This metric calculates the average cyclomatic complexity of methods in a class
     """
-    if class_declaration.body is None:
-        return 0
-    
-    method_cc_values = []
-    
-    # Iterasi melalui semua metode kelas
-    for member in class_declaration.body.members:
-        if isinstance(member, node.FunctionDeclaration):
-            # Skip jika metode tidak memiliki body
-            if member.body is None:
-                continue
-            
-            # Hitung kompleksitas siklomat metode
-            function_body = str(member.body)
-            cc_value = count_cc_manual(function_body)
-            method_cc_values.append(cc_value)
-    
-    # Hitung rata-rata kompleksitas
-    if method_cc_values:
-        return sum(method_cc_values) / len(method_cc_values)
-    else:
-        return 0  # Jika tidak ada metode, kembalikan 0
+    name = "AMW_type"
+
+    def measure(self, cls):
+        # Hitung kompleksitas siklomat setiap metode yang memiliki body
+        method_cc_values = [method_cc(method) for method in cls.methods if method.has_body]
+        
+        # Hitung rata-rata kompleksitas
+        if method_cc_values:
+            return sum(method_cc_values) / len(method_cc_values)
+        else:
+            return 0  # Jika tidak ada metode, kembalikan 0
+
+# Kalkulator bawaan; metrik baru cukup didaftarkan dengan METRIC_VISITOR.register(...)
+METRIC_VISITOR = MetricVisitor([
+    LOCCalculator(),
+    MaxNestingCalculator(),
+    CCCalculator(),
+    WMCCalculator(),
+    LCOM5Calculator(),
+    WMCNAMMCalculator(),
+    AMWCalculator(),
+])
+BUILTIN_CLASS_METRICS = ("WMC_type", "LCOM5", "WMCNAMM_type", "AMW_type")
+BUILTIN_METHOD_METRICS = ("CC", "LOC", "Max Nesting")
+
+def _class_metric(class_declaration, calculator):
+    return calculator.measure(ClassRecord(class_declaration))
+
+# Function to calculate WMC for a single class
+def calculate_wmc_for_class(class_declaration):
+    """Calculate WMC (Weighted Methods per Class) for a single class declaration"""
+    return _class_metric(class_declaration, WMCCalculator())
+
+def calculate_wmcnamm_type(class_declaration):
+    """Calculate WMCNAMM_type (Weighted Methods per Class for Non-Accessor/Mutator Methods)"""
+    return _class_metric(class_declaration, WMCNAMMCalculator())
+
+def calculate_amw_type(class_declaration):
+    """Calculate AMW_type (Average Method Weight)"""
+    return _class_metric(class_declaration, AMWCalculator())
+
+def calculate_lcom5(class_declaration):
+    """Calculate LCOM5 (Lack of Cohesion in Methods)"""
+    return _class_metric(class_declaration, LCOM5Calculator())
 
-def count_nocs_package(directory):
+class ClassSummary:
     """
-    Calculate NOCS_package (Number of Classes in a Package)
-    This metric counts the number of classes in each package
-    
-    Returns a dictionary mapping package names to their class counts
+    Per-class metrics of one file; methods holds (name, cc, loc, max nesting) tuples.
+    Values of extra registered calculators go to extra (class level) and
+    method_extra (one dict per method, empty when there are none).
     """
-    # Dictionary untuk menyimpan jumlah kelas per package
-    package_class_counts = {}
+    __slots__ = ("name", "has_body", "wmc_type", "lcom5", "wmcnamm_type", "amw_type", "methods",
+                 "extra", "method_extra")
+
+    def __init__(self, name, has_body, wmc_type, lcom5, wmcnamm_type, amw_type, methods,
+                 extra=None, method_extra=None):
+        self.name = name
+        self.has_body = has_body
+        self.wmc_type = wmc_type
+        self.lcom5 = lcom5
+        self.wmcnamm_type = wmcnamm_type
+        self.amw_type = amw_type
+        self.methods = methods
+        self.extra = extra or {}
+        self.method_extra = method_extra or []
+
+class FileSummary:
+    """
+    Compact, picklable result for one Kotlin file.
+    Holds the file's contribution to the project counters and its per-class metrics,
+    but no project-wide values, so it can be computed independently of other files.
+    """
+    __slots__ = ("path", "package", "error", "noi", "nom", "nomnamm", "class_count",
+                 "has_declarations", "declarations", "imports", "wildcards", "classes", "skipped", "duplicate_of")
+
+    def __init__(self, path, package=None, error=None):
+        self.path = path
+        self.package = package
+        self.error = error
+        self.skipped = None  # Alasan file tidak di-parse (lihat guard.ParseGuard)
+        self.duplicate_of = None  # Path file sebelumnya dengan isi yang sama persis
+        self.noi = 0
+        self.nom = 0
+        self.nomnamm = 0
+        self.class_count = 0
+        self.has_declarations = False
+        self.declarations = []  # [(class_name, [supertype names])] untuk index pewarisan
+        self.imports = {}
+        self.wildcards = []
+        self.classes = []
+
+def summarize_module(module, raise_memory_error=False):
+    """
+    Compute the per-file part of every metric from a ParsedModule. Errors while
+    measuring end up in summary.error; with raise_memory_error a MemoryError is
+    raised instead, so a guard worker can report it as over the memory budget.
+    """
+    summary = FileSummary(module.path, module.package)
+    if module.error is not None:
+        summary.error = str(module.error)
+        return summary
+    result = module.kotlin_file
     
-    # Temukan semua file Kotlin dalam direktori
-    kotlin_files = [os.path.join(root, f) for root, _, files in os.walk(directory) 
-                  for f in files if f.endswith(".kt") or f.endswith(".kts")]
+    # Kontribusi file ini ke NOI, NOM, NOMNAMM dan NOCS_package
+    for declaration in result.declarations:
+        if isinstance(declaration, node.InterfaceDeclaration):
+            summary.noi += 1
+        if isinstance(declaration, node.ClassDeclaration):
+            summary.class_count += 1
+        if hasattr(declaration, "body") and declaration.body:
+            for member in declaration.body.members:
+                if isinstance(member, node.FunctionDeclaration):
+                    summary.nom += 1
+                    if not (member.name.startswith("get") or member.name.startswith("set")):
+                        summary.nomnamm += 1
     
-    for file_path in kotlin_files:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                code = f.read()
-            parser = Parser(code)
-            result = parser.parse()
-            
-            # Dapatkan nama paket
-            package_name = result.package.name if result.package else "default"
+    try:
+        summary.has_declarations = bool(result.declarations)
+        summary.declarations = collect_class_declarations(result)
+        summary.imports, summary.wildcards = collect_imports(result)
+        for class_declaration in result.declarations:
+            if not isinstance(class_declaration, node.ClassDeclaration):
+                continue
+            # Satu kali jalan per kelas: setiap body di-render sekali lalu dipakai semua kalkulator
+            record, class_values, method_values = METRIC_VISITOR.visit_class(class_declaration)
             
-            # Hitung jumlah kelas dalam file ini
-            class_count = sum(1 for decl in result.declarations if isinstance(decl, node.ClassDeclaration))
+            method_function = {}
+            for method, values in zip(record.methods, method_values):
+                method_function[method.name] = values
             
-            # Update jumlah kelas untuk paket ini
-            if package_name in package_class_counts:
-                package_class_counts[package_name] += class_count
-            else:
-                package_class_counts[package_name] = class_count
-                
-        except Exception:
-            # Jika file tidak dapat di-parse, lanjutkan ke file berikutnya
-            continue
-    
-    return package_class_counts
+            methods = [(name, values["CC"], values["LOC"], values["Max Nesting"])
+                       for name, values in method_function.items()]
+            method_extra = [{key: value for key, value in values.items() if key not in BUILTIN_METHOD_METRICS}
+                            for values in method_function.values()]
+            summary.classes.append(ClassSummary(
+                record.name, record.has_body, class_values["WMC_type"], class_values["LCOM5"],
+                class_values["WMCNAMM_type"], class_values["AMW_type"], methods,
+                {key: value for key, value in class_values.items() if key not in BUILTIN_CLASS_METRICS},
+                method_extra if any(method_extra) else None))
+    except MemoryError as e:
+        if raise_memory_error:
+            raise
+        summary.error = str(e)
+    except Exception as e:
+        summary.error = str(e)
+    return summary
 
-def calculate_lcom5(class_declaration):
+def is_accessor_name(name):
+    return name.startswith("get") or name.startswith("set") or name.startswith("is") or name.startswith("has")
+
+def summarize_text(path, data, reason=None):
     """
-    Calculate LCOM5 (Lack of Cohesion in Methods) 
-    Uses a simplified approach based on method body similarity
+    FileSummary from the token stream only, for a file that is not parsed (see
+    guard.ParseGuard); reason is kept in skipped. Classes and functions are
+    found like the per-function report does, and CC, LOC, Max Nesting, WMC_type,
+    AMW_type and LCOM5 are computed on the text of each body. Accessors are
+    recognised by name and body for WMCNAMM_type, and NOC_type is 0 because
+    supertypes are not resolved.
     """
-    if class_declaration.body is None:
-        return 0
-    
-    # Collect all methods with bodies
-    methods = []
-    for member in class_declaration.body.members:
-        if isinstance(member, node.FunctionDeclaration) and member.body is not None:
-            methods.append(member)
-    
-    # Need at least 2 methods for LCOM5 calculation
-    if len(methods) < 2:
-        return 0
+    from .reports import index_class_spans
+
+    summary = FileSummary(path)
+    summary.skipped = reason
+    try:
+        text = decode_source(data)
+        tokens = code_tokens(tokenize(text))
+        for i, token in enumerate(tokens):
+            if is_keyword(token, ("package",)):
+                names = []
+                for name in tokens[i + 1:]:
+                    if name.line != token.line or (name.kind != IDENTIFIER and name.value != "."):
+                        break
+                    names.append(name.value)
+                summary.package = "".join(names) or None
+                break
+        summary.noi = sum(1 for i, token in enumerate(tokens[:-1])
+                          if is_keyword(token, ("interface",)) and tokens[i + 1].kind == IDENTIFIER)
+        spans = index_class_spans(text, tokens)
+    except Exception as e:
+        summary.error = str(e)
+        return summary
     
-    # Calculate method pairs and their similarity
-    total_pairs = 0
-    cohesive_pairs = 0
+    summary.has_declarations = bool(spans) or summary.noi > 0
+    summary.class_count = len(spans)
+    for span in spans:
+        methods = []
+        token_sets = []
+        wmcnamm = 0
+        for name, body in span["functions"]:
+            cc = count_cc_manual(body) if body else 0
+            loc = body.count("\n") + 1 if body else 0
+            methods.append((name, cc, loc, manual_max_nesting(body) if body else 0))
+            if body:
+                token_sets.append(meaningful_tokens(body))
+            lines = body.strip().split("\n")
+            if not (is_accessor_name(name) and len(lines) <= 3 and any("return" in line or "=" in line for line in lines)):
+                wmcnamm += cc
+            summary.nom += 1
+            if not (name.startswith("get") or name.startswith("set")):
+                summary.nomnamm += 1
+        wmc = sum(cc for _, cc, _, _ in methods)
+        with_body = [cc for (_, body), (_, cc, _, _) in zip(span["functions"], methods) if body]
+        summary.classes.append(ClassSummary(
+            span["name"], True, wmc, lcom5_from_token_sets(token_sets), wmcnamm,
+            sum(with_body) / len(with_body) if with_body else 0, methods))
+    return summary
+
+def summary_rows(summary, noi_count, nom_count, nomnamm_count, nocs_package_counts, inheritance_index):
+    """Join a FileSummary with the project-wide values into extracted_method rows"""
+    return list(iter_summary_rows(summary, noi_count, nom_count, nomnamm_count, nocs_package_counts,
+                                  inheritance_index))
+
+def iter_summary_rows(summary, noi_count, nom_count, nomnamm_count, nocs_package_counts, inheritance_index):
+    """summary_rows as an iterator, one row dict per method; a skipped file's rows carry the reason"""
+    rows = _iter_summary_rows(summary, noi_count, nom_count, nomnamm_count, nocs_package_counts, inheritance_index)
+    if summary.skipped is not None:
+        rows = ({**row, "Skipped": summary.skipped} for row in rows)
+    return rows
+
+def _iter_summary_rows(summary, noi_count, nom_count, nomnamm_count, nocs_package_counts, inheritance_index):
+    if summary.error is not None:
+        yield {"Package": "Error", "Class": "Error", "Method": "Error", "LOC": "Error", 
+                "Max Nesting": 0, "CC": 0, "WOC": 0, "NOI": noi_count, "NOM": nom_count, 
+                "NOMNAMM": nomnamm_count, "NOC_type": 0, "WMC_type": 0, "LCOM5": 0, 
+                "WMCNAMM_type": 0, "AMW_type": 0, "NOCS_package": 0, "Error": summary.error}
+        return
     
-    for i in range(len(methods)):
-        for j in range(i + 1, len(methods)):
-            total_pairs += 1
-            
-            # Get method bodies as strings (same way as your other metrics)
-            body1 = str(methods[i].body) if methods[i].body else ""
-            body2 = str(methods[j].body) if methods[j].body else ""
-            
-            if body1 and body2:
-                # Split into tokens and find common meaningful tokens
-                tokens1 = set(body1.split())
-                tokens2 = set(body2.split())
-                
-                # Remove common programming constructs
-                common_keywords = {
-                    'if', 'else', 'for', 'while', 'return', 'var', 'val', 'fun', 
-                    'this', 'null', 'true', 'false', 'it', 'when', 'is', 'as',
-                    '{', '}', '(', ')', '[', ']', ';', ',', '.', '=', '+', '-', 
-                    '*', '/', '&&', '||', '!', '<', '>', '<=', '>=', '==', '!=',
-                    'private', 'public', 'protected', 'internal', 'override'
-                }
-                
-                # Filter out keywords and short tokens
-                meaningful_tokens1 = {token for token in tokens1 
-                                    if token not in common_keywords and len(token) > 2}
-                meaningful_tokens2 = {token for token in tokens2 
-                                    if token not in common_keywords and len(token) > 2}
-                
-                # Check if methods share meaningful tokens (indicating shared attributes/functionality)
-                shared_tokens = meaningful_tokens1 & meaningful_tokens2
-                if len(shared_tokens) > 0:
-                    cohesive_pairs += 1
+    package_name = summary.package if summary.package else "Unknown"
     
-    if total_pairs == 0:
-        return 0
+    # Dapatkan NOCS_package untuk paket ini
+    nocs_package = nocs_package_counts.get(package_name, 0)
     
-    # LCOM5 = 1 - (cohesive pairs / total pairs)
-    # Higher values indicate lower cohesion
-    lcom5 = 1 - (cohesive_pairs / total_pairs)
+    if not summary.has_declarations:
+        yield {"Package": package_name, "Class": "Unknown", "Method": "None", "LOC": 0, "Max Nesting": 0, 
+                "CC": 0, "WOC": 0, "NOI": noi_count, "NOM": nom_count, "NOMNAMM": nomnamm_count, 
+                "NOC_type": 0, "WMC_type": 0, "LCOM5": 0, "WMCNAMM_type": 0, "AMW_type": 0,
+                "NOCS_package": nocs_package, "Error": "No class declaration found"}
+        return
     
-    # Ensure result is between 0 and 1
-    return max(0.0, min(1.0, lcom5))
-
-def extracted_method(file_path, noi_count, nom_count, nomnamm_count, nocs_package_counts):
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
-        parser = Parser(code)
-        result = parser.parse()
-        package_name = result.package.name if result.package else "Unknown"
+    for cls in summary.classes:
+        class_name = cls.name
+        noc_type = inheritance_index.noc(class_name, summary.package)
+        wmc_type = cls.wmc_type
+        lcom5_value = cls.lcom5
+        wmcnamm_type = cls.wmcnamm_type
+        amw_type = cls.amw_type
         
-        # Dapatkan NOCS_package untuk paket ini
-        nocs_package = nocs_package_counts.get(package_name, 0)
+        if not cls.has_body:
+            yield {"Package": package_name, "Class": class_name, "Method": "None", "LOC": 0, 
+                        "Max Nesting": 0, "CC": 0, "WOC": 0, "NOI": noi_count, "NOM": nom_count, 
+                        "NOMNAMM": nomnamm_count, "NOC_type": noc_type, "WMC_type": wmc_type, 
+                        "LCOM5": lcom5_value, "WMCNAMM_type": wmcnamm_type, "AMW_type": amw_type,
+                        "NOCS_package": nocs_package, **cls.extra, "Error": "Class has no body"}
+            continue
         
-        if not result.declarations:
-            return [{"Package": package_name, "Class": "Unknown", "Method": "None", "LOC": 0, "Max Nesting": 0, 
-                    "CC": 0, "WOC": 0, "NOI": noi_count, "NOM": nom_count, "NOMNAMM": nomnamm_count, 
-                    "NOC_type": 0, "WMC_type": 0, "LCOM5": 0, "WMCNAMM_type": 0, "AMW_type": 0,
-                    "NOCS_package": nocs_package, "Error": "No class declaration found"}]
+        cc_values = [cc for _, cc, _, _ in cls.methods]
+        woc_values = count_woc(cc_values)
         
-        # Get NOC_type mapping for the directory
-        directory = os.path.dirname(file_path)
-        noc_type_mapping = count_noc_type(directory)
+        method_extra = cls.method_extra or [{}] * len(cls.methods)
+        for (function_names, cc_value, loc_count, maxnesting), woc, extra in zip(cls.methods, woc_values, method_extra):
+            yield {"Package": package_name, "Class": class_name, "Method": function_names, 
+                         "LOC": loc_count, "Max Nesting": maxnesting, "CC": cc_value, "WOC": woc, 
+                         "NOI": noi_count, "NOM": nom_count, "NOMNAMM": nomnamm_count, 
+                         "NOC_type": noc_type, "WMC_type": wmc_type, "LCOM5": lcom5_value, 
+                         "WMCNAMM_type": wmcnamm_type, "AMW_type": amw_type, "NOCS_package": nocs_package,
+                         **cls.extra, **extra}
         
-        datas = []
-        for class_declaration in result.declarations:
-            if not isinstance(class_declaration, node.ClassDeclaration):
-                continue
-                
-            class_name = class_declaration.name
-            noc_type = noc_type_mapping.get(class_name, 0)
-            # Calculate WMC for this class
-            wmc_type = calculate_wmc_for_class(class_declaration)
-            # Calculate LCOM5 for this class
-            lcom5_value = calculate_lcom5(class_declaration)
-            # Calculate WMCNAMM_type for this class
-            wmcnamm_type = calculate_wmcnamm_type(class_declaration)
-            # Calculate AMW_type for this class
-            amw_type = calculate_amw_type(class_declaration)
-            
-            if class_declaration.body is None:
-                datas.append({"Package": package_name, "Class": class_name, "Method": "None", "LOC": 0, 
-                            "Max Nesting": 0, "CC": 0, "WOC": 0, "NOI": noi_count, "NOM": nom_count, 
-                            "NOMNAMM": nomnamm_count, "NOC_type": noc_type, "WMC_type": wmc_type, 
-                            "LCOM5": lcom5_value, "WMCNAMM_type": wmcnamm_type, "AMW_type": amw_type,
-                            "NOCS_package": nocs_package, "Error": "Class has no body"})
-                continue
-                
-            method_function = {}
-            for member in class_declaration.body.members:
-                if isinstance(member, node.FunctionDeclaration):
-                    function_names = member.name
-                    loc_count = str(member.body).count("\n") + 1 if member.body else 0
-                    maxnesting = manual_max_nesting(str(member.body)) if member.body else 0
-                    cc_value = count_cc_manual(str(member.body)) if member.body else 0
-                    method_function[function_names] = (cc_value, loc_count, maxnesting)
-                    
-            cc_values = [cc for cc, _, _ in method_function.values()]
-            woc_values = count_woc(cc_values)
-            
-            for (function_names, (cc_value, loc_count, maxnesting)), woc in zip(method_function.items(), woc_values):
-                datas.append({"Package": package_name, "Class": class_name, "Method": function_names, 
-                             "LOC": loc_count, "Max Nesting": maxnesting, "CC": cc_value, "WOC": woc, 
-                             "NOI": noi_count, "NOM": nom_count, "NOMNAMM": nomnamm_count, 
-                             "NOC_type": noc_type, "WMC_type": wmc_type, "LCOM5": lcom5_value, 
-                             "WMCNAMM_type": wmcnamm_type, "AMW_type": amw_type, "NOCS_package": nocs_package})
-                
-            if not method_function:
-                datas.append({"Package": package_name, "Class": class_name, "Method": "None", "LOC": 0, 
-                            "Max Nesting": 0, "CC": 0, "WOC": 0, "NOI": noi_count, "NOM": nom_count, 
-                            "NOMNAMM": nomnamm_count, "NOC_type": noc_type, "WMC_type": wmc_type, 
-                            "LCOM5": lcom5_value, "WMCNAMM_type": wmcnamm_type, "AMW_type": amw_type,
-                            "NOCS_package": nocs_package, "Error": "No functions found"})
-                
-        return datas if datas else [{"Package": package_name, "Class": "Unknown", "Method": "None", "LOC": 0, 
-                                   "Max Nesting": 0, "CC": 0, "WOC": 0, "NOI": noi_count, "NOM": nom_count, 
-                                   "NOMNAMM": nomnamm_count, "NOC_type": 0, "WMC_type": 0, "LCOM5": 0, 
-                                   "WMCNAMM_type": 0, "AMW_type": 0, "NOCS_package": nocs_package,
-                                   "Error": "No class declarations found"}]
+        if not cls.methods:
+            yield {"Package": package_name, "Class": class_name, "Method": "None", "LOC": 0, 
+                        "Max Nesting": 0, "CC": 0, "WOC": 0, "NOI": noi_count, "NOM": nom_count, 
+                        "NOMNAMM": nomnamm_count, "NOC_type": noc_type, "WMC_type": wmc_type, 
+                        "LCOM5": lcom5_value, "WMCNAMM_type": wmcnamm_type, "AMW_type": amw_type,
+                        "NOCS_package": nocs_package, **cls.extra, "Error": "No functions found"}
+    
+    # Setiap kelas menghasilkan paling sedikit satu baris, jadi tanpa kelas berarti tanpa baris
+    if not summary.classes:
+        yield {"Package": package_name, "Class": "Unknown", "Method": "None", "LOC": 0, 
+                               "Max Nesting": 0, "CC": 0, "WOC": 0, "NOI": noi_count, "NOM": nom_count, 
+                               "NOMNAMM": nomnamm_count, "NOC_type": 0, "WMC_type": 0, "LCOM5": 0, 
+                               "WMCNAMM_type": 0, "AMW_type": 0, "NOCS_package": nocs_package,
+                               "Error": "No class declarations found"}
+
+def aggregate_summaries(summaries):
+    """Project-wide NOI, NOM, NOMNAMM, NOCS_package and inheritance index from FileSummary objects"""
+    noi_count = nom_count = nomnamm_count = 0
+    nocs_package_counts = {}
+    inheritance_index = InheritanceIndex()
+    for summary in summaries:
+        noi_count += summary.noi
+        nom_count += summary.nom
+        nomnamm_count += summary.nomnamm
+        package_name = summary.package if summary.package else "default"
+        nocs_package_counts[package_name] = nocs_package_counts.get(package_name, 0) + summary.class_count
+        inheritance_index.add_declarations(summary.package, summary.declarations, summary.imports, summary.wildcards)
+    return noi_count, nom_count, nomnamm_count, nocs_package_counts, inheritance_index.build()
+
+def summaries_to_rows(summaries):
+    """Merge per-file summaries, in the given order, into the rows of extract_and_parse"""
+    return list(iter_summaries_rows(summaries))
+
+def iter_summaries_rows(summaries):
+    """summaries_to_rows as a generator; the project-wide values are computed before the first row"""
+    with profiling.stage("project counters and inheritance index"):
+        noi_count, nom_count, nomnamm_count, nocs_package_counts, inheritance_index = aggregate_summaries(summaries)
+    for summary in summaries:
+        yield from iter_summary_rows(summary, noi_count, nom_count, nomnamm_count, nocs_package_counts,
+                                     inheritance_index)
+
+def summaries_to_tables(summaries):
+    """Merge per-file summaries into normalized MetricTables; tables.dataframe() gives the extract_and_parse DataFrame"""
+    with profiling.stage("project counters and inheritance index"):
+        noi_count, nom_count, nomnamm_count, nocs_package_counts, inheritance_index = aggregate_summaries(summaries)
+    return MetricTables.from_summaries(summaries, noi_count, nom_count, nomnamm_count, nocs_package_counts,
+                                       inheritance_index)
+
+def extracted_method(file_path, noi_count, nom_count, nomnamm_count, nocs_package_counts, store=None, inheritance_index=None):
+    return list(iter_extracted_method(file_path, noi_count, nom_count, nomnamm_count, nocs_package_counts,
+                                      store, inheritance_index))
+
+def iter_extracted_method(file_path, noi_count, nom_count, nomnamm_count, nocs_package_counts, store=None, inheritance_index=None):
+    """
+    extracted_method as a generator; a file that fails gives only the error row.
+    NOC_type needs the whole project: pass the project's ParsedModuleStore or its
+    InheritanceIndex, built once per analysis. Without either, the index is
+    built from the file's directory, as the original call did, which parses
+    that directory again for every file.
+    """
+    try:
+        # Gunakan hasil parse dari store jika tersedia, parse file ini saja jika belum ada di store
+        module = store.get(file_path) if store is not None else None
+        if module is None:
+            module = ParsedModuleStore().add_file(file_path)
+        summary = summarize_module(module)
+        
+        # NOC_type dibaca dari index pewarisan proyek yang dibangun sekali per analisis
+        if inheritance_index is None and summary.error is None and summary.has_declarations:
+            if store is None:
+                store = ParsedModuleStore.from_directory(os.path.dirname(file_path))
+            inheritance_index = store.inheritance_index()
+        # Baris dibuat sampai habis dulu supaya error di tengah file tidak meninggalkan baris setengah jadi
+        rows = summary_rows(summary, noi_count, nom_count, nomnamm_count, nocs_package_counts, inheritance_index)
     except Exception as e:
-        return [{"Package": "Error", "Class": "Error", "Method": "Error", "LOC": "Error", 
+        rows = [{"Package": "Error", "Class": "Error", "Method": "Error", "LOC": "Error", 
                 "Max Nesting": 0, "CC": 0, "WOC": 0, "NOI": noi_count, "NOM": nom_count, 
                 "NOMNAMM": nomnamm_count, "NOC_type": 0, "WMC_type": 0, "LCOM5": 0, 
                 "WMCNAMM_type": 0, "AMW_type": 0, "NOCS_package": 0, "Error": str(e)}]
+    yield from rows
 
-def extract_and_parse(file):
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_file_path = os.path.join(temp_dir, file.name)
-        with open(temp_file_path, "wb") as f:
-            f.write(file.getbuffer())
-        try:
-            patoolib.extract_archive(temp_file_path, outdir=temp_dir)
-            noi_count = count_noi(temp_dir)
-            nom_count = count_nom(temp_dir)
-            nomnamm_count = count_nomnamm(temp_dir)
-            
-            # Hitung NOCS_package
-            nocs_package_counts = count_nocs_package(temp_dir)
-            
-            results = []
-            for kotlin_file in [os.path.join(root, f) for root, _, files in os.walk(temp_dir) 
-                              for f in files if f.endswith(".kt") or f.endswith(".kts")]:
-                file_results = extracted_method(kotlin_file, noi_count, nom_count, nomnamm_count, nocs_package_counts)
-                results.extend(file_results)
-            return pd.DataFrame(results)
-        except Exception as e:
-            return str(e)
\ No newline at end of file
+def metrics_cache(path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+    """MetricsCache for FileSummary objects, versioned on the code of this module and the inheritance index"""
+    return MetricsCache("controller", metrics_version(sys.modules[__name__], inheritance, lexer, visitor), path, max_bytes)
+
+def summarize_sources(sources, workers=1, chunksize=None, cache=None, guard=None):
+    """
+    Summarize (name, bytes) sources, in order, reusing cached summaries for unchanged content.
+    Returns (summaries, parse_count); only cache misses are parsed. With a
+    guard.ParseGuard every file is parsed in an isolated worker under its budgets.
+    """
+    summaries = []
+    parse_count = 0
+    for summary, parsed in iter_summarize_sources(sources, workers, chunksize, cache, guard):
+        summaries.append(summary)
+        parse_count += parsed
+    return summaries, parse_count
+
+def duplicate_summary(summary, path):
+    """The FileSummary of a byte-identical copy at another path, sharing the metrics of summary"""
+    duplicate = copy.copy(summary)
+    duplicate.path = path
+    duplicate.duplicate_of = summary.path
+    return duplicate
+
+def iter_summarize_sources(sources, workers=1, chunksize=None, cache=None, guard=None):
+    """
+    summarize_sources as a generator: yields (summary, parsed) for each source, in
+    order, as soon as it is known; parsed is False for a cache hit or a copy. Serially
+    every source is read, looked up and parsed just before its summary is yielded; with
+    workers > 1 or a guard the sources are read first and the worker results
+    follow in order. A file with the same bytes as an earlier one of the same call
+    is not parsed again: its summary is a copy (duplicate_of is the first path).
+    """
+    if (workers and workers > 1) or guard is not None:
+        yield from _iter_summarize_pool(sources, workers, chunksize, cache, guard)
+        return
+    sources = iter(sources)
+    seen = {}  # {digest: FileSummary pertama dengan isi itu}
+    while True:
+        with profiling.stage("read sources"):
+            source = next(sources, None)
+        if source is None:
+            break
+        name, data = source
+        profiling.count("files")
+        with profiling.stage("content hash"):
+            digest = content_hash(data)
+        if digest in seen:
+            profiling.count("duplicate files")
+            yield duplicate_summary(seen[digest], name), False
+            continue
+        if cache is not None:
+            with profiling.stage("cache lookup"):
+                cached = cache.get(digest)
+            if cached is not None:
+                cached.path = name
+                seen[digest] = cached
+                yield cached, False
+                continue
+        # Store baru per file: pohon sintaks dilepas begitu FileSummary-nya jadi
+        module = ParsedModuleStore().add_bytes(name, data)
+        with profiling.stage("measure"):
+            summary = summarize_module(module)
+        profiling.count("parses")
+        if cache is not None:
+            with profiling.stage("cache store"):
+                cache.put(digest, summary)
+        seen[digest] = summary
+        yield summary, True
+
+def skipped_summary(name, data, reason, guard):
+    """FileSummary of a file over the parse budgets: text metrics with guard.fallback, otherwise an error row"""
+    if guard.fallback:
+        with profiling.stage("text metrics fallback"):
+            return summarize_text(name, data, f"{reason}; text metrics")
+    summary = FileSummary(name, error=f"Skipped: {reason}")
+    summary.skipped = reason
+    return summary
+
+def _iter_guarded(sources, guard, workers):
+    from .guard import iter_guarded_summaries
+
+    for (name, data), (summary, reason) in zip(sources, iter_guarded_summaries(sources, guard, workers)):
+        if reason is not None:
+            profiling.count("files skipped")
+            summary = skipped_summary(name, data, reason, guard)
+        yield summary
+
+def _iter_summarize_pool(sources, workers, chunksize, cache, guard=None):
+    from .parallel import iter_summarize_sources as iter_pool_summaries
+
+    with profiling.stage("read sources"):
+        sources = list(sources)
+    profiling.count("files", len(sources))
+    summaries = [None] * len(sources)
+    digests = {}
+    first = {}  # {digest: indeks file pertama dengan isi itu}
+    duplicates = {}  # {indeks salinan: indeks file pertama}
+    pending = []
+    with profiling.stage("cache lookup"):
+        for i, (name, data) in enumerate(sources):
+            digest = content_hash(data)
+            if digest in first:
+                duplicates[i] = first[digest]
+                continue
+            first[digest] = i
+            if cache is not None:
+                cached = cache.get(digest)
+                if cached is not None:
+                    cached.path = name
+                    summaries[i] = cached
+                    continue
+                digests[i] = digest
+            pending.append(i)
+    profiling.count("duplicate files", len(duplicates))
+
+    def settled(j):
+        # File pertama dengan isi yang sama selalu berada lebih awal, jadi ringkasannya sudah ada
+        if j in duplicates:
+            summaries[j] = duplicate_summary(summaries[duplicates[j]], sources[j][0])
+        return summaries[j], False
+    
+    # Tahap di dalam proses worker tidak terlihat dari sini, hanya total waktu menunggu hasilnya
+    pending_sources = [sources[i] for i in pending]
+    if guard is not None:
+        computed = _iter_guarded(pending_sources, guard, workers)
+        stage = "parse and measure (guarded workers)"
+    else:
+        computed = iter_pool_summaries(pending_sources, workers, chunksize)
+        stage = "parse and measure (process pool)"
+    position = 0
+    for i in pending:
+        for j in range(position, i):
+            yield settled(j)
+        with profiling.stage(stage):
+            summary = summaries[i] = next(computed)
+        # File yang dilewati tidak disimpan: dengan batas lain file itu mungkin bisa di-parse,
+        # dan tidak dihitung sebagai parse karena AST-nya tidak pernah selesai
+        parsed = summary.skipped is None
+        if parsed:
+            profiling.count("parses")
+            if cache is not None:
+                with profiling.stage("cache store"):
+                    cache.put(digests[i], summary)
+        yield summary, parsed
+        position = i + 1
+    for j in range(position, len(sources)):
+        yield settled(j)
+
+def extract_and_parse_sources(sources, workers=1, chunksize=None, cache=None, guard=None):
+    """
+    DataFrame of extract_and_parse for (name, bytes) sources already read from a
+    directory or an archive. attrs holds file_count, parse_count, method_count,
+    skipped_count, duplicate_count (copies of an earlier file) and, with a cache,
+    its stats.
+    """
+    if cache is not None:
+        cache = cache.session()
+    summaries, parse_count = summarize_sources(sources, workers, chunksize, cache, guard)
+    
+    with profiling.stage("rows"):
+        tables = summaries_to_tables(summaries)
+    with profiling.stage("dataframe"):
+        df = tables.dataframe()
+    df.attrs["file_count"] = tables.project.file_count
+    df.attrs["parse_count"] = parse_count
+    df.attrs["method_count"] = tables.project.method_count
+    df.attrs["skipped_count"] = sum(1 for summary in summaries if summary.skipped is not None)
+    df.attrs["duplicate_count"] = sum(1 for summary in summaries if summary.duplicate_of is not None)
+    profiling.count("methods", df.attrs["method_count"])
+    if cache is not None:
+        df.attrs["cache"] = cache.stats()
+    return df
+
+def iter_extract_and_parse_sources(sources, workers=1, chunksize=None, cache=None, progress=None, guard=None):
+    """
+    Rows of extract_and_parse_sources, yielded one by one. NOI, NOM, NOMNAMM,
+    NOCS_package and NOC_type are project-wide, so every file is summarized before
+    the first row; progress(done, summary) is called after each file meanwhile.
+    """
+    summaries = []
+    for summary, _ in iter_summarize_sources(sources, workers, chunksize, cache, guard):
+        summaries.append(summary)
+        if progress is not None:
+            progress(len(summaries), summary)
+    yield from iter_summaries_rows(summaries)
+
+def extract_and_parse(file, workers=1, chunksize=None, cache=None, profiler=None, guard=None, source_filter=None):
+    """
+    Compute the metrics of every Kotlin file in an uploaded archive.
+    ZIP members are read in memory, without extracting the archive to disk.
+    With workers > 1 files are parsed and measured in a process pool; rows and
+    values are identical to the serial path. With a MetricsCache only files
+    whose content is not cached yet are parsed. With a profiling.Profiler the
+    time per stage is recorded in it. With a guard.ParseGuard each file is parsed
+    in an isolated worker; files over its budgets get a Skipped reason. A
+    filters.SourceFilter drops excluded, oversized and generated files before they
+    are read; its statistics are in attrs["filters"].
+    """
+    try:
+        # Setiap file di-parse paling banyak satu kali; file yang isinya sudah ada di cache tidak di-parse
+        with profiling.use(profiler), profiling.stage("extract_and_parse"):
+            sources = iter_archive_sources(file, getattr(file, "name", None), source_filter=source_filter)
+            df = extract_and_parse_sources(sources, workers, chunksize, cache, guard)
+            if source_filter is not None:
+                df.attrs["filters"] = source_filter.report()
+            return df
+    except Exception as e:
+        return str(e)
@@ -0,0 +1,266 @@
+"""
+Export of the metric tables (extract_and_parse and the per-function report)
+as CSV or as columnar Parquet / Arrow IPC (Feather) files.
+
+The columnar formats need pyarrow and pandas, which are imported only when
+they are used; streaming CSV rows needs neither.
+Package, Class and Project are dictionary-encoded (each distinct name is stored
+once) and metric columns get numeric types, so the files are small and load
+back without parsing text.
+
+CSV rows can also be streamed: write_csv_rows writes rows as an analyzer
+yields them, in chunks of chunk_rows, so memory does not grow with the table.
+CSVSpool does the same into a temporary file that a page reads back a page
+at a time.
+"""
+import csv
+import os
+import tempfile
+import threading
+from io import BytesIO, StringIO
+
+# {format: (label, file extension, MIME type)}
+EXPORT_FORMATS = {
+    "csv": ("CSV", ".csv", "text/csv"),
+    "parquet": ("Parquet", ".parquet", "application/vnd.apache.parquet"),
+    "feather": ("Feather (Arrow IPC)", ".feather", "application/vnd.apache.arrow.file"),
+}
+DICTIONARY_COLUMNS = ("Project", "Package", "Class")
+DEFAULT_CHUNK_ROWS = 10_000
+DEFAULT_PAGE_ROWS = 100
+DEFAULT_SPOOL_BYTES = 8 * 1024 * 1024  # CSVSpool pindah ke file sementara di atas 8 MB
+# Kolom teks yang tidak diubah menjadi angka
+TEXT_COLUMNS = ("Extraction Date", "Project", "Package", "Class", "Method", "Function", "Error", "Skipped")
+
+
+def typed_frame(df):
+    """
+    Copy of df with typed numeric columns. Metric columns become nullable
+    Int64 or Float64; values that are not numbers (e.g. LOC "Error" of a file
+    that failed to parse, whose message stays in the Error column) become null.
+    """
+    import pandas as pd
+
+    typed = df.copy()
+    for column in typed.columns:
+        values = typed[column]
+        if column in TEXT_COLUMNS:
+            typed[column] = values.astype("string")
+        elif pd.api.types.is_bool_dtype(values):
+            continue
+        elif pd.api.types.is_integer_dtype(values):
+            typed[column] = values.astype("Int64")
+        elif pd.api.types.is_float_dtype(values):
+            typed[column] = values.astype("Float64")
+        else:
+            numbers = pd.to_numeric(values, errors="coerce")
+            if numbers.notna().sum() == 0 and values.notna().any():
+                # Kolom teks dari kalkulator tambahan
+                typed[column] = values.astype("string")
+            elif (numbers.dropna() % 1 == 0).all():
+                typed[column] = numbers.astype("Int64")
+            else:
+                typed[column] = numbers.astype("Float64")
+    return typed
+
+
+def arrow_table(df):
+    """pyarrow.Table of df with typed columns and dictionary-encoded name columns"""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise RuntimeError("Parquet and Feather export need pyarrow (pip install pyarrow)")
+
+    table = pa.Table.from_pandas(typed_frame(df), preserve_index=False)
+    for column in DICTIONARY_COLUMNS:
+        if column in table.column_names:
+            position = table.column_names.index(column)
+            table = table.set_column(position, column, table.column(column).dictionary_encode())
+    return table
+
+
+def write_table(df, destination, export_format="csv"):
+    """Write df to a path or binary file object in one of EXPORT_FORMATS"""
+    if export_format == "csv":
+        df.to_csv(destination, index=False)
+    elif export_format == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(arrow_table(df), destination, compression="zstd")
+    elif export_format == "feather":
+        import pyarrow.feather as feather
+        feather.write_feather(arrow_table(df), destination, compression="zstd")
+    else:
+        raise ValueError(f"Unknown export format: {export_format}")
+
+
+def export_bytes(df, export_format="csv"):
+    """The export of df as bytes, e.g. for a download button"""
+    if export_format == "csv":
+        return df.to_csv(index=False).encode("utf-8")
+    buffer = BytesIO()
+    write_table(df, buffer, export_format)
+    return buffer.getvalue()
+
+
+def export_label(export_format):
+    return EXPORT_FORMATS[export_format][0]
+
+
+def export_file_name(stem, export_format):
+    return stem + EXPORT_FORMATS[export_format][1]
+
+
+def export_mime(export_format):
+    return EXPORT_FORMATS[export_format][2]
+
+
+def iter_csv_chunks(rows, columns, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Yield the CSV of row dicts as UTF-8 bytes, header first, at most chunk_rows
+    rows per chunk. Missing and None values are written empty, like
+    DataFrame.to_csv(index=False).
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([row.get(column) for column in columns])
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+def write_csv_rows(rows, destination, columns, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream row dicts as CSV to a path or binary file object; returns the number of rows"""
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "wb") as f:
+            return write_csv_rows(rows, f, columns, chunk_rows)
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    for chunk in iter_csv_chunks(counted(rows), columns, chunk_rows):
+        destination.write(chunk)
+    return count
+
+
+class CSVSpool:
+    """
+    CSV of row dicts written once into a SpooledTemporaryFile, which stays in
+    memory up to max_memory bytes and moves to disk after that. Only the byte
+    offset of every page_size-th row and the totals of the numeric columns are
+    kept, so a page, the totals and the whole file are read back without
+    holding the rows. One spool may be read by several Streamlit sessions.
+    """
+
+    def __init__(self, columns, page_size=DEFAULT_PAGE_ROWS, max_memory=DEFAULT_SPOOL_BYTES):
+        self.columns = tuple(columns)
+        self.page_size = page_size
+        self.row_count = 0
+        self.totals = {}  # {kolom numerik: jumlah}
+        self._types = {}  # {kolom: tipe nilai pertama yang bukan None}, untuk membaca halaman kembali
+        self._offsets = []  # Offset byte baris pertama setiap halaman
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory, mode="w+b")
+        self._buffer = StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._lock = threading.Lock()
+        self._write_row(self.columns)
+
+    def _write_row(self, values):
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerow(values)
+        self._file.write(self._buffer.getvalue().encode("utf-8"))
+
+    def append(self, row):
+        with self._lock:
+            if self.row_count % self.page_size == 0:
+                self._offsets.append(self._file.tell())
+            values = [row.get(column) for column in self.columns]
+            for column, value in zip(self.columns, values):
+                if value is None:
+                    continue
+                self._types.setdefault(column, type(value))
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    self.totals[column] = self.totals.get(column, 0) + value
+            self._write_row(values)
+            self.row_count += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+        return self
+
+    @property
+    def page_count(self):
+        return len(self._offsets)
+
+    def _convert(self, column, value):
+        kind = self._types.get(column)
+        if kind is str:
+            return value
+        if value == "" or kind is None:
+            # Kolom yang hanya berisi None ditulis kosong
+            return value or None
+        if kind is bool:
+            return value == "True"
+        return kind(value)
+
+    def page(self, number):
+        """Row dicts of page number (1-based), read back from the spool"""
+        with self._lock:
+            if not 1 <= number <= len(self._offsets):
+                return []
+            end = self._file.tell()
+            self._file.seek(self._offsets[number - 1])
+            stop = self._offsets[number] if number < len(self._offsets) else end
+            data = self._file.read(stop - self._file.tell())
+            self._file.seek(end)
+        return [
+            {column: self._convert(column, value) for column, value in zip(self.columns, values)}
+            for values in csv.reader(StringIO(data.decode("utf-8")))
+        ]
+
+    def getvalue(self):
+        """The whole CSV as bytes, e.g. for st.download_button, which keeps the download in memory"""
+        with self._lock:
+            end = self._file.tell()
+            self._file.seek(0)
+            data = self._file.read()
+            self._file.seek(end)
+        return data
+
+    def dataframe(self):
+        """The table as a DataFrame with the types of the rows, e.g. for Parquet or Feather export"""
+        import pandas as pd
+
+        dtype = {column: str for column in self.columns if self._types.get(column, str) is str}
+        return pd.read_csv(BytesIO(self.getvalue()), dtype=dtype, keep_default_na=False, na_values=[""])
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def concatenate_csv(paths, destination):
+    """Append CSV files with the same header into one file, copying them in blocks"""
+    with open(destination, "wb") as out:
+        for number, path in enumerate(paths):
+            with open(path, "rb") as f:
+                header = f.readline()
+                if number == 0:
+                    out.write(header)
+                while True:
+                    block = f.read(1024 * 1024)
+                    if not block:
+                        break
+                    out.write(block)
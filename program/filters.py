@@ -0,0 +1,242 @@
+"""
+Include/exclude rules that decide which Kotlin files are analyzed at all.
+
+Android projects carry a lot of Kotlin that is not theirs: build/generated,
+kapt and ksp output, vendored third-party modules. A SourceFilter drops those
+before anything is read or parsed. Directories matching an exclude pattern are
+pruned during the directory walk, archive members are filtered from the ZIP
+listing by name and size, and only the files that pass are opened; of those
+the first HEADER_BYTES are checked for a "generated" marker before the rest is
+read. Every rule counts what it skipped, so report() shows how much work each
+one saved.
+
+Patterns are globs on the path relative to the project root, with "/"
+separators: "*" and "?" do not cross "/", "**" does, and a pattern without
+"/" matches the file or directory name at any depth (like .gitignore).
+
+DEFAULT_EXCLUDES is active whenever SourceFilter.default() is used, i.e. with
+--skip-generated on the command line and when "Skip generated and vendored
+Kotlin files" is ticked in the app. It only matches the Gradle output folders
+under build/ (generated, tmp, intermediates), so a source package such as
+com/foo/build is still analyzed.
+"""
+import fnmatch
+import os
+import re
+
+# Keluaran build dan kode pihak ketiga yang umum di proyek Android. Direktori "build"
+# hanya disaring di bagian keluaran Gradle, karena paket sumber juga boleh bernama build
+DEFAULT_EXCLUDES = (
+    "**/build/generated/**",
+    "**/build/tmp/**",
+    "**/build/intermediates/**",
+    "**/generated/**",
+    "**/kapt/**",
+    "**/kaptKotlin/**",
+    "**/ksp/**",
+    ".gradle",
+    ".idea",
+    "**/third_party/**",
+    "**/thirdparty/**",
+    "**/vendor/**",
+)
+HEADER_BYTES = 2048
+GENERATED_MARKERS = (
+    "generated by",
+    "auto-generated",
+    "autogenerated",
+    "automatically generated",
+    "code generated",
+    "this file was generated",
+    "do not edit",
+    "do not modify",
+    "@generated",
+)
+_GENERATED_ANNOTATION = re.compile(r"^@(?:file:)?(?:[\w.]+\.)?Generated\b")
+GENERATED_RULE = "generated header"
+INCLUDE_RULE = "not included"
+
+
+def glob_regex(pattern):
+    """Compiled regex of a path glob ("**" crosses "/", "*" and "?" do not)"""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                # Kelas karakter diterjemahkan seperti fnmatch ([!a] -> [^a])
+                parts.append(fnmatch.translate(pattern[i:end + 1])[4:-3])
+                i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return re.compile("".join(parts))
+
+
+class PathPattern:
+    """One glob; a pattern without "/" matches the last path component"""
+    __slots__ = ("pattern", "_regex", "_name_only")
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self._name_only = "/" not in pattern.strip("/")
+        self._regex = glob_regex(pattern.strip("/"))
+
+    def matches(self, path, directory=False):
+        if self._name_only:
+            return self._regex.fullmatch(path.rsplit("/", 1)[-1]) is not None
+        # "a/**" juga cocok dengan direktori "a" itu sendiri, supaya bisa dipangkas saat walk
+        return self._regex.fullmatch(path) is not None or (
+            directory and self._regex.fullmatch(path + "/") is not None)
+
+    def __repr__(self):
+        return f"PathPattern({self.pattern!r})"
+
+
+def is_generated_header(head):
+    """True when the leading comments or annotations of a file mark it as generated code"""
+    text = head.decode("utf-8", errors="ignore")
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith(("//", "/*", "*")):
+            lowered = line.lower()
+            if any(marker in lowered for marker in GENERATED_MARKERS):
+                return True
+        elif line.startswith("@"):
+            if _GENERATED_ANNOTATION.match(line):
+                return True
+        elif not line.startswith(("package", "import")):
+            # Header berhenti di deklarasi pertama
+            return False
+    return False
+
+
+class SourceFilter:
+    """
+    Include and exclude globs, a maximum file size in bytes and generated-header
+    detection. One filter collects the statistics of one analysis.
+    """
+
+    def __init__(self, include=(), exclude=(), max_size=None, skip_generated=False):
+        self.include = [PathPattern(pattern) for pattern in include]
+        self.exclude = [PathPattern(pattern) for pattern in exclude]
+        self.max_size = max_size
+        self.skip_generated = skip_generated
+        self.kept_files = 0
+        self.kept_bytes = 0
+        self.stats = {}  # {aturan: {"directories": n, "files": n, "bytes": n}}
+
+    @classmethod
+    def default(cls, include=(), exclude=(), max_size=None):
+        """DEFAULT_EXCLUDES plus the given patterns, with generated-header detection"""
+        return cls(include, DEFAULT_EXCLUDES + tuple(exclude), max_size, skip_generated=True)
+
+    def __repr__(self):
+        return (f"SourceFilter(include={[p.pattern for p in self.include]!r}, "
+                f"exclude={[p.pattern for p in self.exclude]!r}, max_size={self.max_size!r}, "
+                f"skip_generated={self.skip_generated!r})")
+
+    def _record(self, rule, directories=0, files=0, size=0):
+        entry = self.stats.setdefault(rule, {"directories": 0, "files": 0, "bytes": 0})
+        entry["directories"] += directories
+        entry["files"] += files
+        entry["bytes"] += size or 0
+
+    def prune_directory(self, path):
+        """True when the directory (relative path) is excluded; its files are never listed"""
+        for pattern in self.exclude:
+            if pattern.matches(path, directory=True):
+                self._record(f"exclude {pattern.pattern}", directories=1)
+                return True
+        return False
+
+    def skip_path(self, path, size=None):
+        """True when the file (relative path, size in bytes if known) is filtered out before it is read"""
+        # Anggota arsip tidak punya walk direktori, jadi folder induknya ikut dicocokkan
+        parents = path.split("/")[:-1]
+        parents = ["/".join(parents[:depth]) for depth in range(1, len(parents) + 1)]
+        for pattern in self.exclude:
+            if pattern.matches(path) or any(pattern.matches(parent, directory=True) for parent in parents):
+                self._record(f"exclude {pattern.pattern}", files=1, size=size)
+                return True
+        if self.include and not any(pattern.matches(path) for pattern in self.include):
+            self._record(INCLUDE_RULE, files=1, size=size)
+            return True
+        if self.max_size is not None and size is not None and size > self.max_size:
+            self._record(f"larger than {self.max_size} bytes", files=1, size=size)
+            return True
+        return False
+
+    def skip_header(self, head, size=None):
+        """True when the first bytes of a file mark it as generated code"""
+        if self.skip_generated and is_generated_header(head):
+            self._record(GENERATED_RULE, files=1, size=size)
+            return True
+        return False
+
+    def keep(self, size):
+        self.kept_files += 1
+        self.kept_bytes += size
+
+    def read(self, file, size=None):
+        """Bytes of an open binary file, or None when its header marks it as generated"""
+        with file:
+            if self.skip_generated:
+                head = file.read(HEADER_BYTES)
+                if self.skip_header(head, size):
+                    return None
+                data = head + file.read()
+            else:
+                data = file.read()
+        self.keep(len(data))
+        return data
+
+    def check_file(self, path):
+        """Header check of a file on disk that is read later by its caller; True when it is kept"""
+        size = os.path.getsize(path)
+        if self.skip_generated:
+            with open(path, "rb") as f:
+                if self.skip_header(f.read(HEADER_BYTES), size):
+                    return False
+        self.keep(size)
+        return True
+
+    def skipped_files(self):
+        return sum(entry["files"] for entry in self.stats.values())
+
+    def skipped_bytes(self):
+        return sum(entry["bytes"] for entry in self.stats.values())
+
+    def report(self):
+        """
+        One dict per rule that skipped something: Rule, Directories (pruned during
+        a directory walk, their files are not counted), Files, Bytes and the share
+        of the listed bytes it saved; a final row has what was analyzed.
+        """
+        total = self.kept_bytes + self.skipped_bytes()
+        rows = [
+            {"Rule": rule, "Directories": entry["directories"], "Files": entry["files"], "Bytes": entry["bytes"],
+             "Share of bytes": entry["bytes"] / total if total else 0.0}
+            for rule, entry in self.stats.items()
+        ]
+        rows.append({"Rule": "analyzed", "Directories": 0, "Files": self.kept_files, "Bytes": self.kept_bytes,
+                     "Share of bytes": self.kept_bytes / total if total else 0.0})
+        return rows
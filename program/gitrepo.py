@@ -0,0 +1,135 @@
+"""
+Read Kotlin sources from a local git repository with the git command line:
+changed paths between revisions and file contents straight from the object
+database, without checking out a revision.
+"""
+import os
+import subprocess
+
+from .sources import KOTLIN_EXTENSIONS
+
+
+class GitError(RuntimeError):
+    pass
+
+
+def git(repo, *args, input=None):
+    """Run a git command in repo and return its stdout as bytes"""
+    try:
+        result = subprocess.run(["git", "-C", repo, *args], input=input, capture_output=True, check=True)
+    except FileNotFoundError:
+        raise GitError("git is not installed")
+    except subprocess.CalledProcessError as e:
+        raise GitError(e.stderr.decode("utf-8", "replace").strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def rev_parse(repo, rev="HEAD"):
+    return git(repo, "rev-parse", "--verify", f"{rev}^{{commit}}").decode().strip()
+
+
+def _split_z(output):
+    return [part.decode("utf-8") for part in output.split(b"\0") if part]
+
+
+def commits(repo, revision_range):
+    """[(commit, tree, ISO date, subject)] of a range like 'v1.0..main', oldest first"""
+    entries = []
+    output = git(repo, "log", "--reverse", "--topo-order", "-z", "--format=%H%x1f%T%x1f%cI%x1f%s", revision_range)
+    for entry in output.decode("utf-8", "replace").split("\0"):
+        entry = entry.strip("\n")
+        if entry:
+            entries.append(tuple(entry.split("\x1f", 3)))
+    return entries
+
+
+def list_files(repo, rev="HEAD", extensions=KOTLIN_EXTENSIONS):
+    """[(path, blob id)] of the Kotlin files in a revision, in tree order"""
+    files = []
+    for entry in _split_z(git(repo, "ls-tree", "-r", "-z", "--full-tree", rev)):
+        info, path = entry.split("\t", 1)
+        _, kind, blob = info.split()
+        if kind == "blob" and path.endswith(extensions):
+            files.append((path, blob))
+    return files
+
+
+def changed_files(repo, base, head=None, extensions=KOTLIN_EXTENSIONS):
+    """
+    (changed or added paths, deleted paths) between base and head; head None means
+    the working tree. Renames are reported as a deletion plus an addition.
+    """
+    args = ["diff", "--name-status", "-z", "--no-renames", base]
+    if head is not None:
+        args.append(head)
+    parts = _split_z(git(repo, *args))
+    changed, deleted = [], []
+    for status, path in zip(parts[::2], parts[1::2]):
+        if not path.endswith(extensions):
+            continue
+        (deleted if status.startswith("D") else changed).append(path)
+    return changed, deleted
+
+
+class BlobReader:
+    """
+    One long-running 'git cat-file --batch' process; every read is a lookup in
+    the object database, so no revision is ever checked out.
+    """
+
+    def __init__(self, repo):
+        self.repo = repo
+        self._process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _start(self):
+        if self._process is None:
+            self._process = subprocess.Popen(
+                ["git", "-C", self.repo, "cat-file", "--batch"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            )
+        return self._process
+
+    def read(self, object_name):
+        """Contents of a blob id or 'rev:path'; None when the object does not exist"""
+        process = self._start()
+        process.stdin.write(object_name.encode("utf-8") + b"\n")
+        process.stdin.flush()
+        header = process.stdout.readline().split()
+        if len(header) != 3:
+            # "<name> missing"
+            return None
+        data = process.stdout.read(int(header[2]))
+        process.stdout.read(1)  # Baris baru setelah isi objek
+        return data
+
+    def close(self):
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.wait()
+            self._process = None
+
+
+def read_files(repo, paths, rev=None):
+    """
+    Yield (path, bytes) for paths at rev, read from the object database; with rev
+    None the working tree is read. Paths that do not exist are skipped.
+    """
+    if rev is None:
+        for path in paths:
+            file_path = os.path.join(repo, path)
+            if os.path.isfile(file_path):
+                with open(file_path, "rb") as f:
+                    yield path, f.read()
+        return
+    with BlobReader(repo) as reader:
+        for path in paths:
+            data = reader.read(f"{rev}:{path}")
+            if data is not None:
+                yield path, data
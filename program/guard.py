@@ -0,0 +1,180 @@
+"""
+Per-file time and memory budgets for parsing.
+
+kopyt parses in pure Python and a pathological file (huge generated code,
+deep nesting) can take minutes or all memory. With a ParseGuard every file is
+parsed and measured in an isolated worker process. A file that runs past
+timeout seconds has its worker killed and replaced. A worker's address space
+is capped at max_memory bytes above its size at start, so a runaway parse
+fails with MemoryError instead of taking the server down. Either way the file
+is skipped with a reason; with fallback its metrics come from the token
+stream instead (controller.summarize_text), so one bad file never blocks the
+rest of the analysis.
+"""
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_MEMORY = 1024 * 1024 * 1024
+
+
+class ParseGuard:
+    """Budgets for one file: timeout in seconds and max_memory in bytes (None = no limit)"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_memory=DEFAULT_MAX_MEMORY, fallback=True):
+        self.timeout = timeout
+        self.max_memory = max_memory
+        self.fallback = fallback
+
+    def key(self):
+        """The budgets as a hashable value, e.g. to keep results per guard setting"""
+        return self.timeout, self.max_memory, self.fallback
+
+    def __repr__(self):
+        return f"ParseGuard(timeout={self.timeout!r}, max_memory={self.max_memory!r}, fallback={self.fallback!r})"
+
+    def timeout_reason(self):
+        return f"parse timeout ({self.timeout:g}s)"
+
+    def memory_reason(self):
+        if not self.max_memory:
+            return "parse out of memory"
+        return f"parse memory limit ({self.max_memory / (1024 * 1024):.0f} MiB)"
+
+
+def _address_space():
+    """Virtual memory size of this process in bytes, None where /proc is not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _limit_memory(max_memory):
+    """Let this process allocate at most max_memory more bytes (Linux; elsewhere only the timeout applies)"""
+    try:
+        import resource
+    except ImportError:
+        return
+    current = _address_space()
+    if current is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = current + max_memory
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _worker(connection, max_memory):
+    """Worker loop: receive (name, bytes), send ("ok", FileSummary) or ("memory", None)"""
+    from .controller import ParsedModuleStore, summarize_module
+
+    if max_memory:
+        _limit_memory(max_memory)
+    while True:
+        try:
+            source = connection.recv()
+        except EOFError:
+            return
+        if source is None:
+            return
+        name, data = source
+        try:
+            module = ParsedModuleStore().add_bytes(name, data)
+            if isinstance(module.error, MemoryError):
+                raise module.error
+            message = ("ok", summarize_module(module, raise_memory_error=True))
+        except MemoryError:
+            message = ("memory", None)
+        module = None
+        connection.send(message)
+        if message[0] == "memory":
+            # Heap bisa rusak setelah MemoryError; proses diganti oleh induknya
+            return
+
+
+class _GuardedWorker:
+    def __init__(self, max_memory):
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker, args=(child, max_memory), daemon=True)
+        self.process.start()
+        child.close()
+        self.task = None  # Indeks file yang sedang dikerjakan
+        self.deadline = None
+
+    def submit(self, task, source, timeout):
+        self.task = task
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.connection.send(source)
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+def iter_guarded_summaries(sources, guard, workers=1):
+    """
+    Yield (FileSummary or None, skip reason or None) for each (name, bytes) source,
+    in order, parsing every file in an isolated worker under the budgets of guard.
+    """
+    sources = list(sources)
+    if not sources:
+        return
+    pool = [_GuardedWorker(guard.max_memory) for _ in range(max(1, min(workers or 1, len(sources))))]
+    results = {}
+    next_task = 0
+    next_result = 0
+    try:
+        while next_result < len(sources):
+            for index, worker in enumerate(pool):
+                if worker.task is None and next_task < len(sources):
+                    if not worker.process.is_alive():
+                        pool[index] = worker = _GuardedWorker(guard.max_memory)
+                    worker.submit(next_task, sources[next_task], guard.timeout)
+                    next_task += 1
+            busy = [worker for worker in pool if worker.task is not None]
+            deadlines = [worker.deadline for worker in busy if worker.deadline is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            ready = wait([worker.connection for worker in busy], timeout)
+            for index, worker in enumerate(pool):
+                if worker.task is None:
+                    continue
+                if worker.connection in ready:
+                    try:
+                        status, summary = worker.connection.recv()
+                    except EOFError:
+                        # Proses worker mati tanpa jawaban (mis. dihentikan oleh OOM killer)
+                        worker.process.join(1)
+                        status, summary = f"parse worker exited (code {worker.process.exitcode})", None
+                    if status == "ok":
+                        results[worker.task] = (summary, None)
+                    else:
+                        results[worker.task] = (None, guard.memory_reason() if status == "memory" else status)
+                        worker.stop(kill=True)
+                        pool[index] = _GuardedWorker(guard.max_memory)
+                        continue
+                    worker.task = None
+                elif worker.deadline is not None and time.monotonic() >= worker.deadline:
+                    results[worker.task] = (None, guard.timeout_reason())
+                    worker.stop(kill=True)
+                    pool[index] = _GuardedWorker(guard.max_memory)
+            while next_result in results:
+                yield results.pop(next_result)
+                next_result += 1
+    finally:
+        for worker in pool:
+            worker.stop(kill=worker.task is not None)
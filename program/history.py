@@ -0,0 +1,154 @@
+"""
+Metric history of a local git repository over a commit range.
+
+    python -m program.history REPO RANGE [-o OUT] [--class-metrics] [-j N]
+
+Every commit gets the class metrics of controller.extract_and_parse and the
+complexity report, read straight from the object database (no checkout).
+Results are kept per blob id, so a file version is parsed once however many
+commits contain it, and each commit only applies the files that differ from
+the previous one (see incremental.MetricsSnapshot). OUT gets history.csv with
+one row per commit and, with --class-metrics, class_metrics/<commit>.csv.
+"""
+import argparse
+import os
+import sys
+import time
+
+from . import controller as ct
+from . import gitrepo, profiling
+from .incremental import MetricsSnapshot
+from .reports import COMPLEXITY_COUNTS, complexity_counts, complexity_report_from_totals
+from .sources import SourceFile
+
+
+class BlobResults:
+    """FileSummary and complexity counts per blob id, computed once per unique file version"""
+
+    def __init__(self, reader, workers=1, chunksize=None, cache=None):
+        self.reader = reader
+        self.workers = workers
+        self.chunksize = chunksize
+        self.cache = cache
+        self.summaries = {}
+        self.complexity = {}
+
+    def ensure(self, files):
+        """Analyze the blobs of [(path, blob id)] not seen yet; returns how many were new"""
+        new = {}
+        for path, blob in files:
+            if blob not in self.summaries and blob not in new:
+                new[blob] = path
+        if not new:
+            return 0
+        with profiling.stage("read blobs"):
+            sources = [(path, self.reader.read(blob)) for blob, path in new.items()]
+        summaries, _ = ct.summarize_sources(sources, self.workers, self.chunksize, self.cache)
+        with profiling.stage("complexity counts"):
+            for (blob, path), (_, data), summary in zip(new.items(), sources, summaries):
+                self.summaries[blob] = summary
+                # Laporan kompleksitas hanya membaca file .kt, sama seperti halaman Complexity Report
+                self.complexity[blob] = complexity_counts(SourceFile(path, data)) if path.endswith(".kt") else None
+        return len(new)
+
+
+def commit_history(repo, revision_range, workers=1, chunksize=None, cache=None, on_commit=None):
+    """
+    One dict per commit of the range, oldest first: commit id, date, subject, file,
+    class and method counts, NOI, NOM, NOMNAMM, the complexity report and how many
+    file versions were new. on_commit(commit, snapshot) is called after each commit,
+    e.g. to write its class metrics.
+    """
+    snapshot = MetricsSnapshot()
+    totals = dict.fromkeys(COMPLEXITY_COUNTS, 0)
+    previous = {}
+    trees = {}
+    history = []
+    with gitrepo.BlobReader(repo) as reader:
+        results = BlobResults(reader, workers, chunksize, cache)
+        for commit, tree, date, subject in gitrepo.commits(repo, revision_range):
+            with profiling.stage("list files"):
+                # Commit dengan tree yang sama (merge, revert) tidak perlu dibaca ulang
+                if tree not in trees:
+                    trees[tree] = dict(gitrepo.list_files(repo, tree))
+                files = trees[tree]
+            changed = [(path, blob) for path, blob in files.items() if previous.get(path) != blob]
+            deleted = [path for path in previous if path not in files]
+            new_versions = results.ensure(changed)
+
+            for path in deleted:
+                _add_counts(totals, results.complexity[previous[path]], -1)
+            for path, blob in changed:
+                if path in previous:
+                    _add_counts(totals, results.complexity[previous[path]], -1)
+                _add_counts(totals, results.complexity[blob], 1)
+            snapshot.apply([(path, results.summaries[blob]) for path, blob in changed], deleted)
+            snapshot.revision = commit
+            previous = files
+
+            history.append({
+                "Commit": commit,
+                "Date": date,
+                "Subject": subject,
+                "files": len(files),
+                "new file versions": new_versions,
+                "classes": sum(summary.class_count for summary in snapshot.summaries.values()),
+                "methods": sum(len(cls.methods) for summary in snapshot.summaries.values() for cls in summary.classes),
+                "NOI": snapshot.noi,
+                "NOM": snapshot.nom,
+                "NOMNAMM": snapshot.nomnamm,
+                **complexity_report_from_totals(totals),
+            })
+            profiling.count("commits")
+            if on_commit is not None:
+                on_commit(commit, snapshot)
+    profiling.count("unique file versions", len(results.summaries))
+    return history
+
+
+def _add_counts(totals, counts, sign):
+    if counts is not None:
+        for key in COMPLEXITY_COUNTS:
+            totals[key] += sign * counts[key]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m program.history",
+        description="Per-commit Kotlin metrics of a local git repository, read from its object database.",
+    )
+    parser.add_argument("repo", help="local git repository")
+    parser.add_argument("range", nargs="?", default="HEAD", help="commit range, e.g. v1.0..main (default: HEAD)")
+    parser.add_argument("-o", "--output", default="metrics-history", help="output directory (default: metrics-history)")
+    parser.add_argument("--class-metrics", action="store_true", help="also write the class metrics of every commit")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes for parsing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import pandas as pd
+
+    args = parse_args(argv)
+    os.makedirs(args.output, exist_ok=True)
+    on_commit = None
+    if args.class_metrics:
+        class_dir = os.path.join(args.output, "class_metrics")
+        os.makedirs(class_dir, exist_ok=True)
+
+        def on_commit(commit, snapshot):
+            snapshot.dataframe().to_csv(os.path.join(class_dir, f"{commit}.csv"), index=False)
+
+    start = time.perf_counter()
+    try:
+        history = commit_history(args.repo, args.range, args.workers, on_commit=on_commit)
+    except gitrepo.GitError as e:
+        print(f"git: {e}", file=sys.stderr)
+        return 1
+    pd.DataFrame(history).to_csv(os.path.join(args.output, "history.csv"), index=False)
+    versions = sum(entry["new file versions"] for entry in history)
+    print(f"{len(history)} commits, {versions} unique file versions parsed in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
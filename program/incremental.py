@@ -0,0 +1,239 @@
+"""
+Incremental re-analysis: keep the per-file summaries and project counters of
+one analysis as a snapshot, then apply only the changed, added and deleted
+files of the next revision.
+
+    python -m program.incremental REPO --snapshot FILE [--rev REV] [--output CSV]
+
+The first run analyzes the whole revision; later runs diff the snapshot's
+revision against REV (default: the working tree) and re-parse only those files.
+"""
+import argparse
+import os
+import pickle
+import sys
+
+from . import controller as ct
+from . import gitrepo, inheritance, lexer, profiling, visitor
+from .cache import metrics_version
+from .inheritance import InheritanceIndex, qualified_name
+
+
+def snapshot_version():
+    """Snapshots from other metric code are not reused, the same rule as the metrics cache"""
+    return metrics_version(ct, inheritance, lexer, visitor)
+
+
+class MetricsSnapshot:
+    """
+    Per-file FileSummary objects and extract_and_parse rows of one analysis,
+    plus the project-wide values the rows are joined with.
+
+    update() re-summarizes only the given files. NOI, NOM, NOMNAMM and
+    NOCS_package are adjusted by the difference between the old and new
+    summary of each file, NOC_type through the inheritance index edges of those
+    files. Rows are rebuilt only for the changed files, the files of packages
+    whose NOCS_package changed and the files declaring a class whose NOC_type
+    changed; the other rows only get the new NOI, NOM and NOMNAMM.
+    """
+
+    def __init__(self, revision=None):
+        self.revision = revision
+        self.version = snapshot_version()
+        self.summaries = {}  # {path: FileSummary}, dalam urutan analisis
+        self.rows = {}  # {path: [row]}
+        self.noi = self.nom = self.nomnamm = 0
+        self.nocs_package_counts = {}
+        self.inheritance_index = InheritanceIndex()
+        self.dirty = set()  # File yang diambil dari working tree, bukan dari self.revision
+
+    @classmethod
+    def from_sources(cls, sources, revision=None, workers=1, chunksize=None, cache=None):
+        """Full analysis of (name, bytes) sources"""
+        snapshot = cls(revision)
+        snapshot.update(sources, (), workers, chunksize, cache)
+        return snapshot
+
+    @staticmethod
+    def _package_key(summary):
+        return summary.package if summary.package else "default"
+
+    def _count(self, summary, sign):
+        self.noi += sign * summary.noi
+        self.nom += sign * summary.nom
+        self.nomnamm += sign * summary.nomnamm
+        package_name = self._package_key(summary)
+        count = self.nocs_package_counts.get(package_name, 0)
+        self.nocs_package_counts[package_name] = count + sign * summary.class_count
+
+    def _remove(self, path):
+        summary = self.summaries.pop(path, None)
+        if summary is not None:
+            self.inheritance_index.remove_declarations(path)
+            self._count(summary, -1)
+        return summary
+
+    def _add(self, path, summary):
+        self.summaries[path] = summary
+        self.inheritance_index.add_declarations(summary.package, summary.declarations, summary.imports,
+                                                summary.wildcards, key=path)
+        self._count(summary, 1)
+
+    def update(self, changed=(), deleted=(), workers=1, chunksize=None, cache=None):
+        """
+        Apply (name, bytes) sources that changed or were added and the names of
+        deleted files. New files are appended, changed files keep their place.
+        Returns {"parsed", "deleted", "rows rebuilt"} counts.
+        """
+        changed = list(changed)
+        with profiling.stage("summarize changed files"):
+            summaries, parse_count = ct.summarize_sources(changed, workers, chunksize, cache)
+        stats = self.apply([(name, summary) for (name, _), summary in zip(changed, summaries)], deleted)
+        stats["parsed"] = parse_count
+        return stats
+
+    def apply(self, changed=(), deleted=()):
+        """update() with FileSummary objects computed elsewhere: [(path, summary)] and deleted paths"""
+        changed = list(changed)
+        deleted = list(deleted)
+        old_counters = (self.noi, self.nom, self.nomnamm)
+        packages = {self._package_key(summary) for _, summary in changed}
+        packages.update(self._package_key(self.summaries[path])
+                        for path in [*deleted, *(path for path, _ in changed)] if path in self.summaries)
+        old_package_counts = {name: self.nocs_package_counts.get(name, 0) for name in packages}
+        removed = 0
+        with profiling.stage("apply deltas"):
+            for path in deleted:
+                if self._remove(path) is not None:
+                    del self.rows[path]
+                    removed += 1
+            for path, summary in changed:
+                if path in self.summaries:
+                    # Tetap di posisi lama: hanya nilai di dict yang diganti
+                    self.inheritance_index.remove_declarations(path)
+                    self._count(self.summaries[path], -1)
+                self._add(path, summary)
+            changed_targets = self.inheritance_index.pop_changed_targets()
+        changed_packages = {name for name, count in old_package_counts.items()
+                            if self.nocs_package_counts.get(name, 0) != count}
+
+        with profiling.stage("rows"):
+            rebuild = {path for path, _ in changed}
+            for path, summary in self.summaries.items():
+                if path in rebuild or summary.error is not None:
+                    continue
+                # summary_rows membaca NOCS_package dengan nama "Unknown" untuk file tanpa package
+                if (summary.package if summary.package else "Unknown") in changed_packages or any(
+                        qualified_name(summary.package, cls.name) in changed_targets for cls in summary.classes):
+                    rebuild.add(path)
+            for path in rebuild:
+                self.rows[path] = ct.summary_rows(self.summaries[path], self.noi, self.nom, self.nomnamm,
+                                                  self.nocs_package_counts, self.inheritance_index)
+            if (self.noi, self.nom, self.nomnamm) != old_counters:
+                for path, rows in self.rows.items():
+                    if path in rebuild:
+                        continue
+                    for row in rows:
+                        row["NOI"], row["NOM"], row["NOMNAMM"] = self.noi, self.nom, self.nomnamm
+        profiling.count("rows rebuilt", len(rebuild))
+        return {"parsed": 0, "deleted": removed, "rows rebuilt": len(rebuild)}
+
+    def update_from_git(self, repo, rev=None, workers=1, chunksize=None, cache=None):
+        """
+        Apply the Kotlin files changed between self.revision and rev; rev None means
+        the working tree (untracked files are not seen). Files taken from the working
+        tree last time are read again, in case they were reverted.
+        """
+        if self.revision is None:
+            raise ValueError("snapshot has no revision to diff against")
+        changed, deleted = gitrepo.changed_files(repo, self.revision, rev)
+        paths = list(dict.fromkeys(changed + [path for path in self.dirty if path not in deleted]))
+        sources = list(gitrepo.read_files(repo, paths, rev))
+        found = {path for path, _ in sources}
+        deleted = deleted + [path for path in paths if path not in found]
+        stats = self.update(sources, deleted, workers, chunksize, cache)
+        self.revision = gitrepo.rev_parse(repo, rev or "HEAD")
+        self.dirty = set(gitrepo.changed_files(repo, self.revision)[0]) if rev is None else set()
+        return stats
+
+    def dataframe(self):
+        """The extract_and_parse DataFrame of the current state"""
+        import pandas as pd
+
+        df = pd.DataFrame([row for path in self.summaries for row in self.rows[path]])
+        df.attrs["file_count"] = len(self.summaries)
+        df.attrs["method_count"] = sum(len(cls.methods) for summary in self.summaries.values()
+                                       for cls in summary.classes)
+        return df
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """The snapshot saved at path, or None when it is missing or was made by other metric code"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            print(f"Error reading snapshot {path}: {e}")
+            return None
+        if not isinstance(snapshot, cls) or snapshot.version != snapshot_version():
+            print(f"Snapshot {path} was made by other metric code; analyzing everything again")
+            return None
+        return snapshot
+
+
+def analyze_revision(repo, rev=None, workers=1, chunksize=None, cache=None):
+    """Full snapshot of a revision read from the object database; rev None means HEAD plus the working tree"""
+    revision = gitrepo.rev_parse(repo, rev or "HEAD")
+    paths = [path for path, _ in gitrepo.list_files(repo, revision)]
+    snapshot = MetricsSnapshot.from_sources(gitrepo.read_files(repo, paths, revision), revision,
+                                            workers, chunksize, cache)
+    if rev is None:
+        # Perubahan yang belum di-commit ikut dihitung
+        snapshot.update_from_git(repo, None, workers, chunksize, cache)
+    return snapshot
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m program.incremental",
+        description="Update the class metrics of a git repository from the files changed since the last snapshot.",
+    )
+    parser.add_argument("repo", help="local git repository")
+    parser.add_argument("--snapshot", required=True, help="snapshot file, created on the first run")
+    parser.add_argument("--rev", default=None, help="revision to analyze (default: the working tree)")
+    parser.add_argument("-o", "--output", default=None, help="write the class metrics CSV here")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes for parsing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        snapshot = MetricsSnapshot.load(args.snapshot)
+        if snapshot is None:
+            snapshot = analyze_revision(args.repo, args.rev, args.workers)
+            print(f"Full analysis: {len(snapshot.summaries)} files")
+        else:
+            stats = snapshot.update_from_git(args.repo, args.rev, args.workers)
+            print(f"Incremental: {stats['parsed']} parsed, {stats['deleted']} deleted, "
+                  f"{stats['rows rebuilt']} of {len(snapshot.summaries)} files with rebuilt rows")
+    except gitrepo.GitError as e:
+        print(f"git: {e}", file=sys.stderr)
+        return 1
+    snapshot.save(args.snapshot)
+    if args.output:
+        snapshot.dataframe().to_csv(args.output, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,207 @@
+import importlib.util
+import json
+import os
 import streamlit as st
-from . import controller as ct
+from .cache import content_hash
+from .export import EXPORT_FORMATS, export_bytes, export_file_name, export_label, export_mime
+from .filters import DEFAULT_EXCLUDES, SourceFilter
+from .guard import DEFAULT_MAX_MEMORY, DEFAULT_TIMEOUT, ParseGuard
+from .profiling import Profiler
+from .project import ProjectModel
 
-def main():
+# Hasil analisis per upload disimpan di memori server: paling lama satu jam, paling banyak 16 hasil per fungsi
+CACHE_TTL = 60 * 60
+CACHE_MAX_ENTRIES = 16
+
+
+def upload_digest(uploaded_file):
+    """Content hash of an uploaded file; the key of every cached page analysis"""
+    return content_hash(uploaded_file.getvalue())
+
+
+@st.cache_resource
+def shared_metrics_cache(kind):
+    """
+    One on-disk MetricsCache per kind ("controller" or "per_function"), shared by
+    all sessions of this server instead of being reopened on every rerun.
+    """
+    if kind == "per_function":
+        from .reports import per_function_metrics_cache
+        return per_function_metrics_cache()
+    from .controller import metrics_cache
+    return metrics_cache()
+
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner="Reading Kotlin files...")
+def project_model(digest, name, _data, filter_options=None):
+    """
+    The ProjectModel of one upload, shared by every page and rerun; _data is not hashed.
+    filter_options are the SourceFilter arguments (include, exclude, max_size, skip_generated).
+    Returns the error message as a string when the archive cannot be read.
+    """
+    source_filter = SourceFilter(*filter_options) if filter_options is not None else None
+    try:
+        return ProjectModel.from_archive(_data, name, digest, source_filter)
+    except Exception as e:
+        print(f"Error extracting archive: {e}")
+        return str(e)
+
+
+def load_project(uploaded_file, filter_options=None):
+    """ProjectModel (or error string) of a Streamlit upload"""
+    return project_model(upload_digest(uploaded_file), uploaded_file.name, uploaded_file.getvalue(), filter_options)
+
+
+def filter_controls(key):
+    """Sidebar-style file filter inputs; returns the SourceFilter arguments, None when filtering is off"""
+    with st.expander("File filters"):
+        enabled = st.checkbox("Skip generated and vendored Kotlin files", key=f"{key}-filter")
+        exclude = st.text_area("Exclude patterns (one glob per line)", value="\n".join(DEFAULT_EXCLUDES),
+                               key=f"{key}-exclude",
+                               help="The default patterns are active when the box above is ticked. They skip "
+                                    "Gradle output under build/ (generated, tmp, intermediates), not source "
+                                    "packages named build.")
+        include = st.text_area("Include patterns (empty = every file)", key=f"{key}-include")
+        max_size = st.number_input("Maximum file size (KiB, 0 = no limit)", min_value=0, value=0,
+                                   key=f"{key}-max-size")
+        skip_generated = st.checkbox("Skip files with a generated-code header", value=True, key=f"{key}-generated")
+    if not enabled:
+        return None
+    return (tuple(line.strip() for line in include.splitlines() if line.strip()),
+            tuple(line.strip() for line in exclude.splitlines() if line.strip()),
+            max_size * 1024 or None, skip_generated)
+
+
+def show_duplicate_report(project):
+    """Byte-identical files of the project, analyzed once"""
+    report = project.duplicate_report()
+    if not report["duplicate files"]:
+        return
+    with st.expander(f"Duplicate files: {report['duplicate files']} of {report['files']} "
+                     f"({report['duplicate share']:.0%} of files, {report['duplicate byte share']:.0%} of bytes)"):
+        st.dataframe([{**group, "Files": ", ".join(group["Files"])} for group in report["groups"]])
+
+
+def show_filter_report(project):
+    """Files and bytes each filter rule skipped"""
+    if project.filter_report is None:
+        return
+    skipped = sum(row["Files"] for row in project.filter_report if row["Rule"] != "analyzed")
+    with st.expander(f"Filtered out: {skipped} files"):
+        st.dataframe(project.filter_report)
+
+
+def profiling_controls(key):
+    """Expander with the profiling options of a page; returns a Profiler, or None when profiling is off"""
+    with st.expander("Profiling"):
+        enabled = st.checkbox("Record stage timings", key=f"{key}-profile")
+        cprofile = st.checkbox("Capture cProfile (slower)", key=f"{key}-cprofile")
+        memory = st.checkbox("Track peak memory with tracemalloc (slower)", key=f"{key}-memory")
+    if enabled or cprofile or memory:
+        return Profiler(cprofile=cprofile, memory=memory)
+    return None
+
+
+def show_profiling(profiler, key):
+    """Timing breakdown of a finished run, with the JSON report for download"""
+    if profiler is None:
+        return
+    import pandas as pd
+
+    report = profiler.report()
+    with st.expander(f"Timing breakdown ({report['total_s']:.2f}s)", expanded=True):
+        if report["stages"]:
+            st.dataframe(pd.DataFrame(report["stages"]))
+        if report["counters"]:
+            st.write(report["counters"])
+        if "memory_peak_bytes" in report:
+            st.caption(f"Peak traced memory: {report['memory_peak_bytes'] / (1024 * 1024):.1f} MiB")
+        if report.get("top_functions"):
+            st.dataframe(pd.DataFrame(report["top_functions"]))
+        st.download_button("Download profile (JSON)", json.dumps(report, indent=2),
+                           file_name="profile.json", mime="application/json", key=f"{key}-profile-json")
+
+def download_table(df, stem, key, label="Download", spool=None):
+    """
+    Format choice (CSV, Parquet, Feather) and a download button for a metric table.
+    With an export.CSVSpool instead of df, the file is only built when the
+    button is clicked: the CSV is the spool's own bytes, and the DataFrame for
+    Parquet/Feather is read back from it then. Streamlit still keeps the
+    finished download in memory while it is served.
+    """
+    export_format = st.selectbox("Export format", list(EXPORT_FORMATS), format_func=export_label,
+                                 key=f"{key}-format")
+    if spool is not None:
+        if export_format != "csv" and importlib.util.find_spec("pyarrow") is None:
+            st.error("Parquet and Feather export need pyarrow (pip install pyarrow)")
+            return
+
+        def data():
+            if export_format == "csv":
+                return spool.getvalue()
+            return export_bytes(spool.dataframe(), export_format)
+    else:
+        try:
+            data = export_bytes(df, export_format)
+        except RuntimeError as e:
+            st.error(str(e))
+            return
+    st.download_button(
+        label=f"{label} {export_label(export_format)}",
+        data=data,
+        file_name=export_file_name(stem, export_format),
+        mime=export_mime(export_format),
+        key=f"{key}-download",
+    )
+
+
+def main(project=None):
+    """AST page; renders the shared project when given, otherwise asks for its own upload"""
     st.title("Kotlin Function Extractor")
 
-    file = st.file_uploader("Upload a RAR or ZIP file containing Kotlin files", type=["rar", "zip"])
+    if project is None:
+        file = st.file_uploader("Upload a RAR or ZIP file containing Kotlin files", type=["rar", "zip"])
+        filter_options = filter_controls("ast")
+        project = load_project(file, filter_options) if file is not None else None
 
-    if file is not None:
-        df = ct.extract_and_parse(file)
-        if isinstance(df, str):
-            st.error(f"Error extracting archive: {df}")
-        else:
-            st.dataframe(df)
+    with st.expander("Parallel options"):
+        workers = st.number_input("Worker processes", min_value=1, max_value=os.cpu_count() or 1, value=1)
+        chunksize = st.number_input("Files per task (0 = automatic)", min_value=0, value=0)
+    with st.expander("Parse limits"):
+        guarded = st.checkbox("Parse each file in an isolated worker with a time and memory budget")
+        timeout = st.number_input("Timeout per file (s)", min_value=1, value=DEFAULT_TIMEOUT)
+        max_memory = st.number_input("Memory per worker (MiB)", min_value=64,
+                                     value=DEFAULT_MAX_MEMORY // (1024 * 1024))
+        fallback = st.checkbox("Use text-based metrics for skipped files", value=True)
+    guard = ParseGuard(timeout, max_memory * 1024 * 1024, fallback) if guarded else None
+    use_cache = st.checkbox("Reuse cached metrics for unchanged files", value=True)
+    profiler = profiling_controls("ast")
 
+    if isinstance(project, str):
+        st.error(f"Error extracting archive: {project}")
+    elif project is not None:
+        # Model proyek menyimpan hasil parse; berpindah halaman atau rerun tidak mem-parse ulang
+        cache = shared_metrics_cache("controller") if use_cache else None
+        bar = st.progress(0.0, text="Analyzing Kotlin files...")
+        df = project.class_metrics(
+            workers, chunksize or None, cache, profiler,
+            progress=lambda done, total: bar.progress(done / total, text=f"Analyzed {done} of {total} files"),
+            guard=guard,
+        )
+        bar.empty()
+        show_filter_report(project)
+        st.caption(f"Kotlin files: {df.attrs.get('file_count', 0)}, parses: {df.attrs.get('parse_count', 0)}, "
+                   f"duplicates: {df.attrs.get('duplicate_count', 0)}")
+        show_duplicate_report(project)
+        if df.attrs.get("skipped_count"):
+            st.warning(f"{df.attrs['skipped_count']} files went over the parse limits and were skipped "
+                       "(see the Skipped column)")
+        if "cache" in df.attrs:
+            stats = df.attrs["cache"]
+            st.caption(f"Metrics cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+        st.dataframe(df)
+        download_table(df, "class_metrics", "ast")
+        show_profiling(profiler, "ast")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
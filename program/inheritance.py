@@ -0,0 +1,252 @@
+from kopyt import node
+
+
+def supertype_name(supertype):
+    """Return the dotted name of a delegation specifier, e.g. 'foo.bar.Vehicle'"""
+    delegate = getattr(supertype, "delegate", None)
+    sequence = None
+    # For constructor invocations (class inheritance with parentheses)
+    if hasattr(delegate, "invoker"):
+        sequence = getattr(delegate.invoker, "sequence", None)
+    # For direct type references (interface implementation)
+    elif hasattr(delegate, "sequence"):
+        sequence = delegate.sequence
+    if not sequence:
+        return None
+    return ".".join(part.name for part in sequence)
+
+
+def collect_class_declarations(kotlin_file):
+    """List of (class_name, [supertype names]) for the top-level classes and interfaces of a file"""
+    declarations = []
+    for decl in kotlin_file.declarations:
+        if isinstance(decl, node.ClassDeclaration):
+            super_types = []
+            for supertype in decl.supertypes or []:
+                super_name = supertype_name(supertype)
+                if super_name:
+                    super_types.append(super_name)
+            declarations.append((decl.name, super_types))
+    return declarations
+
+
+def collect_imports(kotlin_file):
+    """Return ({alias_or_simple_name: qualified_name}, [wildcard packages])"""
+    explicit = {}
+    wildcards = []
+    for header in kotlin_file.imports or []:
+        if header.wildcard:
+            wildcards.append(header.name)
+        else:
+            explicit[header.alias or header.name.split(".")[-1]] = header.name
+    return explicit, wildcards
+
+
+def qualified_name(package, class_name):
+    return f"{package}.{class_name}" if package else class_name
+
+
+class InheritanceIndex:
+    """
+    Project-wide inheritance index, built once per analysis.
+
+    Classes are keyed by their package-qualified name. Supertypes written in
+    the source are resolved against the project (same package, explicit and
+    wildcard imports, fully qualified references); anything that does not
+    resolve is kept under its written name and marked as external.
+
+    Files can be added and removed again by key after a build. As long as the
+    set of project classes stays the same only the edges of those files are
+    relinked; otherwise the next lookup resolves everything again. Targets
+    whose number of children changed are collected in changed_targets.
+    """
+
+    def __init__(self):
+        self._files = {}  # {key: (package, imports, wildcard imports, declarations)} sebelum di-resolve
+        self._next_key = 0
+        self._class_counts = {}  # {qualified_name: jumlah deklarasi}; nama ganda selalu di-resolve ulang
+        self._edges = {}  # {key: [(child, target)]} hasil resolve per file
+        self._external_counts = {}
+        self._presence_before = {}  # {qualified_name: ada sebelum perubahan} sejak resolve terakhir
+        self._unlinked = []  # key file yang ditambahkan tetapi belum di-resolve
+        self._needs_build = False
+        self.project_classes = {}  # {qualified_name: simple_name}
+        self.supertypes = {}  # {qualified_name: [resolved supertype names]}
+        self.children = {}  # {supertype name: [qualified child names]}
+        self.external_classes = set()
+        self.changed_targets = set()
+
+    @classmethod
+    def from_modules(cls, modules):
+        index = cls()
+        for module in modules:
+            if module.error is None:
+                index.add_module(module.package, module.kotlin_file)
+        return index.build()
+
+    def add_module(self, package, kotlin_file):
+        imports, wildcards = collect_imports(kotlin_file)
+        self.add_declarations(package, collect_class_declarations(kotlin_file), imports, wildcards)
+
+    def _class_toggled(self, qualified, present_before):
+        self._presence_before.setdefault(qualified, present_before)
+
+    def add_declarations(self, package, declarations, imports=None, wildcards=None, key=None):
+        """Add the classes of one file; returns the key to remove them with"""
+        if key is None:
+            key = self._next_key
+            self._next_key += 1
+        elif key in self._files:
+            self.remove_declarations(key)
+        self._files[key] = (package, imports or {}, wildcards or [], declarations)
+        for class_name, _ in declarations:
+            qualified = qualified_name(package, class_name)
+            count = self._class_counts.get(qualified, 0)
+            if count:
+                self._needs_build = True
+            else:
+                self._class_toggled(qualified, False)
+            self._class_counts[qualified] = count + 1
+            self.project_classes[qualified] = class_name
+        self._unlinked.append(key)
+        return key
+
+    def remove_declarations(self, key):
+        """Remove the classes of a file added under key"""
+        entry = self._files.pop(key, None)
+        if entry is None:
+            return
+        package, _, _, declarations = entry
+        self._unlink(key)
+        for class_name, _ in declarations:
+            qualified = qualified_name(package, class_name)
+            count = self._class_counts[qualified] - 1
+            if count:
+                self._class_counts[qualified] = count
+                self._needs_build = True
+            else:
+                del self._class_counts[qualified]
+                del self.project_classes[qualified]
+                self._class_toggled(qualified, True)
+
+    def resolve(self, name, package=None, imports=None, wildcards=()):
+        """Resolve a supertype as written in a file to a project class, or None if external"""
+        candidates = [qualified_name(package, name)]
+        head, _, rest = name.partition(".")
+        if imports and head in imports:
+            candidates.append(imports[head] + ("." + rest if rest else ""))
+        candidates.extend(f"{wildcard}.{name}" for wildcard in wildcards)
+        if rest:
+            candidates.append(name)
+        for candidate in candidates:
+            if candidate in self.project_classes:
+                return candidate
+        return None
+
+    def _link(self, key):
+        package, imports, wildcards, declarations = self._files[key]
+        edges = []
+        for class_name, super_names in declarations:
+            child = qualified_name(package, class_name)
+            resolved = []
+            for super_name in super_names:
+                target = self.resolve(super_name, package, imports, wildcards)
+                if target is None:
+                    target = super_name
+                    self._external_counts[target] = self._external_counts.get(target, 0) + 1
+                    self.external_classes.add(target)
+                resolved.append(target)
+                self.children.setdefault(target, []).append(child)
+                self.changed_targets.add(target)
+                edges.append((child, target))
+            self.supertypes[child] = resolved
+        self._edges[key] = edges
+
+    def _unlink(self, key):
+        edges = self._edges.pop(key, None)
+        if edges is None:
+            # File belum di-resolve
+            if key in self._unlinked:
+                self._unlinked.remove(key)
+            return
+        for child, target in edges:
+            children = self.children[target]
+            children.remove(child)
+            if not children:
+                del self.children[target]
+            self.changed_targets.add(target)
+            if target in self._external_counts:
+                self._external_counts[target] -= 1
+                if not self._external_counts[target]:
+                    del self._external_counts[target]
+                    self.external_classes.discard(target)
+            self.supertypes.pop(child, None)
+
+    def _resolution_changed(self):
+        return self._needs_build or any(
+            (qualified in self.project_classes) != present for qualified, present in self._presence_before.items()
+        )
+
+    def _ensure_built(self):
+        if self._resolution_changed():
+            self.build()
+        elif self._unlinked:
+            for key in self._unlinked:
+                self._link(key)
+            self._unlinked = []
+            self._presence_before = {}
+
+    def build(self):
+        old_counts = {target: len(children) for target, children in self.children.items()}
+        changed = self.changed_targets
+        self.supertypes = {}
+        self.children = {}
+        self.external_classes = set()
+        self._edges = {}
+        self._external_counts = {}
+        self.changed_targets = set()
+        for key in self._files:
+            self._link(key)
+        # Target yang sudah berubah sebelum build (file yang dihapus) tetap dicatat
+        self.changed_targets = changed | {
+            target for target in old_counts.keys() | self.children.keys()
+            if old_counts.get(target, 0) != len(self.children.get(target, ()))
+        }
+        self._unlinked = []
+        self._presence_before = {}
+        self._needs_build = False
+        return self
+
+    def pop_changed_targets(self):
+        """Targets whose children changed since the last call (qualified or external names)"""
+        self._ensure_built()
+        changed, self.changed_targets = self.changed_targets, set()
+        return changed
+
+    def is_project_class(self, name):
+        return name in self.project_classes
+
+    def direct_supertypes(self, class_name, package=None):
+        self._ensure_built()
+        return self.supertypes.get(qualified_name(package, class_name), [])
+
+    def direct_children(self, class_name, package=None):
+        self._ensure_built()
+        return self.children.get(qualified_name(package, class_name), [])
+
+    def noc(self, class_name, package=None):
+        """NOC_type: number of direct children of a class, an O(1) lookup"""
+        self._ensure_built()
+        return len(self.children.get(qualified_name(package, class_name), ()))
+
+    def noc_mapping(self, include_external_classes=True):
+        """Children count keyed by simple class name, the shape returned by count_noc_type"""
+        self._ensure_built()
+        class_hierarchy = {}
+        for qualified, simple in self.project_classes.items():
+            class_hierarchy[simple] = class_hierarchy.get(simple, 0) + len(self.children.get(qualified, ()))
+        if include_external_classes:
+            for external in self.external_classes:
+                simple = external.split(".")[-1]  # Handle qualified names
+                class_hierarchy[simple] = class_hierarchy.get(simple, 0) + len(self.children.get(external, ()))
+        return class_hierarchy
@@ -0,0 +1,215 @@
+import re
+from collections import namedtuple
+
+from . import profiling
+
+# Jenis token
+IDENTIFIER = "identifier"  # termasuk keyword, misalnya if, fun, class
+NUMBER = "number"
+STRING = "string"  # string biasa maupun raw string, termasuk template di dalamnya
+CHAR = "char"
+LINE_COMMENT = "line_comment"
+BLOCK_COMMENT = "block_comment"
+OPERATOR = "operator"
+
+COMMENT_KINDS = (LINE_COMMENT, BLOCK_COMMENT)
+
+Token = namedtuple("Token", ["kind", "value", "line", "start", "end"])
+
+_SIMPLE_TOKEN = re.compile(
+    r"""
+    (?P<space>[^\S\n]+)
+  | (?P<newline>\n)
+  | (?P<identifier>[^\W\d]\w*|`[^`\n]+`)
+  | (?P<number>0[xX][0-9a-fA-F_]+[uU]?[lL]?|0[bB][01_]+[uU]?[lL]?
+      |(?:\d[\d_]*)?\.\d[\d_]*(?:[eE][+-]?\d+)?[fFdD]?
+      |\d[\d_]*(?:[eE][+-]?\d+[fFdD]?|[fFdD]|[uU]?[lL]?))
+  | (?P<operator>\.\.<|===|!==|\?\.|\?:|::|\.\.|->|=>|==|!=|<=|>=|&&|\|\||\+\+|--|\+=|-=|\*=|/=|%=|!!|[^\w\s])
+    """,
+    re.VERBOSE,
+)
+
+
+class LexerError(ValueError):
+    pass
+
+
+class _Scanner:
+    def __init__(self, text):
+        self.text = text
+        self.length = len(text)
+        self.line = 1
+
+    def _skip_block_comment(self, pos):
+        """pos points at '/*'; returns the position after the matching '*/' (comments nest)"""
+        text = self.text
+        depth = 0
+        while pos < self.length:
+            if text.startswith("/*", pos):
+                depth += 1
+                pos += 2
+            elif text.startswith("*/", pos):
+                depth -= 1
+                pos += 2
+                if depth == 0:
+                    return pos
+            else:
+                if text[pos] == "\n":
+                    self.line += 1
+                pos += 1
+        return pos  # Komentar tidak ditutup sampai akhir file
+
+    def _skip_template_expression(self, pos):
+        """pos points after '${'; returns the position after the matching '}'"""
+        text = self.text
+        depth = 1
+        while pos < self.length:
+            char = text[pos]
+            if char == '"':
+                pos = self._skip_string(pos)
+            elif char == "'":
+                pos = self._skip_char(pos)
+            elif text.startswith("/*", pos):
+                pos = self._skip_block_comment(pos)
+            elif text.startswith("//", pos):
+                end = text.find("\n", pos)
+                pos = self.length if end == -1 else end
+            else:
+                if char == "{":
+                    depth += 1
+                elif char == "}":
+                    depth -= 1
+                    if depth == 0:
+                        return pos + 1
+                elif char == "\n":
+                    self.line += 1
+                pos += 1
+        return pos
+
+    def _skip_string(self, pos):
+        """pos points at the opening quote(s); handles raw strings, escapes and ${...} templates"""
+        text = self.text
+        raw = text.startswith('"""', pos)
+        pos += 3 if raw else 1
+        while pos < self.length:
+            char = text[pos]
+            if raw and text.startswith('"""', pos):
+                pos += 3
+                # Tanda kutip tambahan sebelum penutup masih bagian dari isi raw string
+                while pos < self.length and text[pos] == '"':
+                    pos += 1
+                return pos
+            if not raw:
+                if char == "\\":
+                    pos += 2
+                    continue
+                if char == '"':
+                    return pos + 1
+                if char == "\n":
+                    # String biasa tidak boleh melewati baris; anggap selesai di sini
+                    return pos
+            if text.startswith("${", pos):
+                pos = self._skip_template_expression(pos + 2)
+                continue
+            if char == "\n":
+                self.line += 1
+            pos += 1
+        return pos
+
+    def _skip_char(self, pos):
+        text = self.text
+        pos += 1
+        while pos < self.length:
+            char = text[pos]
+            if char == "\\":
+                pos += 2
+            elif char == "'" or char == "\n":
+                return pos + 1 if char == "'" else pos
+            else:
+                pos += 1
+        return pos
+
+    def tokens(self):
+        text = self.text
+        pos = 0
+        match_at = _SIMPLE_TOKEN.match
+        while pos < self.length:
+            char = text[pos]
+            line = self.line
+            if char == '"':
+                end = self._skip_string(pos)
+                yield Token(STRING, text[pos:end], line, pos, end)
+                pos = end
+                continue
+            if char == "'":
+                end = self._skip_char(pos)
+                yield Token(CHAR, text[pos:end], line, pos, end)
+                pos = end
+                continue
+            if char == "/" and pos + 1 < self.length:
+                following = text[pos + 1]
+                if following == "/":
+                    end = text.find("\n", pos)
+                    end = self.length if end == -1 else end
+                    yield Token(LINE_COMMENT, text[pos:end], line, pos, end)
+                    pos = end
+                    continue
+                if following == "*":
+                    end = self._skip_block_comment(pos)
+                    yield Token(BLOCK_COMMENT, text[pos:end], line, pos, end)
+                    pos = end
+                    continue
+            match = match_at(text, pos)
+            if match is None:
+                raise LexerError(f"Unexpected character {char!r} at line {line}")
+            kind = match.lastgroup
+            end = match.end()
+            if kind == "newline":
+                self.line += 1
+            elif kind != "space":
+                yield Token(kind, match.group(), line, pos, end)
+            pos = end
+
+
+@profiling.timed("tokenize")
+def tokenize(text):
+    """
+    Tokenize Kotlin source in a single pass.
+    Strings (including raw strings and ${...} templates), character literals and
+    comments (nested block comments too) are single tokens, so keywords inside
+    them are never mistaken for code.
+    """
+    return list(_Scanner(text).tokens())
+
+
+def code_tokens(tokens):
+    """Tokens without comments"""
+    return [token for token in tokens if token.kind not in COMMENT_KINDS]
+
+
+def tokens_by_line(tokens):
+    """Group code tokens by the line they start on: {line: [tokens]}"""
+    lines = {}
+    for token in tokens:
+        if token.kind not in COMMENT_KINDS:
+            lines.setdefault(token.line, []).append(token)
+    return lines
+
+
+def is_keyword(token, keywords):
+    return token.kind == IDENTIFIER and token.value in keywords
+
+
+def package_name(tokens):
+    """Name from the 'package a.b.c' header, or None"""
+    tokens = code_tokens(tokens)
+    for i, token in enumerate(tokens):
+        if is_keyword(token, ("package",)):
+            parts = []
+            for part in tokens[i + 1:]:
+                expected_kind = IDENTIFIER if len(parts) % 2 == 0 else OPERATOR
+                if part.line != token.line or part.kind != expected_kind or (expected_kind == OPERATOR and part.value != "."):
+                    break
+                parts.append(part.value)
+            return "".join(parts).rstrip(".") or None
+    return None
@@ -1,8 +1,5 @@
 # fungsi ini tidak menghitung class external, yang menghitung external class ada di controller.py
 
-from kopyt import Parser
-from kopyt.node import ClassDeclaration, InterfaceDeclaration
-
 code = """
 open class Vehicle
 class Car : Vehicle()
@@ -10,35 +7,45 @@ interface Engine
 class Motorcycle : Vehicle(), Engine
 """
 
-parser = Parser(code)
-ast = parser.parse()
 
-for decl in ast.declarations:
-    if isinstance(decl, ClassDeclaration):
-        print(f"Class: {decl.name}")
+# Mencetak pewarisan setiap deklarasi; contoh ini hanya dijalankan lewat "python -m program.noc"
+def print_inheritance(code):
+    from kopyt import Parser
+    from kopyt.node import ClassDeclaration, InterfaceDeclaration
+
+    parser = Parser(code)
+    ast = parser.parse()
+
+    for decl in ast.declarations:
+        if isinstance(decl, ClassDeclaration):
+            print(f"Class: {decl.name}")
         
-        # Process supertypes to find inheritance relationships
-        if decl.supertypes:
-            extends = []
-            implements = []
+            # Process supertypes to find inheritance relationships
+            if decl.supertypes:
+                extends = []
+                implements = []
             
-            for supertype in decl.supertypes:
-                # Extract the name from the supertype structure
-                # For constructor invocations (class inheritance with parentheses)
-                if hasattr(supertype, 'delegate') and hasattr(supertype.delegate, 'invoker'):
-                    if hasattr(supertype.delegate.invoker, 'sequence') and supertype.delegate.invoker.sequence:
-                        name = supertype.delegate.invoker.sequence[0].name
-                        extends.append(name)
-                # For direct type references (interface implementation)
-                elif hasattr(supertype, 'delegate') and hasattr(supertype.delegate, 'sequence'):
-                    if supertype.delegate.sequence:
-                        name = supertype.delegate.sequence[0].name
-                        implements.append(name)
+                for supertype in decl.supertypes:
+                    # Extract the name from the supertype structure
+                    # For constructor invocations (class inheritance with parentheses)
+                    if hasattr(supertype, 'delegate') and hasattr(supertype.delegate, 'invoker'):
+                        if hasattr(supertype.delegate.invoker, 'sequence') and supertype.delegate.invoker.sequence:
+                            name = supertype.delegate.invoker.sequence[0].name
+                            extends.append(name)
+                    # For direct type references (interface implementation)
+                    elif hasattr(supertype, 'delegate') and hasattr(supertype.delegate, 'sequence'):
+                        if supertype.delegate.sequence:
+                            name = supertype.delegate.sequence[0].name
+                            implements.append(name)
             
-            if extends:
-                print(f"  Extends: {extends}")
-            if implements:
-                print(f"  Implements: {implements}")
+                if extends:
+                    print(f"  Extends: {extends}")
+                if implements:
+                    print(f"  Implements: {implements}")
     
-    elif isinstance(decl, InterfaceDeclaration):
-        print(f"Interface: {decl.name}")
\ No newline at end of file
+        elif isinstance(decl, InterfaceDeclaration):
+            print(f"Interface: {decl.name}")
+
+
+if __name__ == "__main__":
+    print_inheritance(code)
@@ -0,0 +1,42 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .controller import ParsedModuleStore, summarize_module
+
+# Jumlah file per task yang dikirim ke satu worker; chunk yang lebih besar mengurangi overhead IPC
+DEFAULT_CHUNKSIZE = 8
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def summarize_source(source):
+    """Worker task: parse one (name, bytes) Kotlin source and return its compact FileSummary"""
+    name, data = source
+    module = ParsedModuleStore().add_bytes(name, data)
+    return summarize_module(module)
+
+
+def summarize_source_list(sources, workers=None, chunksize=None):
+    """
+    Summarize Kotlin sources across a process pool.
+    Results come back in the order of sources, so merging them gives the same
+    rows as the serial path.
+    """
+    return list(iter_summarize_sources(sources, workers, chunksize))
+
+
+def iter_summarize_sources(sources, workers=None, chunksize=None):
+    """summarize_source_list as a generator: each FileSummary is yielded, in order, as soon as it is back"""
+    sources = list(sources)
+    workers = workers or default_workers()
+    if workers <= 1 or len(sources) <= 1:
+        for source in sources:
+            yield summarize_source(source)
+        return
+    if not chunksize:
+        # Bagi rata file ke worker, beberapa chunk per worker agar beban tetap seimbang
+        chunksize = max(1, min(DEFAULT_CHUNKSIZE, len(sources) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=min(workers, len(sources))) as executor:
+        yield from executor.map(summarize_source, sources, chunksize=chunksize)
@@ -0,0 +1,168 @@
+"""
+Lightweight per-stage profiling for the analysis pipeline.
+
+    profiler = Profiler(cprofile=True)
+    with profiler:
+        df = extract_and_parse(file)
+    profiler.report()  # {"total_s", "stages", "counters", ...}
+
+Pipeline code marks its stages with profiling.stage("parse") and its counters
+with profiling.count("files"). Both act on the profiler that is currently
+active (the innermost "with profiler"); when none is active they cost one
+context-variable lookup and do nothing else.
+"""
+import contextlib
+import contextvars
+import cProfile
+import functools
+import pstats
+import time
+import tracemalloc
+
+_ACTIVE = contextvars.ContextVar("kotlin_metrics_profiler", default=None)
+_NULL_STAGE = contextlib.nullcontext()
+
+DEFAULT_TOP_FUNCTIONS = 25
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "entry", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        profiler._stack.append(self.name)
+        # Entry dibuat saat stage dibuka, sehingga urutan laporan mengikuti urutan pipeline
+        self.entry = profiler.stages.setdefault("/".join(profiler._stack), [0.0, 0])
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.entry[0] += time.perf_counter() - self.start
+        self.entry[1] += 1
+        self.profiler._stack.pop()
+        return False
+
+
+class Profiler:
+    """
+    Collects stage timings and counters while active. Stages nest: a stage
+    opened inside "extract_and_parse" is reported as "extract_and_parse/parse".
+    With cprofile=True the whole run is also captured by cProfile, and with
+    memory=True its peak traced memory is recorded by tracemalloc.
+    """
+
+    def __init__(self, cprofile=False, memory=False):
+        self.cprofile = cprofile
+        self.memory = memory
+        self.stages = {}  # {nama stage: [detik, jumlah panggilan]}
+        self.counters = {}
+        self.total = 0.0
+        self.memory_peak = None
+        self._stack = []
+        self._tokens = []
+        self._start = None
+        self._profile = None
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        self._tokens.append(_ACTIVE.set(self))
+        if len(self._tokens) == 1:
+            if self.memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            if self.cprofile:
+                self._profile = self._profile or cProfile.Profile()
+                self._profile.enable()
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _ACTIVE.reset(self._tokens.pop())
+        if not self._tokens:
+            self.total += time.perf_counter() - self._start
+            if self._profile is not None:
+                self._profile.disable()
+            if self.memory and tracemalloc.is_tracing():
+                peak = tracemalloc.get_traced_memory()[1]
+                self.memory_peak = max(self.memory_peak or 0, peak)
+                if self._started_tracemalloc:
+                    tracemalloc.stop()
+                    self._started_tracemalloc = False
+        return False
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def top_functions(self, limit=DEFAULT_TOP_FUNCTIONS):
+        """The cProfile entries with the highest cumulative time"""
+        if self._profile is None:
+            return []
+        stats = pstats.Stats(self._profile)
+        rows = []
+        for (file_name, line, function), (_, calls, total, cumulative, _) in stats.stats.items():
+            rows.append({
+                "function": f"{function} ({file_name}:{line})",
+                "calls": calls,
+                "total_s": total,
+                "cumulative_s": cumulative,
+            })
+        rows.sort(key=lambda row: row["cumulative_s"], reverse=True)
+        return rows[:limit]
+
+    def report(self):
+        """Structured, JSON-serializable timing breakdown"""
+        report = {
+            "total_s": self.total,
+            "stages": [
+                {"stage": name, "seconds": seconds, "calls": calls}
+                for name, (seconds, calls) in self.stages.items()
+            ],
+            "counters": dict(self.counters),
+        }
+        if self.memory_peak is not None:
+            report["memory_peak_bytes"] = self.memory_peak
+        if self._profile is not None:
+            report["top_functions"] = self.top_functions()
+        return report
+
+
+def current():
+    """The active Profiler, or None"""
+    return _ACTIVE.get()
+
+
+def stage(name):
+    profiler = _ACTIVE.get()
+    return _NULL_STAGE if profiler is None else _Stage(profiler, name)
+
+
+def count(name, amount=1):
+    profiler = _ACTIVE.get()
+    if profiler is not None:
+        profiler.count(name, amount)
+
+
+def timed(name):
+    """Decorator: run the function as a stage of the active profiler"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = _ACTIVE.get()
+            if profiler is None:
+                return function(*args, **kwargs)
+            with _Stage(profiler, name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def use(profiler):
+    """Activate profiler for a with-block; a no-op for None"""
+    return _NULL_STAGE if profiler is None else profiler
@@ -0,0 +1,144 @@
+import threading
+
+from . import profiling
+from .export import CSVSpool
+from .reports import (
+    PER_FUNCTION_COLUMNS,
+    analyze_kotlin_source_files,
+    calculate_complexity_report_source_files,
+    iter_source_files_per_function,
+)
+from .sources import duplicate_report, iter_archive_sources, source_files
+
+
+class ProjectModel:
+    """
+    In-memory model of one uploaded project, shared by every page.
+
+    The archive is extracted once into SourceFile objects, whose text and token
+    streams are computed once; the Kotlin files are parsed once into the
+    FileSummary list behind the class metrics. Each report is built on first
+    request and kept, so a full review costs one extraction and one parse per
+    file. Passing a profiler recomputes that report under it, so its timings
+    are real. Results of the class metrics are kept per ParseGuard setting, so
+    turning the guard on after a first analysis parses again under it. A progress callback is called while a report is computed, so a
+    page can show a progress bar and the first rows before it is done.
+    """
+
+    def __init__(self, name, sources, digest=None):
+        self.name = name
+        self.digest = digest
+        self.files = source_files(sources)
+        self._lock = threading.RLock()
+        self._summaries = {}  # {guard key: (FileSummary list, parse count)}
+        self._reports = {}
+        self.filter_report = None  # SourceFilter.report() bila file disaring saat dibaca
+
+    @classmethod
+    def from_archive(cls, archive, name=None, digest=None, source_filter=None):
+        """Model of an archive; a filters.SourceFilter drops files before they are read"""
+        name = name or getattr(archive, "name", None)
+        project = cls(name, iter_archive_sources(archive, name, source_filter=source_filter), digest)
+        if source_filter is not None:
+            project.filter_report = source_filter.report()
+        return project
+
+    @property
+    def kotlin_files(self):
+        """The .kt files; the text reports of the original pages only read these"""
+        return [source_file for source_file in self.files if source_file.name.endswith(".kt")]
+
+    @property
+    def file_count(self):
+        return len(self.files)
+
+    def _report(self, key, compute, profiler=None):
+        with self._lock:
+            if profiler is not None:
+                with profiling.use(profiler):
+                    self._reports[key] = compute()
+            elif key not in self._reports:
+                self._reports[key] = compute()
+            return self._reports[key]
+
+    def summaries(self, workers=1, chunksize=None, cache=None, profiler=None, progress=None, guard=None):
+        """
+        (FileSummary list, parse count); parsed on the first call only.
+        progress(done, total) is called after each file while parsing.
+        With a guard.ParseGuard files are parsed in isolated workers under its budgets.
+        """
+        # controller (dan kopyt) baru dimuat saat halaman yang butuh metrik kelas dibuka
+        from . import controller as ct
+
+        key = guard.key() if guard is not None else None
+        with self._lock:
+            if key not in self._summaries or profiler is not None:
+                with profiling.use(profiler):
+                    sources = [(source_file.name, source_file.data) for source_file in self.files]
+                    summaries = []
+                    parse_count = 0
+                    for summary, parsed in ct.iter_summarize_sources(sources, workers, chunksize, cache, guard):
+                        summaries.append(summary)
+                        parse_count += parsed
+                        if progress is not None:
+                            progress(len(summaries), len(sources))
+                    self._summaries[key] = summaries, parse_count
+            return self._summaries[key]
+
+    def metric_tables(self, workers=1, chunksize=None, cache=None, profiler=None, progress=None, guard=None):
+        """Normalized project, package, class and method tables behind the class metrics"""
+        def compute():
+            from . import controller as ct
+
+            summaries, _ = self.summaries(workers, chunksize, cache, profiler, progress, guard)
+            return ct.summaries_to_tables(summaries)
+        return self._report(("tables", guard.key() if guard is not None else None), compute, profiler)
+
+    def class_metrics(self, workers=1, chunksize=None, cache=None, profiler=None, progress=None, guard=None):
+        """The extract_and_parse DataFrame of the AST page"""
+        def compute():
+            # Hit dan miss analisis ini saja, walaupun cache-nya dipakai bersama sesi lain
+            session = cache.session() if cache is not None else None
+            tables = self.metric_tables(workers, chunksize, session, profiler, progress, guard)
+            with profiling.stage("dataframe"):
+                df = tables.dataframe()
+            df.attrs["file_count"] = tables.project.file_count
+            # Ringkasan sudah dihitung oleh metric_tables, jadi ini tidak mem-parse ulang
+            summaries, parse_count = self.summaries(workers, chunksize, cache, guard=guard)
+            df.attrs["parse_count"] = parse_count
+            df.attrs["method_count"] = tables.project.method_count
+            df.attrs["skipped_count"] = sum(1 for summary in summaries if summary.skipped is not None)
+            df.attrs["duplicate_count"] = sum(1 for summary in summaries if summary.duplicate_of is not None)
+            if session is not None:
+                df.attrs["cache"] = session.stats()
+            return df
+        return self._report(("class_metrics", guard.key() if guard is not None else None), compute, profiler)
+
+    def duplicate_report(self):
+        """Share of byte-identical files; each copy is analyzed once and its rows fanned out"""
+        return self._report("duplicates", lambda: duplicate_report(self.files))
+
+    def summary_report(self, profiler=None):
+        """analyze_kotlin_files result (Summary and Detailed pages)"""
+        return self._report("summary", lambda: analyze_kotlin_source_files(self.kotlin_files), profiler)
+
+    def complexity_report(self, profiler=None):
+        return self._report("complexity", lambda: calculate_complexity_report_source_files(self.kotlin_files),
+                            profiler)
+
+    def function_report(self, project_name, cache=None, profiler=None, progress=None):
+        """
+        (export.CSVSpool of the per-function rows, cache stats) of the Download
+        Report page. The rows go straight from the analyzer into the spool, so
+        the model never holds them. progress(done, total, spool) is called after
+        each file.
+        """
+        def compute():
+            session = cache.session() if cache is not None else None
+            files = self.kotlin_files
+            spool = CSVSpool(PER_FUNCTION_COLUMNS)
+            on_file = (lambda done: progress(done, len(files), spool)) if progress is not None else None
+            with profiling.stage("analyze_kotlin_files_per_function"):
+                spool.extend(iter_source_files_per_function(files, project_name, session, on_file))
+            return spool, session.stats() if session is not None else None
+        return self._report(("functions", project_name), compute, profiler)
@@ -0,0 +1,635 @@
+import os
+import re
+from datetime import datetime
+from io import StringIO
+
+from . import lexer, profiling
+from .cache import DEFAULT_CACHE_PATH, MetricsCache, metrics_version
+from .lexer import (
+    IDENTIFIER,
+    OPERATOR,
+    code_tokens,
+    is_keyword,
+    package_name,
+    tokenize,
+    tokens_by_line,
+)
+from .sources import SourceFile, iter_directory_sources, iter_zip_sources
+
+
+def analyze_kotlin_files(directory, source_filter=None):
+    # Menganalisis semua file .kt (Kotlin) di dalam direktori; source_filter (filters.SourceFilter) memangkas walk
+    return analyze_kotlin_sources(iter_directory_sources(directory, (".kt",), source_filter))
+
+
+def analyze_kotlin_sources(sources):
+    # Menganalisis pasangan (nama file, isi file) dari direktori atau arsip ZIP
+    return analyze_kotlin_source_files(SourceFile(name, data) for name, data in sources)
+
+
+@profiling.timed("analyze_kotlin_files")
+def analyze_kotlin_source_files(files):
+    # Inisialisasi variabel untuk menghitung jumlah file, kelas, fungsi, properti, dan paket
+    file_count = 0
+    class_count = 0
+    function_count = 0
+    property_count = 0
+    packages = set()  # Set untuk menyimpan nama-nama paket
+    package_dict = {}  # Dictionary untuk menyimpan detail dari setiap paket
+
+    # Memproses setiap SourceFile; isi dan token file dibaca sekali dan dipakai bersama laporan lain
+    for source_file in files:
+        file_count += 1
+        file = os.path.basename(source_file.name)
+
+        # Cari kelas, fungsi, dan properti dari token (bukan dari string/komentar)
+        tokens = code_tokens(source_file.tokens)
+        found_classes = find_declarations(tokens, ("class",))
+        found_functions = find_declarations(tokens, ("fun",))
+        found_properties = find_declarations(tokens, ("val", "var"))
+
+        # Memperbarui jumlah total kelas, fungsi, dan properti
+        class_count += len(found_classes)
+        function_count += len(found_functions)
+        property_count += len(found_properties)
+
+        # Menemukan nama paket dalam file (jika ada)
+        package = package_name(tokens) or "default"
+        packages.add(package)  # Menambahkan paket ke dalam set
+
+        # Jika paket belum ada di dalam dictionary, inisialisasi entri baru
+        if package not in package_dict:
+            package_dict[package] = {
+                "files": [],
+                "classes": [],
+                "functions": [],
+                "properties": [],
+            }
+
+        # Menambahkan informasi file, kelas, fungsi, dan properti ke dictionary paket
+        package_dict[package]["files"].append(file)
+        package_dict[package]["classes"].extend(found_classes)
+        package_dict[package]["functions"].extend(found_functions)
+        package_dict[package]["properties"].extend(found_properties)
+
+    # Mengembalikan hasil analisis dalam bentuk dictionary
+    return {
+        "number of files": file_count,  # Total file Kotlin yang dianalisis
+        "number of classes": class_count,  # Total kelas yang ditemukan
+        "number of functions": function_count,  # Total fungsi yang ditemukan
+        "number of properties": property_count,  # Total properti yang ditemukan
+        "number of packages": len(packages),  # Total paket yang ditemukan
+        "Packages": package_dict,  # Dictionary yang berisi detail paket, file, kelas, dll.
+    }
+
+
+# # Fungsi untuk memecah konten file menjadi per fungsi
+# def extract_function_content(content, function_name):
+#     # Regex untuk mengekstrak isi fungsi dari nama fungsi yang diberikan
+#     function_regex = rf"fun\s+{function_name}\s*\(.*?\)\s*{{(.*?)}}"
+#     match = re.search(function_regex, content, re.DOTALL)
+#     if match:
+#         return match.group(1)  # Mengembalikan isi dari fungsi
+#     return ""
+
+
+def extract_function_content(content, function_name):
+    # Mencari fungsi dengan nama tertentu
+    start_idx = content.find(f"fun {function_name}(")
+    if start_idx == -1:
+        return ""
+
+    # Menemukan posisi kurung kurawal pertama
+    start_idx = content.find("{", start_idx)
+    if start_idx == -1:
+        return ""
+
+    # Stack untuk melacak kurung kurawal bersarang
+    stack = []
+    function_body = []
+
+    # Memulai pemrosesan dari posisi kurung pertama
+    for idx, char in enumerate(content[start_idx:], start=start_idx):
+        if char == "{":
+            stack.append("{")
+        elif char == "}":
+            stack.pop()
+
+        # Menambahkan karakter ke body fungsi jika stack tidak kosong
+        function_body.append(char)
+
+        # Ketika stack kosong, kita sudah sampai akhir fungsi
+        if not stack:
+            break
+
+    return "".join(function_body).strip()
+
+
+# # Fungsi untuk menghitung NOLV_METHOD (jumlah variabel lokal)
+# def calculate_nolv(function_content):
+#     # Mencari semua deklarasi variabel lokal yang menggunakan 'val' atau 'var'
+#     local_variables = re.findall(r"\b(val|var)\s+\w+", function_content)
+#     return len(local_variables)
+
+
+# # Fungsi untuk menghitung NOLV_METHOD (jumlah variabel lokal)
+# def calculate_nolv(function_content):
+#     # Mencari semua deklarasi variabel lokal yang menggunakan 'val' atau 'var'
+#     # serta variabel yang langsung diinstansiasi dengan objek.
+#     local_variables = re.findall(
+#         r"\b(?:val|var)\s+\w+|(?<!val|var)\s+\w+\s*=\s*[\w\.]+\s*\(.*?\)",
+#         function_content,
+#     )
+#     return len(local_variables)
+
+
+# # Fungsi untuk menghitung NOLV_METHOD (jumlah variabel lokal)
+# def calculate_nolv(function_content):
+#     # Mencari semua deklarasi variabel lokal yang menggunakan 'val' atau 'var'
+#     # serta variabel yang diinstansiasi dengan objek (misalnya BatteryFragment())
+#     local_variables = re.findall(
+#         r"\b(?:val|var)\s+\w+\s*=\s*.*?|\b(?:val|var)\s+\w+|\w+\s*=\s*\w+\s*\(.*?\)",
+#         function_content,
+#     )
+#     return len(local_variables)
+
+
+def calculate_nolv(function_content):
+    local_variables = set()
+
+    # Memeriksa setiap baris kode (tanpa komentar) untuk menemukan deklarasi variabel lokal
+    for tokens in tokens_by_line(tokenize(function_content)).values():
+        # Mencari 'val' atau 'var' di awal baris yang diikuti inisialisasi '='
+        if is_keyword(tokens[0], ("val", "var")) and any(
+            token.kind == OPERATOR and token.value == "=" for token in tokens
+        ):
+            # Nama variabel adalah identifier pertama setelah 'val'/'var'
+            for token in tokens[1:]:
+                if token.kind == IDENTIFIER:
+                    local_variables.add(token.value)
+                    break
+
+    return len(local_variables)
+
+
+# Kata kunci cabang logis untuk CYCLO_METHOD
+BRANCH_KEYWORDS = ("if", "else", "for", "while", "when", "switch", "case", "try", "catch")
+
+
+# Fungsi untuk menghitung CYCLO_METHOD (kompleksitas siklomatik)
+def calculate_cyclomatic_complexity(function_content):
+    # Menghitung token kata kunci kontrol alur; kata kunci di dalam string dan komentar diabaikan
+    logical_branches = [
+        token
+        for token in tokenize(function_content)
+        if is_keyword(token, BRANCH_KEYWORDS)
+    ]
+    return len(logical_branches) + 1  # +1 untuk fungsi itu sendiri
+
+
+# Fungsi untuk menghitung NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD
+def count_non_default_constructors(content, class_name):
+    # Mencari konstruktor dalam kelas dengan nama class_name
+    constructors = re.findall(
+        rf"class\s+{class_name}\s*.*?\((.*?)\)", content, re.DOTALL
+    )
+    non_default_constructors = 0  # Inisialisasi penghitung konstruktor non-default
+    for constructor in constructors:
+        # Jika ada parameter dalam konstruktor, itu berarti konstruktor non-default
+        if constructor and not re.match(r"\s*\)", constructor):
+            non_default_constructors += 1
+    return non_default_constructors  # Mengembalikan jumlah konstruktor non-default
+
+
+# Fungsi untuk mencari deklarasi "<kata kunci> <nama>" dari token, misalnya "class Foo"
+def find_declarations(tokens, keywords):
+    found = []
+    for previous, token, name in zip([None] + tokens, tokens, tokens[1:]):
+        # "::class" adalah referensi kelas, bukan deklarasi
+        if previous is not None and previous.value == "::":
+            continue
+        if is_keyword(token, keywords) and name.kind == IDENTIFIER:
+            found.append(f"{token.value} {name.value}")
+    return found
+
+
+# Fungsi untuk mencari semua fungsi dalam konten file Kotlin
+def find_functions(content, tokens=None):
+    # Mengembalikan semua nama fungsi yang ditemukan dalam konten
+    tokens = code_tokens(tokenize(content)) if tokens is None else tokens
+    return [
+        name.value
+        for token, name, paren in zip(tokens, tokens[1:], tokens[2:])
+        if is_keyword(token, ("fun",)) and name.kind == IDENTIFIER and paren.value == "("
+    ]
+
+
+# Fungsi untuk mencari semua kelas dalam konten file Kotlin
+def find_classes(content, tokens=None):
+    # Mengembalikan semua nama kelas yang ditemukan dalam konten
+    tokens = code_tokens(tokenize(content)) if tokens is None else tokens
+    return [
+        declaration.split(" ", 1)[1]
+        for declaration in find_declarations(tokens, ("class",))
+    ]
+
+
+# Kata kunci yang memulai deklarasi baru; membatalkan deklarasi kelas/fungsi yang belum punya body
+DECLARATION_KEYWORDS = ("class", "interface", "object", "fun", "val", "var", "init", "typealias")
+# Token yang membuat expression body (fun f() = ...) berlanjut ke baris berikutnya
+CONTINUES_BEFORE = (".", "?.", "?:", "&&", "||", "else", ")", "]")
+CONTINUES_AFTER = ("=", ".", "?.", "?:", "&&", "||", "+", "-", "*", "/", "%", "->", ",", "(", "[", "!", "else", "return")
+
+
+# Fungsi untuk membangun indeks span kelas dan fungsi dalam satu kali pencocokan kurung kurawal
+def index_class_spans(content, tokens, functions=None):
+    """
+    Walk the code tokens of a file once, matching braces, and return one dict per
+    class in source order: {"name", "kind", "functions"}. functions holds
+    [name, body] pairs for every function whose innermost enclosing class is that
+    class. Bodies are sliced from content by offset: "{...}" for block bodies,
+    the expression after "=" for expression bodies.
+    When a functions list is given, every function is also appended to it once,
+    in source order, as (owner, [name, body]). owner is the innermost enclosing
+    class, named object or interface ({"name", "kind"}; companion objects belong
+    to their class), or None for a top-level function.
+    """
+    classes = []
+    # Satu entri per '{' yang terbuka: (kelas terdalam, pemilik terdalam, fungsi, offset '{', kedalaman kurung di luar)
+    scopes = []
+    owner_class = None  # Kelas terdalam yang sedang terbuka
+    owner = None  # Kelas, object bernama atau interface terdalam yang sedang terbuka
+    parens = 0  # Kedalaman '(' dan '[' di dalam scope saat ini
+    pending = None  # Deklarasi kelas/fungsi yang belum menemukan body-nya
+    expression = None  # Expression body yang sedang dibaca: (fungsi, offset awal, kedalaman scope)
+    previous = None
+
+    for i, token in enumerate(tokens):
+        value = token.value if token.kind == OPERATOR else None
+        depth = len(scopes)
+        at_level = parens == 0
+        starts_declaration = is_keyword(token, DECLARATION_KEYWORDS)
+
+        # Expression body berakhir di baris baru, kecuali ekspresinya jelas berlanjut
+        if expression is not None and depth == expression[2] and at_level and (
+            value == "}"
+            or starts_declaration
+            or (
+                token.line > previous.line
+                and token.value not in CONTINUES_BEFORE
+                and previous.value not in CONTINUES_AFTER
+            )
+        ):
+            function, start, _ = expression
+            function[1] = content[start:previous.end].strip()
+            expression = None
+
+        # Deklarasi tanpa body (abstract, interface, kelas tanpa '{') dibatalkan oleh deklarasi berikutnya
+        if pending is not None and depth == pending["depth"] and at_level and (
+            value == "}" or starts_declaration
+        ):
+            pending = None
+
+        at_pending = pending is not None and depth == pending["depth"] and at_level
+
+        if value in ("(", "["):
+            parens += 1
+        elif value in (")", "]"):
+            parens = max(parens - 1, 0)
+        elif value == "{":
+            function = None
+            if at_pending:
+                if pending["kind"] == "class":
+                    owner_class = owner = pending["record"]
+                elif pending["kind"] == "container":
+                    owner = pending["record"]
+                else:
+                    function = pending["record"]
+                pending = None
+            scopes.append((owner_class, owner, function, token.start, parens))
+            parens = 0
+        elif value == "}":
+            if scopes:
+                _, _, function, start, parens = scopes.pop()
+                if function is not None:
+                    function[1] = content[start:token.end]
+                owner_class, owner = scopes[-1][:2] if scopes else (None, None)
+        elif value == "=" and at_pending and pending["kind"] == "fun":
+            if i + 1 < len(tokens):
+                expression = (pending["record"], tokens[i + 1].start, depth)
+            pending = None
+        elif is_keyword(token, ("class", "fun", "object", "interface")) and i + 1 < len(tokens) and (
+            previous is None or previous.value not in ("::", "companion")
+        ):
+            name = tokens[i + 1]
+            if name.kind == IDENTIFIER and token.value in ("object", "interface"):
+                # Object bernama dan interface menjadi pemilik fungsi di dalamnya, tetapi bukan kelas
+                pending = {"kind": "container", "record": {"name": name.value, "kind": token.value}, "depth": depth}
+            elif name.kind == IDENTIFIER and token.value == "class":
+                record = {"name": name.value, "kind": "class", "functions": []}
+                classes.append(record)
+                pending = {"kind": "class", "record": record, "depth": depth}
+            elif name.kind == IDENTIFIER and i + 2 < len(tokens) and tokens[i + 2].value == "(":
+                function = [name.value, ""]
+                if owner_class is not None:
+                    owner_class["functions"].append(function)
+                if functions is not None:
+                    functions.append((owner, function))
+                pending = {"kind": "fun", "record": function, "depth": depth}
+        previous = token
+
+    if expression is not None:
+        function, start, _ = expression
+        function[1] = content[start:previous.end].strip()
+    return classes
+
+
+# Fungsi untuk menghitung metrik per function dari isi satu file Kotlin
+@profiling.timed("per-function metrics")
+def analyze_kotlin_file_functions(content, tokens=None):
+    # Tokenisasi file sekali, kecuali token sudah tersedia dari SourceFile
+    tokens = code_tokens(tokenize(content) if tokens is None else tokens)
+
+    # Mencari nama paket dalam file Kotlin
+    package = package_name(tokens) or "default"  # Menentukan paket
+
+    rows = []  # List untuk menyimpan hasil analisis file ini
+    # Satu kali pencocokan kurung kurawal memberi setiap fungsi sekali, bersama pemilik terdalamnya
+    functions = []
+    index_class_spans(content, tokens, functions)
+    constructors = {}  # Jumlah konstruktor non-default per nama, dihitung sekali per kelas
+    for owner, (function, function_content) in functions:
+        # Fungsi top-level tidak punya kelas
+        class_name = owner["name"] if owner is not None else "None"
+        if class_name not in constructors:
+            constructors[class_name] = count_non_default_constructors(content, class_name)
+        non_default_constructors = constructors[class_name]
+
+        # Menghitung metrik untuk setiap fungsi
+        nolv = calculate_nolv(function_content)
+        cyclo = calculate_cyclomatic_complexity(function_content)
+
+        # Menyimpan hasil analisis dalam bentuk dictionary
+        rows.append(
+            {
+                "Package": package,
+                "Class": class_name,
+                "Function": function,
+                # "FunctionContent": function_content,  # Menambahkan kolom baru berisi isi fungsi
+                "NOLV_METHOD": nolv,
+                "CYCLO_METHOD": cyclo,
+                "NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD": non_default_constructors,
+            }
+        )
+    return rows
+
+
+# Cache metrik per function, versinya mengikuti kode fungsi-fungsi metrik di bawah ini
+def per_function_metrics_cache(path=DEFAULT_CACHE_PATH):
+    return MetricsCache(
+        "per_function",
+        metrics_version(
+            analyze_kotlin_file_functions,
+            index_class_spans,
+            calculate_nolv,
+            calculate_cyclomatic_complexity,
+            lexer,
+        ),
+        path,
+    )
+
+
+# Fungsi untuk membaca zip dan mengolah file Kotlin secara per function
+def analyze_kotlin_files_per_function(zip_file, project_name, cache=None, source_filter=None):
+    # Membaca file .kt langsung dari arsip ZIP tanpa mengekstraknya ke disk
+    return analyze_sources_per_function(
+        iter_zip_sources(zip_file, (".kt",), source_filter), project_name, cache
+    )
+
+
+# Kolom laporan per function, dalam urutan yang dipakai CSV
+PER_FUNCTION_COLUMNS = (
+    "Extraction Date",
+    "Project",
+    "Package",
+    "Class",
+    "Function",
+    "NOLV_METHOD",
+    "CYCLO_METHOD",
+    "NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD",
+)
+
+
+# Fungsi untuk mengolah pasangan (nama file, isi file) secara per function
+def analyze_sources_per_function(sources, project_name, cache=None):
+    return analyze_source_files_per_function(
+        (SourceFile(name, data) for name, data in sources), project_name, cache
+    )
+
+
+# Sama seperti analyze_sources_per_function, tetapi baris dihasilkan satu per satu
+def iter_sources_per_function(sources, project_name, cache=None):
+    return iter_source_files_per_function(
+        (SourceFile(name, data) for name, data in sources), project_name, cache
+    )
+
+
+# Fungsi untuk mengolah SourceFile secara per function
+# progress(jumlah file selesai, baris sejauh ini) dipanggil setiap satu file selesai
+@profiling.timed("analyze_kotlin_files_per_function")
+def analyze_source_files_per_function(files, project_name, cache=None, progress=None):
+    # Mengembalikan hasil analisis sebagai list of dictionaries
+    results = []
+    on_file = (lambda done: progress(done, results)) if progress is not None else None
+    results.extend(iter_source_files_per_function(files, project_name, cache, on_file))
+    return results
+
+
+# Generator baris per function: file dibaca dan dianalisis saat barisnya diminta,
+# sehingga penulis CSV tidak perlu menyimpan seluruh hasil di memori.
+# Salinan identik dari file sebelumnya memakai baris file itu tanpa dianalisis ulang
+def iter_source_files_per_function(files, project_name, cache=None, progress=None):
+    extraction_date = datetime.now().strftime(
+        "%Y-%m-%d"
+    )  # Mendapatkan tanggal ekstraksi
+    seen = {}  # {digest: baris per function}; hanya baris yang disimpan, bukan isi file
+
+    for done, source_file in enumerate(files, 1):
+        # File dengan isi yang sama tidak perlu dianalisis ulang
+        with profiling.stage("content hash"):
+            digest = source_file.digest
+        rows = seen.get(digest)
+        if rows is not None:
+            profiling.count("duplicate files")
+        elif cache is not None:
+            with profiling.stage("cache lookup"):
+                rows = cache.get(digest)
+        if rows is None:
+            rows = analyze_kotlin_file_functions(source_file.text, source_file.tokens)
+            if cache is not None:
+                with profiling.stage("cache store"):
+                    cache.put(digest, rows)
+        seen[digest] = rows
+
+        for row in rows:
+            yield {"Extraction Date": extraction_date, "Project": project_name, **row}
+        # Dipanggil setelah baris terakhir file ini diambil oleh pemanggil
+        if progress is not None:
+            progress(done)
+
+
+# Kata kunci struktur kontrol untuk kompleksitas kognitif dan MCC per baris
+CONTROL_KEYWORDS = (
+    "if",  # Percabangan jika
+    "else",  # Percabangan lain
+    "for",  # Perulangan untuk
+    "while",  # Perulangan selama
+    "do",  # Perulangan do-while
+    "when",  # Percabangan ketika
+    "switch",  # Percabangan switch
+    "case",  # Kasus dalam switch
+    "try",  # Blok percobaan
+    "catch",  # Menangkap exception
+)
+
+
+# Baris boleh berupa string atau daftar token yang sudah dihasilkan lexer
+def line_tokens(line):
+    return tokenize(line) if isinstance(line, str) else line
+
+
+def calculate_cognitive_complexity(line):
+    # Logika untuk menghitung kompleksitas kognitif
+    complexity = 0
+    # Memeriksa apakah ada struktur kontrol dalam baris
+    if any(is_keyword(token, CONTROL_KEYWORDS) for token in line_tokens(line)):
+        complexity += 1  # Tingkatkan kompleksitas untuk setiap struktur kontrol
+    return complexity
+
+
+def calculate_mcc(line):
+    # Logika untuk menghitung kompleksitas siklomatik
+    count = 0
+    # Memeriksa apakah ada struktur kontrol dalam baris
+    if any(is_keyword(token, CONTROL_KEYWORDS) for token in line_tokens(line)):
+        count += 1  # Hitung cabang
+    return count
+
+
+def identify_code_smells(lines):
+    # Fungsi untuk mengidentifikasi code smells
+    smells = 0
+    # Memeriksa setiap baris dalam kode
+    for line in lines:
+        # Contoh smell: metode yang terlalu panjang
+        if (
+            len(line.strip()) > 100
+        ):  # Menghitung jika panjang baris lebih dari 100 karakter
+            smells += 1  # Tingkatkan jumlah code smells
+    return smells
+
+
+# Fungsi untuk menghitung laporan kompleksitas
+def calculate_complexity_report(directory, source_filter=None):
+    # Menghitung laporan kompleksitas untuk semua file .kt di dalam direktori
+    return calculate_complexity_report_sources(iter_directory_sources(directory, (".kt",), source_filter))
+
+
+def calculate_complexity_report_sources(sources):
+    return calculate_complexity_report_source_files(
+        SourceFile(name, data) for name, data in sources
+    )
+
+
+@profiling.timed("calculate_complexity_report")
+def calculate_complexity_report_source_files(files):
+    # Hitungan per file dijumlahkan menjadi satu laporan
+    return complexity_report_from_counts(complexity_counts(source_file) for source_file in files)
+
+
+# Hitungan kompleksitas satu SourceFile, sebelum dijumlahkan dengan file lain
+def complexity_counts(source_file):
+    loc = 0  # Total baris kode
+    sloc = 0  # Total baris kode sumber
+    lloc = 0  # Total baris logis
+    cloc = 0  # Total baris komentar
+    cognitive_complexity = 0  # Kompleksitas kognitif
+    mcc_count = 0  # Hitungan kompleksitas siklomatik
+
+    lines = StringIO(source_file.text).readlines()  # Membaca semua baris dalam file
+    tokens_per_line = tokens_by_line(source_file.tokens)  # Token file dipakai bersama laporan lain
+
+    # Menghitung total baris kode (loc)
+    loc += len(lines)
+
+    # Menghitung kode sumber (sloc), baris logis (lloc), dan komentar (cloc)
+    for line_number, line in enumerate(lines, start=1):
+        stripped_line = line.strip()  # Menghapus spasi di awal dan akhir
+        if stripped_line.startswith("//"):
+            cloc += 1  # Menghitung baris komentar
+        elif stripped_line != "":
+            sloc += 1  # Menghitung baris sumber
+            lloc += 1  # Menghitung setiap baris non-kosong sebagai baris logis
+
+            # Menghitung kompleksitas kognitif dan MCC
+            code_tokens_on_line = tokens_per_line.get(line_number, [])
+            cognitive_complexity += calculate_cognitive_complexity(
+                code_tokens_on_line
+            )
+            mcc_count += calculate_mcc(code_tokens_on_line)
+
+    return {
+        "loc": loc,
+        "sloc": sloc,
+        "lloc": lloc,
+        "cloc": cloc,
+        "cognitive_complexity": cognitive_complexity,
+        "mcc": mcc_count,
+        "code_smells": identify_code_smells(lines),  # Menghitung total code smells
+    }
+
+
+# Menjumlahkan hitungan per file dan menghitung rasio laporan kompleksitas
+def complexity_report_from_counts(counts):
+    totals = dict.fromkeys(COMPLEXITY_COUNTS, 0)
+    for file_counts in counts:
+        for key in COMPLEXITY_COUNTS:
+            totals[key] += file_counts[key]
+    return complexity_report_from_totals(totals)
+
+
+COMPLEXITY_COUNTS = ("loc", "sloc", "lloc", "cloc", "cognitive_complexity", "mcc", "code_smells")
+
+
+def complexity_report_from_totals(totals):
+    lloc = totals["lloc"]
+    sloc = totals["sloc"]
+    comment_ratio = 0  # Rasio komentar
+    # Tanpa baris logis (misalnya proyek tanpa file .kt) rasio per 1000 LLOC bernilai 0
+    mcc_per_1000_lloc = 0
+    code_smells_per_1000_lloc = 0
+
+    # Menghitung metrik
+    if lloc > 0:
+        comment_ratio = (
+            (totals["cloc"] / sloc) * 100 if sloc > 0 else 0
+        )  # Menghitung rasio komentar
+        mcc_per_1000_lloc = (
+            (totals["mcc"] / (lloc / 1000)) if lloc > 0 else 0
+        )  # MCC per 1000 baris logis
+        code_smells_per_1000_lloc = (
+            (totals["code_smells"] / (lloc / 1000)) if lloc > 0 else 0
+        )  # Code smells per 1000 baris logis
+
+    # Mengembalikan hasil laporan kompleksitas
+    return {
+        "loc": totals["loc"],  # Total baris kode
+        "sloc": sloc,  # Total baris sumber
+        "lloc": lloc,  # Total baris logis
+        "cloc": totals["cloc"],  # Total baris komentar
+        "cognitive_complexity": totals["cognitive_complexity"],  # Kompleksitas kognitif
+        "code_smells": totals["code_smells"],  # Total code smells
+        "comment_ratio": comment_ratio,  # Rasio komentar
+        "mcc_per_1000_lloc": mcc_per_1000_lloc,  # MCC per 1000 baris logis
+        "code_smells_per_1000_lloc": code_smells_per_1000_lloc,  # Code smells per 1000 baris logis
+    }
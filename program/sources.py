@@ -0,0 +1,169 @@
+import os
+import zipfile
+from io import BytesIO
+
+from .cache import content_hash
+from .lexer import tokenize
+from .workspace import Workspace
+
+KOTLIN_EXTENSIONS = (".kt", ".kts")
+
+
+def decode_source(data):
+    """Decode source bytes the way open(path, "r", encoding="utf-8") does, including newline translation"""
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+class SourceFile:
+    """
+    One source file, read once. Its text, token stream and content hash are
+    computed on first use and kept, so every report over the same file shares them.
+    """
+    __slots__ = ("name", "data", "_text", "_tokens", "_digest")
+
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+        self._text = None
+        self._tokens = None
+        self._digest = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = decode_source(self.data)
+        return self._text
+
+    @property
+    def tokens(self):
+        """All tokens of the file, comments included (see lexer.tokenize)"""
+        if self._tokens is None:
+            self._tokens = tokenize(self.text)
+        return self._tokens
+
+    @property
+    def digest(self):
+        if self._digest is None:
+            self._digest = content_hash(self.data)
+        return self._digest
+
+
+def source_files(sources):
+    """SourceFile objects for (name, bytes) pairs"""
+    return [SourceFile(name, data) for name, data in sources]
+
+
+def duplicate_report(files):
+    """
+    Byte-identical SourceFiles of one analysis. Counts and shares of the copies
+    (every file after the first with the same content) by files and bytes, and
+    one group per duplicated content, the most duplicated bytes first.
+    """
+    groups = {}
+    for source_file in files:
+        groups.setdefault(source_file.digest, []).append(source_file)
+    file_count = sum(len(group) for group in groups.values())
+    total_bytes = sum(len(group[0].data) * len(group) for group in groups.values())
+    duplicated = sorted((group for group in groups.values() if len(group) > 1),
+                        key=lambda group: (-(len(group) - 1) * len(group[0].data), group[0].name))
+    duplicate_files = sum(len(group) - 1 for group in duplicated)
+    duplicate_bytes = sum((len(group) - 1) * len(group[0].data) for group in duplicated)
+    return {
+        "files": file_count,
+        "unique files": len(groups),
+        "duplicate files": duplicate_files,
+        "duplicate share": duplicate_files / file_count if file_count else 0.0,
+        "duplicate bytes": duplicate_bytes,
+        "duplicate byte share": duplicate_bytes / total_bytes if total_bytes else 0.0,
+        "groups": [{"Copies": len(group), "Bytes": len(group[0].data),
+                    "Files": [source_file.name for source_file in group]} for group in duplicated],
+    }
+
+
+def _as_buffer(archive):
+    """Accept a path, raw bytes, a Streamlit UploadedFile or any binary file object"""
+    if isinstance(archive, (bytes, bytearray, memoryview)):
+        return BytesIO(archive)
+    if hasattr(archive, "getbuffer"):
+        return BytesIO(archive.getbuffer())
+    return archive
+
+
+def iter_zip_sources(archive, extensions=KOTLIN_EXTENSIONS, source_filter=None):
+    """
+    Yield (member name, bytes) for the Kotlin members of a ZIP archive.
+    Members are filtered by name and read straight from the archive stream;
+    nothing is written to disk. A filters.SourceFilter drops members by name
+    and size from the listing, before they are decompressed.
+    """
+    with zipfile.ZipFile(_as_buffer(archive), "r") as zip_ref:
+        for info in zip_ref.infolist():
+            if info.is_dir() or not info.filename.endswith(extensions):
+                continue
+            if source_filter is None:
+                yield info.filename, zip_ref.read(info)
+            elif not source_filter.skip_path(info.filename, info.file_size):
+                data = source_filter.read(zip_ref.open(info), info.file_size)
+                if data is not None:
+                    yield info.filename, data
+
+
+def iter_directory_paths(directory, extensions=KOTLIN_EXTENSIONS, source_filter=None):
+    """
+    Yield the paths of the Kotlin files below a directory, in os.walk order.
+    Directories excluded by source_filter are pruned from the walk, so their
+    contents are never listed.
+    """
+    for root, dirs, files in os.walk(directory):
+        if source_filter is not None:
+            relative = os.path.relpath(root, directory).replace(os.sep, "/")
+            prefix = "" if relative == "." else relative + "/"
+            dirs[:] = [name for name in dirs if not source_filter.prune_directory(prefix + name)]
+        for file in files:
+            if file.endswith(extensions):
+                file_path = os.path.join(root, file)
+                if source_filter is None or not source_filter.skip_path(prefix + file, os.path.getsize(file_path)):
+                    yield file_path
+
+
+def iter_directory_sources(directory, extensions=KOTLIN_EXTENSIONS, source_filter=None):
+    """Yield (path, bytes) for the Kotlin files below a directory, in os.walk order"""
+    for file_path in iter_directory_paths(directory, extensions, source_filter):
+        if source_filter is None:
+            with open(file_path, "rb") as f:
+                yield file_path, f.read()
+        else:
+            data = source_filter.read(open(file_path, "rb"), os.path.getsize(file_path))
+            if data is not None:
+                yield file_path, data
+
+
+def iter_archive_sources(archive, name=None, extensions=KOTLIN_EXTENSIONS, source_filter=None):
+    """
+    Yield (name, bytes) for the Kotlin sources of an uploaded archive.
+    ZIP archives are read in memory. Other formats (RAR) cannot be streamed with
+    the standard library, so they are extracted by patool into a per-request
+    Workspace that is removed as soon as iteration ends; a source_filter then
+    prunes the walk over the extracted files.
+    """
+    if isinstance(archive, (str, os.PathLike)):
+        with open(archive, "rb") as f:
+            yield from iter_archive_sources(f, name or os.path.basename(archive), extensions, source_filter)
+        return
+
+    buffer = _as_buffer(archive)
+    if zipfile.is_zipfile(buffer):
+        buffer.seek(0)
+        yield from iter_zip_sources(buffer, extensions, source_filter)
+        return
+
+    import patoolib
+
+    buffer.seek(0)
+    name = name or getattr(archive, "name", None) or "archive.rar"
+    with Workspace() as workspace:
+        archive_path = workspace.write(name, buffer.read())
+        outdir = workspace.directory("extracted")
+        patoolib.extract_archive(archive_path, outdir=outdir, verbosity=-1)
+        for file_path, data in iter_directory_sources(outdir, extensions, source_filter):
+            yield os.path.relpath(file_path, outdir), data
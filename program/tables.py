@@ -0,0 +1,292 @@
+"""
+Normalized form of the extract_and_parse result.
+
+The wide table repeats the project counters (NOI, NOM, NOMNAMM) on every row,
+the class metrics on every method row and NOCS_package on every row of a
+package. MetricTables keeps each value once: one project record, one record
+per package and per class (__slots__ objects) and a method table of typed
+arrays with one entry per wide row. WOC is not stored; it is the method CC
+divided by the total CC of its class. dataframe() joins the tables back into
+the wide DataFrame, with the same rows, columns and values as
+pd.DataFrame(controller.summaries_to_rows(summaries)).
+
+Building the tables needs only the standard library; numpy and pandas are
+imported when a DataFrame is requested.
+"""
+from array import array
+
+BASE_COLUMNS = ("Package", "Class", "Method", "LOC", "Max Nesting", "CC", "WOC", "NOI", "NOM", "NOMNAMM",
+                "NOC_type", "WMC_type", "LCOM5", "WMCNAMM_type", "AMW_type", "NOCS_package")
+CLASS_METRICS = ("NOC_type", "WMC_type", "LCOM5", "WMCNAMM_type", "AMW_type")
+CLASS_ATTRIBUTES = ("noc_type", "wmc_type", "lcom5", "wmcnamm_type", "amw_type")
+
+
+class ProjectEntry:
+    __slots__ = ("noi", "nom", "nomnamm", "file_count", "method_count")
+
+    def __init__(self, noi=0, nom=0, nomnamm=0, file_count=0, method_count=0):
+        self.noi = noi
+        self.nom = nom
+        self.nomnamm = nomnamm
+        self.file_count = file_count
+        self.method_count = method_count
+
+
+class PackageEntry:
+    __slots__ = ("name", "nocs")
+
+    def __init__(self, name, nocs):
+        self.name = name
+        self.nocs = nocs
+
+
+class ClassEntry:
+    """
+    One class, or the placeholder "Unknown"/"Error" class of the rows of a file
+    without classes or that failed to parse. extra holds the values of extra
+    class calculators; total_cc is the sum of the CC of its methods (for WOC).
+    """
+    __slots__ = ("package", "name", "noc_type", "wmc_type", "lcom5", "wmcnamm_type", "amw_type", "extra",
+                 "total_cc")
+
+    def __init__(self, package, name, noc_type=0, wmc_type=0, lcom5=0, wmcnamm_type=0, amw_type=0, extra=None):
+        self.package = package  # Indeks di MetricTables.packages
+        self.name = name
+        self.noc_type = noc_type
+        self.wmc_type = wmc_type
+        self.lcom5 = lcom5
+        self.wmcnamm_type = wmcnamm_type
+        self.amw_type = amw_type
+        self.extra = extra if extra is not None else {}  # Dict dari ClassSummary dipakai bersama, tidak disalin
+        self.total_cc = 0
+
+
+class MethodTable:
+    """
+    One entry per wide row. Numbers live in typed arrays; the rare error
+    messages, skip reasons and extra method values are kept per row index.
+    """
+    __slots__ = ("classes", "names", "loc", "max_nesting", "cc", "errors", "skipped", "extra")
+
+    def __init__(self):
+        self.classes = array("q")  # Indeks di MetricTables.classes; "q" selalu 8 byte, sama dengan np.int64
+        self.names = []
+        self.loc = array("q")
+        self.max_nesting = array("q")
+        self.cc = array("q")
+        self.errors = {}  # {row: pesan Error}
+        self.skipped = {}  # {row: alasan file tidak di-parse}
+        self.extra = {}  # {row: {kolom: nilai}}
+
+    def append(self, class_id, name, loc=0, max_nesting=0, cc=0, error=None, extra=None):
+        row = len(self.names)
+        self.classes.append(class_id)
+        self.names.append(name)
+        self.loc.append(loc)
+        self.max_nesting.append(max_nesting)
+        self.cc.append(cc)
+        if error is not None:
+            self.errors[row] = error
+        if extra:
+            self.extra[row] = extra
+
+    def __len__(self):
+        return len(self.names)
+
+
+class MetricTables:
+    """Project, package, class and method tables of one analysis"""
+
+    def __init__(self):
+        self.project = ProjectEntry()
+        self.packages = []
+        self.classes = []
+        self.methods = MethodTable()
+        self._package_ids = {}
+        self._unknown_classes = {}
+        self._error_class = None
+        self._has_extra = False  # Ada nilai dari kalkulator tambahan
+
+    @classmethod
+    def from_summaries(cls, summaries, noi_count, nom_count, nomnamm_count, nocs_package_counts,
+                       inheritance_index):
+        """Tables of FileSummary objects joined with the project-wide values (see controller.summary_rows)"""
+        tables = cls()
+        tables.project = ProjectEntry(noi_count, nom_count, nomnamm_count)
+        for summary in summaries:
+            tables.add_summary(summary, nocs_package_counts, inheritance_index)
+        return tables
+
+    def _package(self, name, nocs):
+        package_id = self._package_ids.get(name)
+        if package_id is None:
+            package_id = self._package_ids[name] = len(self.packages)
+            self.packages.append(PackageEntry(name, nocs))
+        return package_id
+
+    def _add_class(self, record):
+        self.classes.append(record)
+        return len(self.classes) - 1
+
+    def _unknown_class(self, package_id):
+        class_id = self._unknown_classes.get(package_id)
+        if class_id is None:
+            class_id = self._unknown_classes[package_id] = self._add_class(ClassEntry(package_id, "Unknown"))
+        return class_id
+
+    def _error_class_id(self):
+        if self._error_class is None:
+            # Paket "Error" tersendiri, tidak digabung dengan paket Kotlin bernama Error
+            self.packages.append(PackageEntry("Error", 0))
+            self._error_class = self._add_class(ClassEntry(len(self.packages) - 1, "Error"))
+        return self._error_class
+
+    def add_summary(self, summary, nocs_package_counts, inheritance_index):
+        """Append the rows of one FileSummary, in the order of controller.summary_rows"""
+        start = len(self.methods)
+        self.project.file_count += 1
+        self._add_rows(summary, nocs_package_counts, inheritance_index)
+        if summary.skipped is not None:
+            for row in range(start, len(self.methods)):
+                self.methods.skipped[row] = summary.skipped
+
+    def _add_rows(self, summary, nocs_package_counts, inheritance_index):
+        methods = self.methods
+        if summary.error is not None:
+            methods.append(self._error_class_id(), "Error", error=summary.error)
+            return
+
+        package_name = summary.package if summary.package else "Unknown"
+        package_id = self._package(package_name, nocs_package_counts.get(package_name, 0))
+        if not summary.has_declarations:
+            methods.append(self._unknown_class(package_id), "None", error="No class declaration found")
+            return
+
+        for cls in summary.classes:
+            class_id = self._add_class(ClassEntry(
+                package_id, cls.name, inheritance_index.noc(cls.name, summary.package), cls.wmc_type, cls.lcom5,
+                cls.wmcnamm_type, cls.amw_type, cls.extra))
+            self._has_extra = self._has_extra or bool(cls.extra)
+            self.project.method_count += len(cls.methods)
+            if not cls.has_body:
+                methods.append(class_id, "None", error="Class has no body")
+                continue
+            self.classes[class_id].total_cc = sum(cc for _, cc, _, _ in cls.methods)
+            method_extra = cls.method_extra or [{}] * len(cls.methods)
+            for (name, cc, loc, max_nesting), extra in zip(cls.methods, method_extra):
+                methods.append(class_id, name, loc, max_nesting, cc, extra=extra)
+            if not cls.methods:
+                methods.append(class_id, "None", error="No functions found")
+
+        if not summary.classes:
+            methods.append(self._unknown_class(package_id), "None", error="No class declarations found")
+
+    def __len__(self):
+        return len(self.methods)
+
+    def columns(self):
+        """Wide column order: the first appearance of each key over the rows, like pd.DataFrame(rows)"""
+        methods = self.methods
+        columns = dict.fromkeys(BASE_COLUMNS)
+        if not self._has_extra and not methods.extra:
+            # Error berada sebelum Skipped di satu baris; selain itu baris pertamanya menentukan urutan
+            first = {column: (next(iter(rows)), order)
+                     for order, (column, rows) in enumerate((("Error", methods.errors), ("Skipped", methods.skipped)))
+                     if rows}
+            columns.update(dict.fromkeys(sorted(first, key=first.get)))
+            return list(columns)
+        # Kolom extra muncul di posisi baris pertamanya, jadi urutan baris perlu ditelusuri.
+        # Kelas "Unknown" dan "Error" tidak punya extra, sama seperti barisnya di summary_rows
+        for row in range(len(methods)):
+            columns.update(dict.fromkeys(self.classes[methods.classes[row]].extra))
+            if row in methods.extra:
+                columns.update(dict.fromkeys(methods.extra[row]))
+            if row in methods.errors:
+                columns["Error"] = None
+            if row in methods.skipped:
+                columns["Skipped"] = None
+        return list(columns)
+
+    def dataframe(self):
+        """The wide extract_and_parse DataFrame, joined from the tables"""
+        import numpy as np
+        import pandas as pd
+
+        methods = self.methods
+        rows = len(methods)
+        class_ids = np.frombuffer(methods.classes, dtype=np.int64) if rows else np.zeros(0, dtype=np.int64)
+
+        def class_column(values):
+            # Tipe kolom ditentukan dari nilainya seperti pd.DataFrame(rows): int, float, atau campuran
+            return pd.Series(values, dtype=object).infer_objects().to_numpy()[class_ids]
+
+        def int_column(values):
+            return np.frombuffer(values, dtype=np.int64) if rows else np.zeros(0, dtype=np.int64)
+
+        package_ids = np.array([record.package for record in self.classes], dtype=np.int64)[class_ids]
+        data = {
+            "Package": np.array([record.name for record in self.packages], dtype=object)[package_ids],
+            "Class": class_column([record.name for record in self.classes]),
+            "Method": np.array(methods.names, dtype=object),
+        }
+        loc = int_column(methods.loc)
+        if self._error_class is not None:
+            loc = loc.astype(object)
+            loc[class_ids == self._error_class] = "Error"
+        data["LOC"] = loc
+        data["Max Nesting"] = int_column(methods.max_nesting)
+        cc = data["CC"] = int_column(methods.cc)
+        totals = np.array([record.total_cc for record in self.classes], dtype=np.int64)[class_ids]
+        if (totals != 0).any():
+            # Sama dengan count_woc: cc / total CC kelas, 0 jika totalnya 0
+            data["WOC"] = np.where(totals != 0, cc / np.where(totals != 0, totals, 1), 0.0)
+        else:
+            data["WOC"] = np.zeros(rows, dtype=np.int64)
+        data["NOI"] = np.full(rows, self.project.noi, dtype=np.int64)
+        data["NOM"] = np.full(rows, self.project.nom, dtype=np.int64)
+        data["NOMNAMM"] = np.full(rows, self.project.nomnamm, dtype=np.int64)
+        for column, attribute in zip(CLASS_METRICS, CLASS_ATTRIBUTES):
+            data[column] = class_column([getattr(record, attribute) for record in self.classes])
+        data["NOCS_package"] = np.array([record.nocs for record in self.packages], dtype=np.int64)[package_ids]
+
+        for column in self.columns()[len(BASE_COLUMNS):]:
+            values = [np.nan] * rows
+            if column in ("Error", "Skipped"):
+                for row, message in (methods.errors if column == "Error" else methods.skipped).items():
+                    values[row] = message
+            else:
+                # Seperti {**cls.extra, **extra}: nilai per method menimpa nilai kelas
+                for row in range(rows):
+                    extra = methods.extra.get(row, {})
+                    class_extra = self.classes[class_ids[row]].extra
+                    if column in extra:
+                        values[row] = extra[column]
+                    elif column in class_extra:
+                        values[row] = class_extra[column]
+            data[column] = values
+        return pd.DataFrame(data)
+
+    def class_frame(self):
+        """One row per class: Package, Class, the class metrics, NOCS_package and the method count"""
+        import numpy as np
+        import pandas as pd
+
+        counts = np.bincount(np.frombuffer(self.methods.classes, dtype=np.int64), minlength=len(self.classes)) \
+            if len(self.methods) else np.zeros(len(self.classes), dtype=np.int64)
+        return pd.DataFrame({
+            "Package": [self.packages[record.package].name for record in self.classes],
+            "Class": [record.name for record in self.classes],
+            "NOC_type": [record.noc_type for record in self.classes],
+            "WMC_type": [record.wmc_type for record in self.classes],
+            "LCOM5": [record.lcom5 for record in self.classes],
+            "WMCNAMM_type": [record.wmcnamm_type for record in self.classes],
+            "AMW_type": [record.amw_type for record in self.classes],
+            "NOCS_package": [self.packages[record.package].nocs for record in self.classes],
+            "rows": counts,
+        })
+
+    def package_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame({"Package": [record.name for record in self.packages],
+                             "NOCS_package": [record.nocs for record in self.packages]})
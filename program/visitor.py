@@ -0,0 +1,102 @@
+from abc import ABC, abstractmethod
+
+from kopyt import node
+
+from . import profiling
+
+
+class MethodRecord:
+    """
+    One function of a class, shared by every calculator.
+    The body is rendered to text once; derived values (CC, tokens, ...) are
+    memoized so each is computed at most once per method.
+    """
+    __slots__ = ("name", "declaration", "has_body", "is_empty", "text", "_memo")
+
+    def __init__(self, declaration):
+        body = declaration.body
+        self.name = declaration.name
+        self.declaration = declaration
+        self.has_body = body is not None
+        # Block kosong bernilai falsy, sama seperti pengecekan "if member.body" pada metrik lama
+        self.is_empty = not body
+        self.text = str(body) if body is not None else ""
+        self._memo = {}
+
+    def memo(self, key, compute):
+        """Return compute(self.text), computed only on the first call for key"""
+        if key not in self._memo:
+            self._memo[key] = compute(self.text)
+        return self._memo[key]
+
+
+class ClassRecord:
+    """A class declaration walked once: its members and a MethodRecord per function"""
+    __slots__ = ("name", "declaration", "has_body", "members", "methods")
+
+    def __init__(self, class_declaration):
+        self.name = class_declaration.name
+        self.declaration = class_declaration
+        self.has_body = class_declaration.body is not None
+        self.members = list(class_declaration.body.members) if self.has_body else []
+        self.methods = [MethodRecord(member) for member in self.members
+                        if isinstance(member, node.FunctionDeclaration)]
+
+
+class MetricCalculator(ABC):
+    """
+    Base class for metrics computed by MetricVisitor.
+    level is "class" (measure receives a ClassRecord) or "method" (measure
+    receives a MethodRecord); name is the column the value is reported under.
+    """
+    name = None
+    level = "class"
+
+    @abstractmethod
+    def measure(self, record):
+        """The value of this metric for one ClassRecord or MethodRecord"""
+
+
+class MetricVisitor:
+    """Walks each class once and feeds every registered calculator from the shared records"""
+
+    def __init__(self, calculators=()):
+        self.class_calculators = []
+        self.method_calculators = []
+        for calculator in calculators:
+            self.register(calculator)
+
+    def register(self, calculator):
+        if calculator.level == "method":
+            self.method_calculators.append(calculator)
+        else:
+            self.class_calculators.append(calculator)
+        return calculator
+
+    def visit_class(self, class_declaration):
+        """Return (ClassRecord, {class metric: value}, [{method metric: value}] in member order)"""
+        record = class_declaration if isinstance(class_declaration, ClassRecord) else ClassRecord(class_declaration)
+        profiler = profiling.current()
+        if profiler is not None:
+            return self._visit_profiled(record, profiler)
+        class_values = {calculator.name: calculator.measure(record) for calculator in self.class_calculators}
+        method_values = [
+            {calculator.name: calculator.measure(method) for calculator in self.method_calculators}
+            for method in record.methods
+        ]
+        return record, class_values, method_values
+
+    def _visit_profiled(self, record, profiler):
+        """visit_class with one timing stage per calculator; only used while a Profiler is active"""
+        class_values = {}
+        for calculator in self.class_calculators:
+            with profiler.stage(f"metric {calculator.name}"):
+                class_values[calculator.name] = calculator.measure(record)
+        method_values = [{} for _ in record.methods]
+        for calculator in self.method_calculators:
+            with profiler.stage(f"metric {calculator.name}"):
+                for method, values in zip(record.methods, method_values):
+                    values[calculator.name] = calculator.measure(method)
+        profiler.count("classes")
+        profiler.count("methods measured", len(record.methods))
+        return record, class_values, method_values
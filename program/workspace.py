@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: hanya workspace milik proses ini yang dikenali sebagai aktif
+    fcntl = None
+
+WORKSPACE_ROOT = os.path.join(tempfile.gettempdir(), "kotlin-metrics-workspaces")
+WORKSPACE_PREFIX = "ws-"
+DEFAULT_MAX_AGE = 60 * 60  # Workspace yang lebih tua dari satu jam dianggap tertinggal
+LOCK_NAME = ".lock"
+
+# Workspace yang sedang dipakai di proses ini
+_live = set()
+_live_lock = threading.Lock()
+
+
+def _lock(path, blocking=True):
+    """Open file object holding an exclusive lock on path, or None when another process holds it"""
+    f = open(path, "a")
+    if fcntl is not None:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            return None
+    return f
+
+
+def _remove_if_unused(path):
+    """Remove a workspace unless a live Workspace in this or another process still holds it"""
+    with _live_lock:
+        if path in _live:
+            return False
+    lock_path = os.path.join(path, LOCK_NAME)
+    held = None
+    if os.path.exists(lock_path):
+        try:
+            held = _lock(lock_path, blocking=False)
+        except FileNotFoundError:
+            # Sudah dihapus oleh request lain
+            return False
+        if held is None:
+            return False
+    try:
+        shutil.rmtree(path, ignore_errors=True)
+    finally:
+        if held is not None:
+            held.close()
+    return True
+
+
+def sweep_stale_workspaces(root=WORKSPACE_ROOT, max_age=DEFAULT_MAX_AGE):
+    """
+    Remove workspaces older than max_age seconds, e.g. left behind by a killed
+    worker. A workspace that is still in use is skipped however old it is: it
+    is registered in this process and holds a lock on its lock file.
+    """
+    if not os.path.isdir(root):
+        return 0
+    removed = 0
+    now = time.time()
+    for entry in os.scandir(root):
+        if not entry.name.startswith(WORKSPACE_PREFIX):
+            continue
+        try:
+            if now - entry.stat().st_mtime > max_age and _remove_if_unused(entry.path):
+                removed += 1
+        except FileNotFoundError:
+            # Sudah dihapus oleh request lain
+            continue
+    return removed
+
+
+class Workspace:
+    """
+    Isolated, per-request working directory.
+
+    Every analysis that needs the filesystem gets its own unique directory, so
+    concurrent sessions in one server process never share or wipe each other's
+    files. The directory is removed on exit, and entering a workspace also sweeps
+    workspaces that outlived max_age; the sweep skips workspaces that are still
+    open, so a long analysis keeps its files.
+    """
+
+    def __init__(self, root=WORKSPACE_ROOT, max_age=DEFAULT_MAX_AGE):
+        self.root = root
+        self.max_age = max_age
+        self.path = None
+        self._lock_file = None
+
+    def __enter__(self):
+        sweep_stale_workspaces(self.root, self.max_age)
+        os.makedirs(self.root, exist_ok=True)
+        self.path = tempfile.mkdtemp(prefix=WORKSPACE_PREFIX, dir=self.root)
+        with _live_lock:
+            _live.add(self.path)
+        # Lock dipegang selama workspace terbuka, supaya proses lain tidak menyapunya
+        self._lock_file = _lock(os.path.join(self.path, LOCK_NAME))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+        return False
+
+    def cleanup(self):
+        if self.path is not None:
+            shutil.rmtree(self.path, ignore_errors=True)
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+            with _live_lock:
+                _live.discard(self.path)
+            self.path = None
+
+    def write(self, name, data):
+        """Write data under the workspace, using only the base name to stay inside it"""
+        file_path = os.path.join(self.path, os.path.basename(name) or "upload")
+        with open(file_path, "wb") as f:
+            f.write(data)
+        return file_path
+
+    def directory(self, name):
+        dir_path = os.path.join(self.path, name)
+        os.makedirs(dir_path, exist_ok=True)
+        return dir_path
@@ -0,0 +1,57 @@
+import shutil
+import subprocess
+
+import pytest
+
+# Versi awal proyek kecil untuk tes yang memakai repositori git
+KOTLIN_FILES = {
+    "app/src/com/ex/core/Base.kt": "package com.ex.core\n\nopen class Base {\n    fun run(x: Int): Int {\n"
+                                   "        if (x > 0) {\n            return x\n        }\n        return 0\n    }\n}\n",
+    "app/src/com/ex/core/Shape.kt": "package com.ex.core\n\ninterface Shape\n\nopen class Square : Shape {\n"
+                                    "    fun getSide(): Int {\n        return 1\n    }\n}\n",
+    "app/src/com/ex/ui/Home.kt": "package com.ex.ui\n\nimport com.ex.core.Base\n\nclass Home : Base() {\n"
+                                 "    fun show() {\n        for (i in 0..3) {\n            println(i)\n        }\n    }\n}\n",
+}
+
+
+class GitRepo:
+    """Small git repository in a temporary directory; commit() records every file written so far"""
+
+    def __init__(self, path):
+        self.path = path
+        path.mkdir(parents=True, exist_ok=True)
+        self.git("init", "-q")
+
+    def git(self, *args):
+        return subprocess.run(["git", "-C", str(self.path), "-c", "user.name=test", "-c", "user.email=test@example.com",
+                               *args], check=True, capture_output=True, text=True).stdout.strip()
+
+    def write(self, name, text):
+        path = self.path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+    def delete(self, name):
+        (self.path / name).unlink()
+
+    def commit(self, message):
+        self.git("add", "-A")
+        self.git("commit", "-q", "--allow-empty", "-m", message)
+        return self.git("rev-parse", "HEAD")
+
+
+@pytest.fixture
+def kotlin_repo(tmp_path):
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+    repo = GitRepo(tmp_path / "repo")
+    for name, text in KOTLIN_FILES.items():
+        repo.write(name, text)
+    repo.write("README.md", "not Kotlin\n")
+    repo.commit("initial")
+    return repo
+
+
+def canonical(df):
+    """Rows of a metric DataFrame as sorted strings, for comparing frames whose row order may differ"""
+    return sorted(map(repr, df.astype(str).itertuples(index=False)))
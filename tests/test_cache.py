@@ -0,0 +1,93 @@
+import importlib.util
+import itertools
+import pickle
+
+import pytest
+
+from program import cache as cache_module
+from program.cache import MetricsCache, content_hash, metrics_version
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Waktu akses naik satu per panggilan, supaya urutan LRU tidak bergantung pada resolusi jam
+    ticks = itertools.count(1)
+    monkeypatch.setattr(cache_module.time, "time", lambda: float(next(ticks)))
+
+
+def load_module(path, name, source):
+    path.write_text(source)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_hits_and_misses(tmp_path):
+    cache = MetricsCache("test", "v1", str(tmp_path / "metrics.sqlite"))
+    session = cache.session()
+    assert session.get(content_hash(b"a")) is None
+    session.put(content_hash(b"a"), {"loc": 3})
+    assert session.get(content_hash(b"a")) == {"loc": 3}
+    assert session.get(None) is None
+
+    other = cache.session()
+    other.get(content_hash(b"a"))
+    assert (session.stats()["hits"], session.stats()["misses"]) == (1, 2)
+    assert (other.stats()["hits"], other.stats()["misses"]) == (1, 0)
+    assert (cache.hits, cache.misses) == (2, 2)
+    cache.close()
+
+
+def test_entries_survive_reopen(tmp_path):
+    path = str(tmp_path / "metrics.sqlite")
+    cache = MetricsCache("test", "v1", path)
+    cache.put("d", [1, 2])
+    cache.close()
+    reopened = MetricsCache("test", "v1", path)
+    assert reopened.get("d") == [1, 2]
+    assert reopened.size() == len(pickle.dumps([1, 2], protocol=pickle.HIGHEST_PROTOCOL))
+    reopened.close()
+
+
+def test_relative_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = MetricsCache("test", "v1", "rel.sqlite")
+    cache.put("d", 1)
+    assert cache.get("d") == 1
+    cache.close()
+    assert (tmp_path / "rel.sqlite").exists()
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    value = "x" * 100
+    entry = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    cache = MetricsCache("test", "v1", str(tmp_path / "metrics.sqlite"), max_bytes=2 * entry)
+    session = cache.session()
+    session.put("a", value)
+    session.put("b", value)
+    assert session.get("a") == value  # "a" sekarang lebih baru dari "b"
+    assert session.put("c", value) == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == value and cache.get("c") == value
+    assert session.stats()["evictions"] == 1
+    assert cache.size() == 2 * entry
+    cache.close()
+
+
+def test_version_change_invalidates(tmp_path):
+    path = str(tmp_path / "metrics.sqlite")
+    v1 = metrics_version(load_module(tmp_path / "metric_a.py", "metric_a", "def loc(s):\n    return s.count('\\n')\n"))
+    v2 = metrics_version(load_module(tmp_path / "metric_b.py", "metric_b", "def loc(s):\n    return s.count('\\n') + 1\n"))
+    assert v1 != v2
+    assert v1 == metrics_version(load_module(tmp_path / "metric_c.py", "metric_c",
+                                             "def loc(s):\n    return s.count('\\n')\n"))
+
+    old = MetricsCache("test", v1, path)
+    old.put("d", "old metrics")
+    old.close()
+    new = MetricsCache("test", v2, path)
+    assert new.get("d") is None
+    assert new.misses == 1
+    new.close()
+    assert MetricsCache("test", v1, path).get("d") == "old metrics"
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from benchmarks.corpus import generate_sources
+from program.export import CSVSpool, write_csv_rows
+from program.reports import PER_FUNCTION_COLUMNS, analyze_sources_per_function
+
+
+def test_spool_matches_rows(tmp_path):
+    sources = generate_sources(files=8, classes_per_file=2, methods_per_class=4)
+    rows = analyze_sources_per_function(sources, "bench")
+    spool = CSVSpool(PER_FUNCTION_COLUMNS, page_size=7, max_memory=512).extend(rows)
+
+    # File yang sama dengan CSV streaming biasa, walaupun spool sudah pindah ke disk
+    write_csv_rows(rows, tmp_path / "rows.csv", PER_FUNCTION_COLUMNS)
+    assert spool.getvalue() == (tmp_path / "rows.csv").read_bytes()
+
+    assert spool.row_count == len(rows)
+    assert spool.page_count == -(-len(rows) // 7)
+    assert spool.page(1) == rows[:7]
+    assert spool.page(spool.page_count) == rows[(spool.page_count - 1) * 7:]
+    assert spool.page(spool.page_count + 1) == []
+    for column in ("NOLV_METHOD", "CYCLO_METHOD", "NUMBER_CONSTRUCTOR_NOTDEFAULTCONSTRUCTOR_METHOD"):
+        assert spool.totals[column] == sum(row[column] for row in rows)
+
+    expected = pd.DataFrame(rows, columns=list(PER_FUNCTION_COLUMNS))
+    pd.testing.assert_frame_equal(spool.dataframe(), expected, check_dtype=False)
+    spool.close()
+
+
+def test_spool_keeps_text_values():
+    rows = [{"Project": "007", "Class": "None", "Function": "", "LOC": 3, "Ratio": 0.5, "Note": None}]
+    spool = CSVSpool(("Project", "Class", "Function", "LOC", "Ratio", "Note")).extend(rows)
+    assert spool.page(1) == rows
@@ -0,0 +1,36 @@
+from program import controller as ct
+
+SOURCES = {
+    "Base.kt": "package app\n\nopen class Base {\n    fun run(x: Int): Int {\n        if (x > 0) {\n            return x\n        }\n        return 0\n    }\n}\n",
+    "Child.kt": "package app\n\nclass Child : Base() {\n    fun getName(): String {\n        return \"child\"\n    }\n}\n",
+    "Other.kt": "package app\n\nclass Other : Base()\n",
+}
+
+
+def project(tmp_path):
+    for name, code in SOURCES.items():
+        (tmp_path / name).write_text(code)
+    store = ct.ParsedModuleStore.from_directory(str(tmp_path))
+    counts = (ct.count_noi(store), ct.count_nom(store), ct.count_nomnamm(store), ct.count_nocs_package(store))
+    return store, counts
+
+
+def test_baseline_call_shape(tmp_path):
+    store, counts = project(tmp_path)
+    path = str(tmp_path / "Base.kt")
+
+    # Pemanggilan lama tanpa store atau index: index dibangun dari direktori file
+    rows = ct.extracted_method(path, *counts)
+    assert rows == ct.extracted_method(path, *counts, store=store)
+    assert rows == ct.extracted_method(path, *counts, inheritance_index=store.inheritance_index())
+    assert [(row["Class"], row["Method"], row["NOC_type"]) for row in rows] == [("Base", "run", 2)]
+    assert "Error" not in rows[0]
+
+
+def test_file_outside_store(tmp_path):
+    store, counts = project(tmp_path)
+    extra = tmp_path / "sub"
+    extra.mkdir()
+    (extra / "Leaf.kt").write_text("package app\n\nclass Leaf : Child() {\n    fun leaf() {}\n}\n")
+    rows = ct.extracted_method(str(extra / "Leaf.kt"), *counts, store=store)
+    assert [(row["Class"], row["Method"]) for row in rows] == [("Leaf", "leaf")]
@@ -0,0 +1,76 @@
+import os
+import zipfile
+from io import BytesIO
+
+from program.filters import GENERATED_RULE, INCLUDE_RULE, PathPattern, SourceFilter, is_generated_header
+from program.sources import iter_directory_sources, iter_zip_sources
+
+FILES = {
+    "app/src/main/java/com/foo/Main.kt": b"package com.foo\n\nclass Main\n",
+    # Paket sumber bernama build bukan keluaran Gradle
+    "app/src/main/java/com/foo/build/Builder.kt": b"package com.foo.build\n\nclass Builder\n",
+    "app/build/generated/source/kapt/debug/Dagger.kt": b"package dagger\n\nclass Dagger\n",
+    "app/build/tmp/kapt3/stubs/Stub.kt": b"package stub\n\nclass Stub\n",
+    "lib/vendor/Vendored.kt": b"package vendored\n\nclass Vendored\n",
+    "app/src/main/java/com/foo/Proto.kt": b"// Generated by the protocol buffer compiler. DO NOT EDIT!\npackage com.foo\n\nclass Proto\n",
+    "app/src/main/java/com/foo/Big.kt": b"package com.foo\n\nclass Big\n" + b"// padding\n" * 200,
+}
+KEPT = {"app/src/main/java/com/foo/Main.kt", "app/src/main/java/com/foo/build/Builder.kt",
+        "app/src/main/java/com/foo/Big.kt"}
+
+
+def test_path_patterns():
+    assert PathPattern("build").matches("a/b/build", directory=True)
+    assert PathPattern("*.kt").matches("a/b/Main.kt")
+    assert not PathPattern("src/*.kt").matches("src/a/Main.kt")
+    assert PathPattern("src/**/*.kt").matches("src/a/b/Main.kt")
+    assert PathPattern("src/**/*.kt").matches("src/Main.kt")
+    assert PathPattern("**/gen/**").matches("x/gen", directory=True)
+    assert PathPattern("Test[!s].kt").matches("TestA.kt") and not PathPattern("Test[!s].kt").matches("Tests.kt")
+    default = SourceFilter.default().exclude
+    assert not any(pattern.matches("src/com/foo/build", directory=True) for pattern in default)
+    assert any(pattern.matches("app/build/generated", directory=True) for pattern in default)
+
+
+def test_generated_header():
+    assert is_generated_header(b"/*\n * Copyright\n * Auto-generated file\n */\npackage a\n")
+    assert is_generated_header(b"@file:Generated(\"x\")\npackage a\n")
+    assert not is_generated_header(b"package a\n\nclass A\n// generated by hand\n")
+
+
+def test_directory_walk(tmp_path):
+    for path, data in FILES.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_bytes(data)
+    source_filter = SourceFilter.default()
+    names = {os.path.relpath(name, tmp_path).replace(os.sep, "/")
+             for name, _ in iter_directory_sources(str(tmp_path), source_filter=source_filter)}
+    assert names == KEPT
+    report = {row["Rule"]: row for row in source_filter.report()}
+    # Direktori yang dipangkas tidak pernah dibaca, jadi filenya tidak dihitung
+    assert report["exclude **/build/generated/**"]["Directories"] == 1
+    assert report["exclude **/vendor/**"]["Directories"] == 1
+    assert report[GENERATED_RULE]["Files"] == 1
+    assert report["analyzed"]["Files"] == len(KEPT)
+    assert report["analyzed"]["Bytes"] == sum(len(FILES[name]) for name in KEPT)
+
+
+def test_archive_filters_by_name_size_and_include():
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_ref:
+        for path, data in FILES.items():
+            zip_ref.writestr(path, data)
+    source_filter = SourceFilter.default(include=["app/**"], max_size=1024)
+    names = {name for name, _ in iter_zip_sources(buffer.getvalue(), source_filter=source_filter)}
+    assert names == KEPT - {"app/src/main/java/com/foo/Big.kt"}
+    report = {row["Rule"]: row for row in source_filter.report()}
+    assert report["exclude **/build/generated/**"]["Files"] == 1
+    assert report["exclude **/build/tmp/**"]["Files"] == 1
+    assert report["exclude **/vendor/**"]["Files"] == 1
+    assert report["larger than 1024 bytes"]["Files"] == 1
+    assert source_filter.skipped_files() == 5
+
+    only_main = SourceFilter(include=["**/Main.kt"])
+    assert [name for name, _ in iter_zip_sources(buffer.getvalue(), source_filter=only_main)] == [
+        "app/src/main/java/com/foo/Main.kt"]
+    assert {row["Rule"]: row["Files"] for row in only_main.report()}[INCLUDE_RULE] == len(FILES) - 1
@@ -0,0 +1,64 @@
+import multiprocessing
+import time
+
+import pytest
+
+from program import controller as ct
+from program.guard import ParseGuard
+
+pytest.importorskip("resource")  # Batas memori hanya berlaku di Linux
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                                reason="the patched summarize_module reaches the workers only by fork")
+
+SOURCES = [
+    ("Slow.kt", b"package p\n\nclass Slow {\n    fun f(x: Int) {\n        if (x > 0) {\n        }\n    }\n}\n"),
+    ("A.kt", b"package p\n\nclass A {\n    fun a() {}\n}\n"),
+    ("Hog.kt", b"package p\n\nclass Hog {\n    fun g() {}\n}\n"),
+    ("B.kt", b"package p\n\nclass B : A() {\n    fun b() {}\n}\n"),
+]
+MAX_MEMORY = 256 * 1024 * 1024
+
+
+@pytest.fixture
+def slow_and_hog(monkeypatch):
+    summarize_module = ct.summarize_module
+
+    def patched(module, raise_memory_error=False):
+        if module.path == "Slow.kt":
+            time.sleep(30)
+        elif module.path == "Hog.kt":
+            bytearray(4 * MAX_MEMORY)
+        return summarize_module(module, raise_memory_error)
+
+    # Worker guard mengimpor summarize_module dari controller setelah fork
+    monkeypatch.setattr(ct, "summarize_module", patched)
+
+
+def test_timeout_and_memory_skips(slow_and_hog):
+    guard = ParseGuard(timeout=1, max_memory=MAX_MEMORY)
+    summaries, parse_count = ct.summarize_sources(SOURCES, workers=2, guard=guard)
+
+    assert [summary.path for summary in summaries] == [name for name, _ in SOURCES]
+    assert parse_count == 2
+    slow, a, hog, b = summaries
+    assert slow.skipped == "parse timeout (1s); text metrics"
+    assert hog.skipped == "parse memory limit (256 MiB); text metrics"
+    # Metrik teks tetap menemukan kelas dan fungsinya
+    assert [(c.name, [m[0] for m in c.methods]) for c in slow.classes] == [("Slow", ["f"])]
+    assert [(c.name, [m[0] for m in c.methods]) for c in hog.classes] == [("Hog", ["g"])]
+    assert a.skipped is None and b.skipped is None
+
+    unguarded, _ = ct.summarize_sources([SOURCES[1], SOURCES[3]])
+    assert [c.methods for c in a.classes] == [c.methods for c in unguarded[0].classes]
+    assert [c.methods for c in b.classes] == [c.methods for c in unguarded[1].classes]
+
+
+def test_skip_without_fallback(slow_and_hog):
+    guard = ParseGuard(timeout=1, max_memory=MAX_MEMORY, fallback=False)
+    df = ct.extract_and_parse_sources(SOURCES, guard=guard)
+    assert df.attrs["skipped_count"] == 2
+    assert df.attrs["parse_count"] == 2
+    skipped = df[df["Skipped"].notna()]
+    assert list(skipped["Skipped"]) == ["parse timeout (1s)", "parse memory limit (256 MiB)"]
+    assert list(skipped["Error"]) == ["Skipped: parse timeout (1s)", "Skipped: parse memory limit (256 MiB)"]
+    assert set(df.loc[df["Skipped"].isna(), "Class"]) == {"A", "B"}
@@ -0,0 +1,50 @@
+from program import gitrepo
+from program.history import commit_history
+from program.incremental import analyze_revision
+from program.reports import calculate_complexity_report_sources
+
+from .conftest import KOTLIN_FILES, canonical
+
+
+def test_commit_history_matches_full_analysis(kotlin_repo):
+    base = "app/src/com/ex/core/Base.kt"
+    kotlin_repo.write(base, KOTLIN_FILES[base].replace("return 0", "while (x < 0) {\n            return 1\n        }\n"
+                                                                     "        return 0"))
+    kotlin_repo.write("app/src/com/ex/ui/Detail.kt", "package com.ex.ui\n\nclass Detail : com.ex.core.Base()\n")
+    kotlin_repo.commit("edit base, add detail")
+    kotlin_repo.write("README.md", "docs only\n")
+    kotlin_repo.commit("docs")
+    kotlin_repo.delete("app/src/com/ex/ui/Detail.kt")
+    kotlin_repo.commit("remove detail")
+    # Isi Base.kt kembali ke versi pertama: blob itu sudah pernah dianalisis
+    kotlin_repo.write(base, KOTLIN_FILES[base])
+    kotlin_repo.commit("revert base")
+
+    repo = str(kotlin_repo.path)
+    frames = {}
+    history = commit_history(repo, "HEAD", on_commit=lambda commit, snapshot: frames.setdefault(
+        commit, snapshot.dataframe()))
+
+    assert [entry["Subject"] for entry in history] == ["initial", "edit base, add detail", "docs", "remove detail",
+                                                       "revert base"]
+    assert [entry["new file versions"] for entry in history] == [3, 2, 0, 0, 0]
+    assert [entry["files"] for entry in history] == [3, 4, 4, 3, 3]
+    for entry in history:
+        commit = entry["Commit"]
+        full = analyze_revision(repo, commit)
+        assert canonical(frames[commit]) == canonical(full.dataframe())
+        assert (entry["NOI"], entry["NOM"], entry["NOMNAMM"]) == (full.noi, full.nom, full.nomnamm)
+        assert entry["classes"] == sum(summary.class_count for summary in full.summaries.values())
+
+        paths = [path for path, _ in gitrepo.list_files(repo, commit)]
+        complexity = calculate_complexity_report_sources(gitrepo.read_files(repo, paths, commit))
+        assert {key: entry[key] for key in complexity} == complexity
+
+
+def test_commit_range(kotlin_repo):
+    first = kotlin_repo.git("rev-parse", "HEAD")
+    kotlin_repo.write("app/src/com/ex/ui/Detail.kt", "package com.ex.ui\n\nclass Detail\n")
+    second = kotlin_repo.commit("add detail")
+    history = commit_history(str(kotlin_repo.path), f"{first}..{second}")
+    # Commit pertama di luar range: semua file dianggap baru pada commit pertama range
+    assert [(entry["Commit"], entry["files"], entry["new file versions"]) for entry in history] == [(second, 4, 4)]
@@ -0,0 +1,24 @@
+"""
+The CLI and library modules must import without Streamlit: the app entry point
+and the program package load it only when a page is rendered.
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_after(statement):
+    code = f"import sys\n{statement}\nprint(sorted(m for m in ('streamlit', 'program.index') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def test_main_does_not_load_streamlit():
+    assert loaded_after("import main") == "[]"
+
+
+def test_program_package_is_lazy():
+    assert loaded_after("import program, program.controller, program.cli") == "[]"
+    assert loaded_after("import program; program.main") == "['program.index', 'streamlit']"
@@ -0,0 +1,77 @@
+from program.incremental import MetricsSnapshot, analyze_revision
+
+from .conftest import KOTLIN_FILES, canonical
+
+
+def sources(files):
+    return [(name, text.encode("utf-8")) for name, text in files.items()]
+
+
+def assert_same(snapshot, full):
+    assert list(snapshot.dataframe().columns) == list(full.dataframe().columns)
+    assert canonical(snapshot.dataframe()) == canonical(full.dataframe())
+    assert (snapshot.noi, snapshot.nom, snapshot.nomnamm) == (full.noi, full.nom, full.nomnamm)
+    assert {k: v for k, v in snapshot.nocs_package_counts.items() if v} == full.nocs_package_counts
+    assert snapshot.inheritance_index.noc_mapping() == full.inheritance_index.noc_mapping()
+
+
+def test_update_matches_full_analysis():
+    snapshot = MetricsSnapshot.from_sources(sources(KOTLIN_FILES))
+    files = dict(KOTLIN_FILES)
+    files["app/src/com/ex/ui/Detail.kt"] = ("package com.ex.ui\n\nimport com.ex.core.Base\n\n"
+                                            "class Detail : Base() {\n    fun getTitle() = \"x\"\n}\n")
+    files["app/src/com/ex/core/Base.kt"] = files["app/src/com/ex/core/Base.kt"].replace(
+        "return 0", "if (x < -1) {\n            return -1\n        }\n        return 0")
+    del files["app/src/com/ex/core/Shape.kt"]
+
+    stats = snapshot.update(sources({name: files[name] for name in ("app/src/com/ex/ui/Detail.kt",
+                                                                   "app/src/com/ex/core/Base.kt")}),
+                            ["app/src/com/ex/core/Shape.kt"])
+    assert stats["parsed"] == 2 and stats["deleted"] == 1
+    # Home tidak berubah, tetapi NOC_type Base berubah; hanya baris Base, Detail dan Home dibangun ulang
+    assert stats["rows rebuilt"] == 3
+    assert_same(snapshot, MetricsSnapshot.from_sources(sources(files)))
+
+
+def test_unchanged_file_keeps_rows_but_gets_new_counters():
+    snapshot = MetricsSnapshot.from_sources(sources(KOTLIN_FILES))
+    home = snapshot.rows["app/src/com/ex/ui/Home.kt"]
+    files = dict(KOTLIN_FILES)
+    files["app/src/com/ex/core/Shape.kt"] += "\nclass Circle : Shape {\n    fun area() {}\n}\n"
+    stats = snapshot.update(sources({"app/src/com/ex/core/Shape.kt": files["app/src/com/ex/core/Shape.kt"]}))
+    assert stats["rows rebuilt"] == 2  # Shape.kt, dan Base.kt karena NOCS_package com.ex.core berubah
+    assert snapshot.rows["app/src/com/ex/ui/Home.kt"] is home
+    assert home[0]["NOM"] == snapshot.nom
+    assert_same(snapshot, MetricsSnapshot.from_sources(sources(files)))
+
+
+def test_update_from_git(kotlin_repo, tmp_path):
+    snapshot = analyze_revision(str(kotlin_repo.path), "HEAD")
+    first = snapshot.revision
+
+    kotlin_repo.write("app/src/com/ex/ui/Detail.kt", "package com.ex.ui\n\nimport com.ex.core.*\n\n"
+                                                     "class Detail : Square() {\n    fun getTitle() = \"x\"\n}\n")
+    kotlin_repo.delete("app/src/com/ex/ui/Home.kt")
+    head = kotlin_repo.commit("add detail, remove home")
+    stats = snapshot.update_from_git(str(kotlin_repo.path), "HEAD")
+    assert (stats["parsed"], stats["deleted"]) == (1, 1)
+    assert snapshot.revision == head != first
+    assert_same(snapshot, analyze_revision(str(kotlin_repo.path), "HEAD"))
+
+    # Snapshot tersimpan dipakai lagi untuk perubahan working tree yang belum di-commit
+    snapshot.save(str(tmp_path / "snap" / "metrics.snapshot"))
+    snapshot = MetricsSnapshot.load(str(tmp_path / "snap" / "metrics.snapshot"))
+    kotlin_repo.write("app/src/com/ex/core/Base.kt", KOTLIN_FILES["app/src/com/ex/core/Base.kt"].replace(
+        "fun run", "fun walk"))
+    kotlin_repo.git("add", "-A")
+    stats = snapshot.update_from_git(str(kotlin_repo.path), None)
+    assert stats["parsed"] == 1
+    assert snapshot.dirty == {"app/src/com/ex/core/Base.kt"}
+    assert "walk" in set(snapshot.dataframe()["Method"])
+    assert_same(snapshot, analyze_revision(str(kotlin_repo.path), None))
+
+    # Perubahan yang dibatalkan di working tree dibaca ulang dari HEAD
+    kotlin_repo.git("checkout", "HEAD", "--", "app/src/com/ex/core/Base.kt")
+    snapshot.update_from_git(str(kotlin_repo.path), None)
+    assert snapshot.dirty == set()
+    assert_same(snapshot, analyze_revision(str(kotlin_repo.path), "HEAD"))
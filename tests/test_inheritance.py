@@ -0,0 +1,63 @@
+from program.controller import ParsedModuleStore
+from program.inheritance import InheritanceIndex
+
+
+def test_resolution_rules():
+    index = InheritanceIndex()
+    index.add_declarations("app.model", [("Base", []), ("Same", ["Base"])])
+    index.add_declarations("app.other", [("Base", [])])
+    # Import eksplisit (dengan alias), wildcard dan nama lengkap
+    index.add_declarations("app.ui", [("Imported", ["B"]), ("Wild", ["Base"]), ("Qualified", ["app.other.Base"])],
+                           imports={"B": "app.model.Base"}, wildcards=["app.other"])
+    # Supertype yang tidak ada di proyek tetap dicatat dengan nama yang ditulis
+    index.add_declarations("app.ui", [("Screen", ["android.app.Activity", "Runnable"])])
+    index.build()
+
+    assert index.direct_supertypes("Same", "app.model") == ["app.model.Base"]
+    assert index.direct_supertypes("Imported", "app.ui") == ["app.model.Base"]
+    assert index.direct_supertypes("Wild", "app.ui") == ["app.other.Base"]
+    assert index.direct_supertypes("Qualified", "app.ui") == ["app.other.Base"]
+    assert index.noc("Base", "app.model") == 2
+    assert index.noc("Base", "app.other") == 2
+    assert index.external_classes == {"android.app.Activity", "Runnable"}
+    assert not index.is_project_class("Runnable")
+    assert index.noc_mapping() == {"Base": 4, "Same": 0, "Imported": 0, "Wild": 0, "Qualified": 0, "Screen": 0,
+                                   "Activity": 1, "Runnable": 1}
+    assert "Activity" not in index.noc_mapping(include_external_classes=False)
+
+
+def test_same_package_wins_over_wildcard():
+    index = InheritanceIndex()
+    index.add_declarations("a", [("Base", []), ("Child", ["Base"])], wildcards=["b"])
+    index.add_declarations("b", [("Base", [])])
+    assert index.build().direct_supertypes("Child", "a") == ["a.Base"]
+
+
+def test_incremental_changes_relink():
+    index = InheritanceIndex()
+    base = index.add_declarations("p", [("Base", [])])
+    index.add_declarations("p", [("Child", ["Base"])])
+    index.build()
+    index.pop_changed_targets()
+
+    # Base dihapus: Child sekarang menunjuk ke kelas eksternal "Base"
+    index.remove_declarations(base)
+    assert index.direct_supertypes("Child", "p") == ["Base"]
+    assert index.external_classes == {"Base"}
+    assert "p.Base" in index.pop_changed_targets()
+
+    index.add_declarations("p", [("Base", [])], key=base)
+    assert index.noc("Base", "p") == 1
+    assert index.external_classes == set()
+
+
+def test_from_parsed_modules():
+    store = ParsedModuleStore()
+    store.add_source("Base.kt", "package app.core\n\nopen class Base\ninterface Marker\n")
+    store.add_source("Views.kt", "package app.ui\n\nimport app.core.Base\nimport app.core.*\n\n"
+                                 "class Home : Base(), Marker\nclass Detail : app.core.Base(), java.io.Serializable\n")
+    index = store.inheritance_index()
+    assert index.direct_supertypes("Home", "app.ui") == ["app.core.Base", "app.core.Marker"]
+    assert index.direct_supertypes("Detail", "app.ui") == ["app.core.Base", "java.io.Serializable"]
+    assert index.noc("Base", "app.core") == 2
+    assert index.noc("Marker", "app.core") == 1
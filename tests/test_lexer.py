@@ -0,0 +1,76 @@
+from program.lexer import (
+    BLOCK_COMMENT,
+    CHAR,
+    IDENTIFIER,
+    LINE_COMMENT,
+    NUMBER,
+    OPERATOR,
+    STRING,
+    code_tokens,
+    package_name,
+    tokenize,
+    tokens_by_line,
+)
+
+
+def kinds(text):
+    return [(token.kind, token.value) for token in tokenize(text)]
+
+
+def test_keywords_inside_strings_are_one_token():
+    assert kinds('val s = "if (x) for while"') == [
+        (IDENTIFIER, "val"), (IDENTIFIER, "s"), (OPERATOR, "="), (STRING, '"if (x) for while"'),
+    ]
+
+
+def test_escaped_quote():
+    assert kinds(r'"a \" if" + b') == [(STRING, r'"a \" if"'), (OPERATOR, "+"), (IDENTIFIER, "b")]
+
+
+def test_templates_with_nested_strings_and_braces():
+    text = 'println("${if (a) "x}" else map["k"]} and $name") ; fun'
+    tokens = tokenize(text)
+    assert (tokens[2].kind, tokens[2].value) == (STRING, '"${if (a) "x}" else map["k"]} and $name"')
+    assert [token.value for token in tokens[3:]] == [")", ";", "fun"]
+
+
+def test_raw_string_spans_lines_and_keeps_extra_quotes():
+    text = 'val s = """\nif "quoted" ${x}\n"""" + when'
+    tokens = tokenize(text)
+    assert tokens[3].kind == STRING
+    assert tokens[3].value == '"""\nif "quoted" ${x}\n""""'
+    assert (tokens[-1].value, tokens[-1].line) == ("when", 3)
+
+
+def test_nested_block_comments():
+    text = "a /* outer /* inner */ if */ b // for\nc"
+    assert kinds(text) == [
+        (IDENTIFIER, "a"), (BLOCK_COMMENT, "/* outer /* inner */ if */"), (IDENTIFIER, "b"),
+        (LINE_COMMENT, "// for"), (IDENTIFIER, "c"),
+    ]
+    assert [token.value for token in code_tokens(tokenize(text))] == ["a", "b", "c"]
+
+
+def test_char_literals():
+    assert kinds(r"""c == '"' || c == '\'' || c == '{'""") == [
+        (IDENTIFIER, "c"), (OPERATOR, "=="), (CHAR, "'\"'"), (OPERATOR, "||"),
+        (IDENTIFIER, "c"), (OPERATOR, "=="), (CHAR, r"'\''"), (OPERATOR, "||"),
+        (IDENTIFIER, "c"), (OPERATOR, "=="), (CHAR, "'{'"),
+    ]
+
+
+def test_numbers_and_operators():
+    assert kinds("0xFF_FFu 1_000L 1.5e3f .5 a?.b ?: c..<d") == [
+        (NUMBER, "0xFF_FFu"), (NUMBER, "1_000L"), (NUMBER, "1.5e3f"), (NUMBER, ".5"),
+        (IDENTIFIER, "a"), (OPERATOR, "?."), (IDENTIFIER, "b"), (OPERATOR, "?:"),
+        (IDENTIFIER, "c"), (OPERATOR, "..<"), (IDENTIFIER, "d"),
+    ]
+
+
+def test_lines_and_package():
+    tokens = tokenize("// header\npackage a.b.c\n\nclass A {\n    /* x\n y */ fun f() {}\n}\n")
+    assert package_name(tokens) == "a.b.c"
+    lines = tokens_by_line(tokens)
+    assert sorted(lines) == [2, 4, 6, 7]
+    assert [token.value for token in lines[6]] == ["fun", "f", "(", ")", "{", "}"]
+
@@ -0,0 +1,78 @@
+"""
+Parity checks for the faster paths: the process pool, the normalized tables,
+the metrics cache and content de-duplication must give the same rows as a
+plain serial run. The project is the synthetic corpus of the benchmarks.
+"""
+import pandas as pd
+import pytest
+
+from benchmarks.corpus import generate_sources
+from program import controller as ct
+from program.project import ProjectModel
+
+
+def class_metrics(summary):
+    return [(c.name, c.wmc_type, c.lcom5, c.wmcnamm_type, c.amw_type, c.methods) for c in summary.classes]
+
+
+@pytest.fixture(scope="module")
+def sources():
+    sources = generate_sources(files=6, classes_per_file=2, methods_per_class=4, packages=3)
+    # Salinan identik di path lain, seperti modul flavor di proyek Android
+    return sources + [("flavor/" + sources[0][0], sources[0][1])]
+
+
+@pytest.fixture(scope="module")
+def serial(sources):
+    return ct.extract_and_parse_sources(sources)
+
+
+def test_workers_match_serial(sources, serial):
+    pooled = ct.extract_and_parse_sources(sources, workers=2)
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert pooled.attrs == serial.attrs
+
+
+def test_tables_match_rows(sources):
+    summaries, _ = ct.summarize_sources(sources)
+    rows = pd.DataFrame(ct.summaries_to_rows(summaries))
+    pd.testing.assert_frame_equal(rows, ct.summaries_to_tables(summaries).dataframe())
+
+
+def test_warm_cache_matches_cold(sources, serial, tmp_path):
+    cache = ct.metrics_cache(path=str(tmp_path / "metrics.sqlite"))
+    unique = len(sources) - 1
+    try:
+        cold = ct.extract_and_parse_sources(sources, cache=cache)
+        warm = ct.extract_and_parse_sources(sources, cache=cache)
+        warm_pooled = ct.extract_and_parse_sources(sources, workers=2, cache=cache)
+    finally:
+        cache.close()
+
+    for df in (cold, warm, warm_pooled):
+        pd.testing.assert_frame_equal(serial, df)
+    assert (cold.attrs["cache"]["hits"], cold.attrs["cache"]["misses"]) == (0, unique)
+    assert (warm.attrs["cache"]["hits"], warm.attrs["cache"]["misses"]) == (unique, 0)
+    assert warm.attrs["parse_count"] == warm_pooled.attrs["parse_count"] == 0
+
+
+def test_duplicate_rows_match_original(sources, serial):
+    summaries, parse_count = ct.summarize_sources(sources)
+    assert parse_count == len(sources) - 1
+    assert summaries[-1].duplicate_of == sources[0][0]
+    assert serial.attrs["duplicate_count"] == 1
+
+    # Parse ulang salinannya sendiri: baris yang dibagikan harus sama dengan hasil parse
+    reparsed, _ = ct.summarize_sources(sources[-1:])
+    methods = sum(len(summary.methods) for summary in reparsed[0].classes)
+    copy_rows = serial.tail(methods).reset_index(drop=True)
+    first_rows = serial.head(methods).reset_index(drop=True)
+    pd.testing.assert_frame_equal(copy_rows, first_rows)
+    assert class_metrics(reparsed[0]) == class_metrics(summaries[-1])
+
+
+def test_project_model_matches_serial(sources, serial):
+    df = ProjectModel("parity", sources).class_metrics()
+    pd.testing.assert_frame_equal(serial, df)
+    assert df.attrs == serial.attrs
+    assert df.attrs["duplicate_count"] == 1
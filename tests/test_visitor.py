@@ -0,0 +1,45 @@
+import pytest
+
+from program import controller as ct
+from program.visitor import MetricCalculator, MetricVisitor
+
+SOURCE = ("Screen.kt", b"package app\n\nclass Screen {\n    fun onCreate() {\n        if (a) {\n        }\n    }\n"
+                       b"    fun render() {}\n}\n")
+
+
+class NameLength(MetricCalculator):
+    name = "NAME_LENGTH"
+    level = "method"
+
+    def measure(self, method):
+        return len(method.name)
+
+
+class MethodCount(MetricCalculator):
+    name = "METHOD_COUNT"
+
+    def measure(self, record):
+        return len(record.methods)
+
+
+def test_measure_is_abstract():
+    with pytest.raises(TypeError):
+        MetricCalculator()
+
+    class Incomplete(MetricCalculator):
+        name = "INCOMPLETE"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_registered_calculators_become_columns(monkeypatch):
+    visitor = MetricVisitor([*ct.METRIC_VISITOR.class_calculators, *ct.METRIC_VISITOR.method_calculators])
+    visitor.register(NameLength())
+    visitor.register(MethodCount())
+    monkeypatch.setattr(ct, "METRIC_VISITOR", visitor)
+    df = ct.extract_and_parse_sources([SOURCE])
+    assert list(df["Method"]) == ["onCreate", "render"]
+    assert list(df["NAME_LENGTH"]) == [8, 6]
+    assert list(df["METHOD_COUNT"]) == [2, 2]
+    assert list(df["CC"]) == [2, 0]
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from program import workspace
+from program.workspace import LOCK_NAME, Workspace, sweep_stale_workspaces
+
+OLD = time.time() - 2 * 60 * 60
+
+
+def make_stale(path, lock=False):
+    os.makedirs(path)
+    if lock:
+        open(os.path.join(path, LOCK_NAME), "w").close()
+    os.utime(path, (OLD, OLD))
+    return path
+
+
+def test_workspace_is_removed_on_exit(tmp_path):
+    with Workspace(str(tmp_path)) as ws:
+        path = ws.write("../../escape.zip", b"data")
+        assert os.path.dirname(path) == ws.path
+        assert os.path.isdir(ws.directory("extracted"))
+        root = ws.path
+    assert not os.path.exists(root)
+    assert os.listdir(tmp_path) == []
+
+
+def test_sweep_removes_only_stale_leftovers(tmp_path):
+    stale = make_stale(str(tmp_path / "ws-stale"))
+    released = make_stale(str(tmp_path / "ws-released"), lock=True)
+    fresh = str(tmp_path / "ws-fresh")
+    os.makedirs(fresh)
+    other = make_stale(str(tmp_path / "not-a-workspace"))
+    assert sweep_stale_workspaces(str(tmp_path)) == 2
+    assert not os.path.exists(stale) and not os.path.exists(released)
+    assert os.path.isdir(fresh) and os.path.isdir(other)
+
+
+def test_sweep_skips_live_workspace(tmp_path):
+    with Workspace(str(tmp_path)) as ws:
+        os.utime(ws.path, (OLD, OLD))
+        # Workspace lain di proses yang sama menyapu saat dibuka
+        with Workspace(str(tmp_path)):
+            assert os.path.isdir(ws.path)
+        assert sweep_stale_workspaces(str(tmp_path)) == 0
+        assert os.path.isfile(os.path.join(ws.path, LOCK_NAME))
+
+
+@pytest.mark.skipif(workspace.fcntl is None, reason="the lock across processes needs fcntl")
+def test_sweep_from_other_process_skips_live_workspace(tmp_path):
+    with Workspace(str(tmp_path)) as ws:
+        os.utime(ws.path, (OLD, OLD))
+        code = f"from program.workspace import sweep_stale_workspaces; print(sweep_stale_workspaces({str(tmp_path)!r}))"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "0"
+        assert os.path.isdir(ws.path)
+    # Setelah ditutup, sisa workspace yang sama sudah bisa disapu
+    leftover = make_stale(str(tmp_path / "ws-leftover"), lock=True)
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "1" and not os.path.exists(leftover)